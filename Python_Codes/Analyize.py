@@ -7,6 +7,9 @@ from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
 import threading
 
+from parcelamentos.normalizacao import normalizar_cnpj
+from parcelamentos.planilhas import carregar_cnpjs_excel
+
 def selecionar_pasta_pdfs():
     pasta = filedialog.askdirectory(title="Selecione a pasta com os PDFs")
     if pasta:
@@ -28,12 +31,6 @@ def selecionar_pasta_saida():
         entrada_pasta_saida.delete(0, tk.END)
         entrada_pasta_saida.insert(0, pasta)
 
-def normalizar_cnpj(cnpj):
-    """Remove formatação do CNPJ e retorna apenas números"""
-    if not cnpj:
-        return ""
-    return re.sub(r'\D', '', cnpj)
-
 def extrair_dados_pdf(caminho_pdf):
     dados = []
     nome_arquivo = os.path.basename(caminho_pdf)
@@ -198,9 +195,7 @@ def processar_pdfs():
             empresas_filtradas = set()
             if excel_empresas:
                 try:
-                    df_empresas = pd.read_excel(excel_empresas, dtype=str)
-                    if 'CNPJ' in df_empresas.columns:
-                        empresas_filtradas = set(df_empresas['CNPJ'].apply(normalizar_cnpj))
+                    empresas_filtradas = carregar_cnpjs_excel(excel_empresas)
                     text_resultados.insert(tk.END, f"✅ Carregadas {len(empresas_filtradas)} empresas do Excel\n\n")
                 except Exception as e:
                     text_resultados.insert(tk.END, f"⚠️ Erro ao carregar Excel: {str(e)}\n\n")
@@ -1,19 +1,55 @@
 import os
-import re
-import pdfplumber
-import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
 import threading
+import queue
+import multiprocessing
 from datetime import datetime
 import json
 
+from parcelamentos.backends import BACKEND_PADRAO, backends_disponiveis
+from parcelamentos.metricas import ETAPAS_ARQUIVO, rotulo_faixa
+from parcelamentos.motor import processar_pasta
+from parcelamentos.resultados import ArmazemResultados
+from parcelamentos.saida import salvar_colunar
+from tabela_virtual import TabelaVirtual
+
+# Intervalo em que a interface aplica o que a thread de processamento enviou
+INTERVALO_FILA_MS = 100
+
+COLUNAS_TABELA = ("Empresa", "CNPJ", "Tipo", "Subtipo", "Conta", "Modalidade", "Status", "Detalhes", "Valor", "Arquivo")
+
+
+def valores_linha(row):
+    """Valores de um registro como exibidos na tabela de parcelamentos"""
+    return (
+        row['Nome_Empresa'],
+        row['CNPJ'],
+        row['Tipo'],
+        row['Subtipo'],
+        row['Conta'],
+        row['Modalidade'],
+        row['Status'],
+        row['Detalhes'],
+        f"R$ {row['Valor']:,.2f}" if row['Valor'] > 0 else "-",
+        row['Arquivo']
+    )
+
+
 class AnalisadorParcelamentos:
     def __init__(self):
-        self.dados_processados = []
+        # Registros da execução e índices para os filtros (compartilhados por tabela,
+        # dashboard e exportação); dados_processados é a lista do armazém. Todos
+        # os registros ficam em memória (compactos): a memória constante do
+        # processamento em fluxo/lotes vale para a CLI e o serviço, não aqui
+        self.resultados = ArmazemResultados()
+        self.dados_processados = self.resultados.registros
+        self.dados_exibidos = self.dados_processados
         self.empresas_filtradas = set()
+        self.fila_interface = queue.Queue()
         self.setup_gui()
+        self.janela.after(INTERVALO_FILA_MS, self.drenar_fila)
         
     def setup_gui(self):
         # Criar janela principal
@@ -71,6 +107,36 @@ class AnalisadorParcelamentos:
         tk.Button(frame_saida, text="Selecionar", command=self.selecionar_pasta_saida, 
                   bg="#1976D2", fg="white").pack(side="right")
 
+        # Busca dos PDFs
+        busca_frame = tk.LabelFrame(inputs_frame, text="Busca dos PDFs", font=("Arial", 9, "bold"))
+        busca_frame.pack(fill="x", pady=(0, 5))
+
+        self.incluir_subpastas = tk.BooleanVar(value=True)
+        tk.Checkbutton(busca_frame, text="Incluir subpastas (ex.: ano/mês/cliente)", 
+                      variable=self.incluir_subpastas).pack(anchor="w", padx=10, pady=2)
+
+        frame_padroes = tk.Frame(busca_frame)
+        frame_padroes.pack(fill="x", padx=10, pady=2)
+        tk.Label(frame_padroes, text="Incluir:").pack(side="left")
+        self.entrada_incluir = tk.Entry(frame_padroes, width=18, font=("Arial", 9))
+        self.entrada_incluir.insert(0, "*.pdf")
+        self.entrada_incluir.pack(side="left", padx=5)
+        tk.Label(frame_padroes, text="Excluir:").pack(side="left")
+        self.entrada_excluir = tk.Entry(frame_padroes, width=18, font=("Arial", 9))
+        self.entrada_excluir.pack(side="left", padx=5)
+        tk.Label(frame_padroes, text="(padrões separados por ;)", font=("Arial", 8), fg="#666666").pack(side="left")
+
+        frame_datas = tk.Frame(busca_frame)
+        frame_datas.pack(fill="x", padx=10, pady=2)
+        tk.Label(frame_datas, text="Modificados de:").pack(side="left")
+        self.entrada_desde = tk.Entry(frame_datas, width=11, font=("Arial", 9))
+        self.entrada_desde.pack(side="left", padx=5)
+        tk.Label(frame_datas, text="até:").pack(side="left")
+        self.entrada_ate = tk.Entry(frame_datas, width=11, font=("Arial", 9))
+        self.entrada_ate.pack(side="left", padx=5)
+        tk.Label(frame_datas, text="(AAAA-MM-DD, em branco = sem limite)", font=("Arial", 8),
+                 fg="#666666").pack(side="left")
+
         # Opções avançadas
         options_frame = tk.LabelFrame(inputs_frame, text="Opções Avançadas", font=("Arial", 9, "bold"))
         options_frame.pack(fill="x", pady=10)
@@ -84,9 +150,45 @@ class AnalisadorParcelamentos:
                       variable=self.agrupar_por_empresa).pack(anchor="w", padx=10, pady=2)
 
         self.salvar_backup_json = tk.BooleanVar(value=True)
-        tk.Checkbutton(options_frame, text="Salvar backup em JSON", 
+        tk.Checkbutton(options_frame, text="Salvar backup em JSON (um registro por linha)", 
                       variable=self.salvar_backup_json).pack(anchor="w", padx=10, pady=2)
 
+        self.salvar_parquet = tk.BooleanVar(value=False)
+        tk.Checkbutton(options_frame, text="Salvar também em Parquet (requer pyarrow)", 
+                      variable=self.salvar_parquet).pack(anchor="w", padx=10, pady=2)
+
+        self.ignorar_cache = tk.BooleanVar(value=False)
+        tk.Checkbutton(options_frame, text="Ignorar cache (reprocessar todos os PDFs)", 
+                      variable=self.ignorar_cache).pack(anchor="w", padx=10, pady=2)
+
+        self.retomar = tk.BooleanVar(value=False)
+        tk.Checkbutton(options_frame, text="Retomar execução interrompida (PDFs já concluídos não são refeitos)", 
+                      variable=self.retomar).pack(anchor="w", padx=10, pady=2)
+
+        frame_processos = tk.Frame(options_frame)
+        frame_processos.pack(anchor="w", padx=10, pady=2)
+        tk.Label(frame_processos, text="Processos paralelos (1 = sequencial):").pack(side="left")
+        self.processos_paralelos = tk.IntVar(value=1)
+        tk.Spinbox(frame_processos, from_=1, to=64, width=5,
+                   textvariable=self.processos_paralelos).pack(side="left", padx=5)
+
+        frame_lote = tk.Frame(options_frame)
+        frame_lote.pack(anchor="w", padx=10, pady=2)
+        tk.Label(frame_lote, text="PDFs por lote (0 = todos de uma vez):").pack(side="left")
+        self.tamanho_lote = tk.IntVar(value=0)
+        tk.Spinbox(frame_lote, from_=0, to=100000, increment=500, width=7,
+                   textvariable=self.tamanho_lote).pack(side="left", padx=5)
+
+        frame_backend = tk.Frame(options_frame)
+        frame_backend.pack(anchor="w", padx=10, pady=2)
+        tk.Label(frame_backend, text="Motor de extração de texto:").pack(side="left")
+        self.backend_extracao = ttk.Combobox(frame_backend, width=12, state="readonly",
+                                             values=backends_disponiveis())
+        self.backend_extracao.set(BACKEND_PADRAO)
+        self.backend_extracao.pack(side="left", padx=5)
+        tk.Label(frame_backend, text="(pdfium: rápido, sem análise de layout)",
+                 font=("Arial", 8), fg="#666666").pack(side="left")
+
         # Botões de ação
         buttons_frame = tk.Frame(inputs_frame)
         buttons_frame.pack(pady=20)
@@ -132,11 +234,13 @@ class AnalisadorParcelamentos:
         tk.Label(toolbar, text="Empresa:").grid(row=0, column=1, padx=5)
         self.filtro_empresa = tk.Entry(toolbar, width=20)
         self.filtro_empresa.grid(row=0, column=2, padx=5)
+        self.filtro_empresa.bind("<KeyRelease>", lambda e: self.aplicar_filtros())
 
         tk.Label(toolbar, text="Tipo:").grid(row=0, column=3, padx=5)
         self.filtro_tipo = ttk.Combobox(toolbar, width=15, values=["Todos", "PARCMEI", "PARCSN", "SIEFPAR", "SISPAR", "SICOB"])
         self.filtro_tipo.set("Todos")
         self.filtro_tipo.grid(row=0, column=4, padx=5)
+        self.filtro_tipo.bind("<<ComboboxSelected>>", lambda e: self.aplicar_filtros())
 
         tk.Button(toolbar, text="Aplicar Filtros", command=self.aplicar_filtros, bg="#2196F3", fg="white").grid(row=0, column=5, padx=10)
         tk.Button(toolbar, text="Limpar Filtros", command=self.limpar_filtros, bg="#FF9800", fg="white").grid(row=0, column=6, padx=5)
@@ -153,22 +257,20 @@ class AnalisadorParcelamentos:
         frame_tabela = tk.Frame(frame_resultados)
         frame_tabela.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Colunas da tabela
-        colunas = ("Empresa", "CNPJ", "Tipo", "Subtipo", "Conta", "Modalidade", "Status", "Detalhes", "Valor", "Arquivo")
-        self.tree_parcelamentos = ttk.Treeview(frame_tabela, columns=colunas, show="headings", height=20)
-
         # Configurar colunas
         larguras = {"Empresa": 180, "CNPJ": 120, "Tipo": 80, "Subtipo": 100, "Conta": 100, 
                    "Modalidade": 180, "Status": 120, "Detalhes": 200, "Valor": 100, "Arquivo": 150}
-        
-        for col in colunas:
-            self.tree_parcelamentos.heading(col, text=col, command=lambda c=col: self.ordenar_coluna(c))
-            self.tree_parcelamentos.column(col, width=larguras.get(col, 100))
+
+        # Tabela virtualizada: só as linhas visíveis viram itens do Treeview
+        self.tabela = TabelaVirtual(frame_tabela, COLUNAS_TABELA, valores_linha, larguras, altura=20)
+        self.tree_parcelamentos = self.tabela.tree
+        for col in COLUNAS_TABELA:
+            self.tree_parcelamentos.heading(col, command=lambda c=col: self.ordenar_coluna(c))
 
         # Scrollbars
-        scroll_y = ttk.Scrollbar(frame_tabela, orient="vertical", command=self.tree_parcelamentos.yview)
+        scroll_y = self.tabela.scroll_y
         scroll_x = ttk.Scrollbar(frame_tabela, orient="horizontal", command=self.tree_parcelamentos.xview)
-        self.tree_parcelamentos.configure(yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
+        self.tree_parcelamentos.configure(xscrollcommand=scroll_x.set)
 
         self.tree_parcelamentos.pack(side="left", fill="both", expand=True)
         scroll_y.pack(side="right", fill="y")
@@ -197,7 +299,8 @@ class AnalisadorParcelamentos:
             ("total_empresas", "🏢 Total de Empresas:"),
             ("total_parcelamentos", "📊 Total de Parcelamentos:"),
             ("empresas_com_parcelas_atraso", "⚠️ Com Parcelas em Atraso:"),
-            ("valor_total_suspenso", "💰 Valor Total Suspenso:")
+            ("valor_total_suspenso", "💰 Valor Total Suspenso:"),
+            ("pdfs_ignorados", "⏭️ PDFs Ignorados (fora do filtro):")
         ]
 
         for i, (key, label) in enumerate(stats_info):
@@ -219,6 +322,29 @@ class AnalisadorParcelamentos:
 
         self.tree_resumo.pack(fill="both", expand=True, padx=10, pady=10)
 
+        # Desempenho da última execução: PDFs mais lentos e histograma por etapa
+        desempenho_frame = tk.LabelFrame(frame_dashboard, text="Desempenho da Última Execução", font=("Arial", 10, "bold"))
+        desempenho_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        colunas_lentos = ("Arquivo", "Origem", "Páginas", "Tamanho", "Total (s)", "Texto (s)", "Padrões (s)")
+        self.tree_lentos = ttk.Treeview(desempenho_frame, columns=colunas_lentos, show="headings", height=8)
+        for col in colunas_lentos:
+            self.tree_lentos.heading(col, text=col)
+            self.tree_lentos.column(col, width=220 if col == "Arquivo" else 90)
+        self.tree_lentos.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+
+        histograma_frame = tk.Frame(desempenho_frame)
+        histograma_frame.pack(side="right", fill="both", padx=10, pady=10)
+        tk.Label(histograma_frame, text="Etapa:", font=("Arial", 9)).pack(anchor="w")
+        self.etapa_histograma = ttk.Combobox(histograma_frame, values=("total",) + ETAPAS_ARQUIVO,
+                                             state="readonly", width=12)
+        self.etapa_histograma.set("total")
+        self.etapa_histograma.bind("<<ComboboxSelected>>", lambda e: self.desenhar_histograma())
+        self.etapa_histograma.pack(anchor="w")
+        self.canvas_histograma = tk.Canvas(histograma_frame, width=360, height=170, bg="white")
+        self.canvas_histograma.pack(fill="both", expand=True, pady=(5, 0))
+        self.metricas = None
+
     # Métodos de interface
     def selecionar_pasta_pdfs(self):
         pasta = filedialog.askdirectory(title="Selecione a pasta com os PDFs")
@@ -241,216 +367,8 @@ class AnalisadorParcelamentos:
             self.entrada_pasta_saida.delete(0, tk.END)
             self.entrada_pasta_saida.insert(0, pasta)
 
-    def normalizar_cnpj(self, cnpj):
-        """Remove formatação do CNPJ e retorna apenas números"""
-        if not cnpj:
-            return ""
-        return re.sub(r'\D', '', cnpj)
-
-    def extrair_valor_monetario(self, texto):
-        """Extrai valores monetários do texto"""
-        pattern = r'[\d\.,]+(?=\s*(?:reais?|R\$|\b))'
-        matches = re.findall(pattern, texto)
-        if matches:
-            # Pega o maior valor encontrado
-            valores = []
-            for match in matches:
-                try:
-                    valor = float(match.replace('.', '').replace(',', '.'))
-                    valores.append(valor)
-                except:
-                    continue
-            return max(valores) if valores else 0
-        return 0
-
-    def extrair_dados_pdf(self, caminho_pdf):
-        dados = []
-        nome_arquivo = os.path.basename(caminho_pdf)
-        
-        try:
-            with pdfplumber.open(caminho_pdf) as pdf:
-                texto = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
-
-                # Extrair CNPJ e Nome da empresa
-                cnpj_match = re.search(r"CNPJ:\s*(\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2})", texto)
-                cnpj_formatado = cnpj_match.group(1) if cnpj_match else "Não encontrado"
-                cnpj_numeros = self.normalizar_cnpj(cnpj_formatado)
-                
-                # Extrair nome da empresa
-                nome_match = re.search(r"CNPJ:\s*\d{2}\.\d{3}\.\d{3}.*?-\s*(.+)", texto)
-                nome_empresa = nome_match.group(1).strip() if nome_match else "Não encontrado"
-
-                # 1) PARCMEI - MEI
-                if "MEI - EM PARCELAMENTO" in texto:
-                    mei_match = re.search(r"MEI - EM PARCELAMENTO\s+Parcelas em atraso\s*(\d+)", texto)
-                    if mei_match:
-                        dados.append({
-                            "CNPJ": cnpj_formatado,
-                            "CNPJ_Numeros": cnpj_numeros,
-                            "Nome_Empresa": nome_empresa,
-                            "Tipo": "PARCMEI",
-                            "Subtipo": "MEI",
-                            "Conta": "-",
-                            "Modalidade": "MEI - Parcelamento",
-                            "Detalhes": f"Parcelas em atraso: {mei_match.group(1)}",
-                            "Status": "Em Parcelamento",
-                            "Valor": 0,
-                            "Arquivo": nome_arquivo
-                        })
-
-                # 2) PARCSN - Simples Nacional
-                if "SIMPLES NACIONAL - EM PARCELAMENTO" in texto or "SIMPLES NACIONAL - RELP - EM PARCELAMENTO" in texto:
-                    sn_matches = re.findall(r"(SIMPLES NACIONAL.*EM PARCELAMENTO)(?:\s+Parcelas em atraso\s*(\d+))?", texto)
-                    for match in sn_matches:
-                        titulo, parcelas = match
-                        parcelas = parcelas if parcelas else "0"
-                        dados.append({
-                            "CNPJ": cnpj_formatado,
-                            "CNPJ_Numeros": cnpj_numeros,
-                            "Nome_Empresa": nome_empresa,
-                            "Tipo": "PARCSN",
-                            "Subtipo": "Simples Nacional",
-                            "Conta": "-",
-                            "Modalidade": titulo.strip(),
-                            "Detalhes": f"Parcelas em atraso: {parcelas}",
-                            "Status": "Em Parcelamento",
-                            "Valor": 0,
-                            "Arquivo": nome_arquivo
-                        })
-
-
-                # 3) SIEFPAR - Parcelamento com Exigibilidade Suspensa (Receita Federal)
-                if "Pendência – Parcelamento (SIEFPAR)" in texto:
-                    pattern = r"Parcelamento:\s*(\d+)\s+Parcelas em Atraso:\s*(\d+)\s+Valor em Atraso:\s*([\d\.,]+)"
-                    matches = re.findall(pattern, texto)
-                    for conta, parcelas, valor_str in matches:
-                        valor = self.extrair_valor_monetario(valor_str)
-                        dados.append({
-                            "Tipo": "SIEFPAR",
-                            "Subtipo": "Receita Federal",
-                            "Conta": conta.strip(),
-                            "Modalidade": "Parcelamento Simplificado",
-                            "Detalhes": f"Parcelas em atraso: {parcelas}, Valor em atraso: R$ {valor_str}",
-                            "Status": "Exigibilidade Suspensa",
-                            "Valor": valor,
-                            "Arquivo": nome_arquivo,
-                            "CNPJ": cnpj_formatado,
-                            "CNPJ_Numeros": cnpj_numeros,
-                            "Nome_Empresa": nome_empresa,
-                        })
-
-                if "Parcelamento com Exigibilidade Suspensa (SIEFPAR)" in texto:
-                    pattern = r"Parcelamento:\s*(\d+)\s+Valor Suspenso:\s*([\d\.,]+)"
-                    matches = re.findall(pattern, texto)
-                    for conta, valor_str in matches:
-                        valor = self.extrair_valor_monetario(valor_str)
-                        dados.append({
-                            "Tipo": "SIEFPAR",
-                            "Subtipo": "Receita Federal",
-                            "Conta": conta.strip(),
-                            "Modalidade": "Parcelamento Simplificado",
-                            "Detalhes": f"Valor suspenso: R$ {valor_str}",
-                            "Status": "Exigibilidade Suspensa",
-                            "Valor": valor,
-                            "Arquivo": nome_arquivo,
-                            "CNPJ": cnpj_formatado,
-                            "CNPJ_Numeros": cnpj_numeros,
-                            "Nome_Empresa": nome_empresa,
-                        })
-
-                
-                # # 4) SISPAR - Parcelamento com Exigibilidade Suspensa (PGFN)
-                # if "Parcelamento com Exigibilidade Suspensa (SISPAR)" in texto:
-                #     sispar_pattern = r"Conta\s+(\d+)\s+([^\n]+?)\s+Modalidade:\s*([^\n]+)"
-                #     matches = re.findall(sispar_pattern, texto)
-                    
-                #     for conta, tipo_parcela, modalidade in matches:
-                #         dados.append({
-                #             "CNPJ": cnpj_formatado,
-                #             "CNPJ_Numeros": cnpj_numeros,
-                #             "Nome_Empresa": nome_empresa,
-                #             "Tipo": "SISPAR",
-                #             "Subtipo": "PGFN",
-                #             "Conta": conta.strip(),
-                #             "Modalidade": modalidade.strip(),
-                #             "Detalhes": tipo_parcela.strip(),
-                #             "Status": "Exigibilidade Suspensa",
-                #             "Valor": 0,
-                #             "Arquivo": nome_arquivo
-                #         })
-
-                if "SISPAR" in texto:
-                    sispar_pattern = r"(?:Conta\s*)?(\d+)\s+([^\n]+)\nModalidade:\s*([^\n]+)"
-                    matches = re.findall(sispar_pattern, texto)
-
-                    for conta, tipo_parcela, modalidade in matches:
-                        dados.append({
-                            "CNPJ": cnpj_formatado,
-                            "CNPJ_Numeros": cnpj_numeros,
-                            "Nome_Empresa": nome_empresa,
-                            "Tipo": "SISPAR",
-                            "Subtipo": "PGFN",
-                            "Conta": conta.strip(),
-                            "Modalidade": modalidade.strip(),
-                            "Detalhes": tipo_parcela.strip(),
-                            "Status": "Exigibilidade Suspensa",
-                            "Valor": 0,
-                            "Arquivo": nome_arquivo
-                        })
-
-
-
-
-                # 5) SICOB - Débito com Exigibilidade Suspensa
-                if "Débito com Exigibilidade Suspensa (SICOB)" in texto:
-                    sicob_pattern = r"Parcelamento:\s*(\d+-\d+)\s+Situação:\s*(\d+\s*-\s*.+)"
-                    matches = re.findall(sicob_pattern, texto)
-                    
-                    for parcela, situacao in matches:
-                        dados.append({
-                            "CNPJ": cnpj_formatado,
-                            "CNPJ_Numeros": cnpj_numeros,
-                            "Nome_Empresa": nome_empresa,
-                            "Tipo": "SICOB",
-                            "Subtipo": "Débito Suspenso",
-                            "Conta": parcela.strip(),
-                            "Modalidade": "RFB LEI 10522/02",
-                            "Detalhes": f"Situação: {situacao}",
-                            "Status": "Ativo/Em Dia",
-                            "Valor": 0,
-                            "Arquivo": nome_arquivo
-                        })
-
-                # Incluir detalhes de débitos se solicitado
-                if self.incluir_detalhes_debitos.get() and "Pendência - Débito (SIEF)" in texto:
-                    # Extrair débitos pendentes
-                    debito_pattern = r"(\d{4}-\d{2}\s*-\s*.+?)\s+(\d{2}/\d{4})\s+[\d/]+\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+(.+)"
-                    debitos = re.findall(debito_pattern, texto)
-                    
-                    for receita, periodo, dt_vcto, vl_orig, sdo_dev, multa, juros, sdo_cons, situacao in debitos[:5]:  # Limita a 5 débitos
-                        valor_total = self.extrair_valor_monetario(sdo_cons) if sdo_cons else 0
-                        dados.append({
-                            "CNPJ": cnpj_formatado,
-                            "CNPJ_Numeros": cnpj_numeros,
-                            "Nome_Empresa": nome_empresa,
-                            "Tipo": "DÉBITO",
-                            "Subtipo": "Pendência",
-                            "Conta": receita.strip(),
-                            "Modalidade": f"Período: {periodo}",
-                            "Detalhes": f"Situação: {situacao.strip()}",
-                            "Status": "Devedor",
-                            "Valor": valor_total,
-                            "Arquivo": nome_arquivo
-                        })
-
-        except Exception as e:
-            self.log(f"Erro ao processar {nome_arquivo}: {str(e)}")
-            
-        return dados
-
     def processar_pdfs(self):
         pasta_pdfs = self.entrada_pasta_pdfs.get()
-        excel_empresas = self.entrada_excel.get()
         pasta_saida = self.entrada_pasta_saida.get()
 
         if not pasta_pdfs:
@@ -461,193 +379,193 @@ class AnalisadorParcelamentos:
             messagebox.showerror("Erro", "Selecione a pasta de saída!")
             return
 
-        def processar():
-            try:
-                self.limpar_resultados()
-                inicio = datetime.now()
-                
-                # Carrega lista de empresas se fornecida
-                if excel_empresas:
-                    try:
-                        df_empresas = pd.read_excel(excel_empresas, dtype=str)
-                        if 'CNPJ' in df_empresas.columns:
-                            self.empresas_filtradas = set(df_empresas['CNPJ'].apply(self.normalizar_cnpj))
-                        self.log(f"✅ Carregadas {len(self.empresas_filtradas)} empresas do Excel")
-                    except Exception as e:
-                        self.log(f"⚠️ Erro ao carregar Excel: {str(e)}")
+        configuracao = self.obter_configuracao()
 
-                # Lista arquivos PDF
-                arquivos_pdf = [f for f in os.listdir(pasta_pdfs) if f.lower().endswith('.pdf')]
-                total_arquivos = len(arquivos_pdf)
-                
-                self.log(f"📁 Encontrados {total_arquivos} PDFs para processar...")
-                self.progress_var.set(0)
-
-                todos_dados = []
-                for i, arquivo in enumerate(arquivos_pdf, 1):
-                    caminho = os.path.join(pasta_pdfs, arquivo)
-                    self.status_label.config(text=f"Processando {i}/{total_arquivos}: {arquivo}")
-                    self.log(f"[{i}/{total_arquivos}] {arquivo}")
-                    
-                    dados = self.extrair_dados_pdf(caminho)
-                    
-                    # Aplicar filtro de empresas se existe
-                    if self.empresas_filtradas:
-                        dados_filtrados = [d for d in dados if d['CNPJ_Numeros'] in self.empresas_filtradas]
-                        if dados_filtrados:
-                            self.log(f"  ✅ {len(dados_filtrados)} parcelamentos encontrados (filtrado)")
-                        dados = dados_filtrados
-                    else:
-                        if dados:
-                            self.log(f"  📊 {len(dados)} parcelamentos encontrados")
-                    
-                    todos_dados.extend(dados)
-                    
-                    # Atualizar progress bar
-                    progresso = (i / total_arquivos) * 100
-                    self.progress_var.set(progresso)
-                    self.janela.update()
-
-                # Processar e salvar resultados
-                if todos_dados:
-                    self.dados_processados = todos_dados
-                    df = pd.DataFrame(todos_dados)
-                    
-                    # Agrupar por empresa se solicitado
-                    if self.agrupar_por_empresa.get():
-                        df = df.sort_values(['Nome_Empresa', 'Tipo'])
-                    else:
-                        df = df.sort_values(['Tipo', 'Nome_Empresa'])
-                    
-                    # Salvar Excel
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    caminho_excel = os.path.join(pasta_saida, f"parcelamentos_detalhados_{timestamp}.xlsx")
-                    df.to_excel(caminho_excel, index=False)
-                    
-                    # Salvar backup JSON se solicitado
-                    if self.salvar_backup_json.get():
-                        caminho_json = os.path.join(pasta_saida, f"parcelamentos_backup_{timestamp}.json")
-                        with open(caminho_json, 'w', encoding='utf-8') as f:
-                            json.dump(todos_dados, f, ensure_ascii=False, indent=2)
-                    
-                    # Atualizar interface
-                    self.atualizar_tabela()
-                    self.atualizar_dashboard()
-                    
-                    fim = datetime.now()
-                    tempo_total = (fim - inicio).total_seconds()
-                    
-                    self.log(f"\n✅ PROCESSAMENTO CONCLUÍDO!")
-                    self.log(f"⏱️ Tempo total: {tempo_total:.1f} segundos")
-                    self.log(f"📊 Total de parcelamentos: {len(todos_dados)}")
-                    self.log(f"🏢 Empresas processadas: {df['Nome_Empresa'].nunique()}")
-                    self.log(f"💾 Arquivo salvo: {caminho_excel}")
-                    
-                else:
-                    self.log(f"\n⚠️ Nenhum parcelamento foi encontrado nos PDFs!")
+        # A thread de processamento não toca nos widgets: tudo passa pela fila
+        fila = self.fila_interface
 
+        def processar():
+            resultado = erro = None
+            try:
+                resultado = processar_pasta(
+                    configuracao, log=self.log,
+                    progresso=lambda concluidos, encontrados, arquivo: fila.put(
+                        ("progresso", concluidos, encontrados, arquivo)),
+                    ao_gravar=lambda dados: fila.put(("registros", dados)),
+                    manter_dados=False
+                )
             except Exception as e:
-                self.log(f"\n❌ ERRO: {str(e)}")
-            
+                erro = e
             finally:
-                self.btn_processar.config(state="normal", text="🔄 Processar PDFs")
-                self.status_label.config(text="Processamento concluído")
-                self.progress_var.set(100)
+                fila.put(("fim", resultado, erro))
 
         # Executar em thread separada
+        self.limpar_resultados()
         self.btn_processar.config(state="disabled", text="Processando...")
         thread = threading.Thread(target=processar)
         thread.daemon = True
         thread.start()
 
     def log(self, mensagem):
-        """Adiciona mensagem ao log"""
+        """Adiciona mensagem ao log (pode ser chamado de qualquer thread)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.text_resultados.insert(tk.END, f"[{timestamp}] {mensagem}\n")
+        self.fila_interface.put(("log", f"[{timestamp}] {mensagem}\n"))
+
+    def drenar_fila(self):
+        """Aplica de uma vez tudo o que chegou na fila desde a última chamada"""
+        linhas = []
+        progresso = None
+        novos = []
+        fim = None
+        try:
+            while True:
+                mensagem = self.fila_interface.get_nowait()
+                if mensagem[0] == "log":
+                    linhas.append(mensagem[1])
+                elif mensagem[0] == "progresso":
+                    progresso = mensagem[1:]  # só o mais recente importa
+                elif mensagem[0] == "registros":
+                    novos.extend(mensagem[1])
+                elif mensagem[0] == "fim":
+                    fim = mensagem[1:]
+        except queue.Empty:
+            pass
+
+        # Cada parte à parte: um erro ao atualizar a tela não impede as outras
+        # (nem o "fim") e o laço continua, pois a thread segue enviando
+        try:
+            for aplicar, dados in ((self._aplicar_log, linhas), (self._aplicar_progresso, progresso),
+                                   (self._aplicar_registros, novos), (self._aplicar_fim, fim)):
+                if dados:
+                    try:
+                        aplicar(dados)
+                    except Exception as e:
+                        self.log(f"⚠️ Erro ao atualizar a interface: {str(e)}")
+        finally:
+            self.janela.after(INTERVALO_FILA_MS, self.drenar_fila)
+
+    def _aplicar_log(self, linhas):
+        self.text_resultados.insert(tk.END, "".join(linhas))
         self.text_resultados.see(tk.END)
-        self.janela.update()
+
+    def _aplicar_progresso(self, progresso):
+        # Os PDFs são processados enquanto a busca continua: o total pode crescer
+        concluidos, total, arquivo = progresso
+        self.status_label.config(text=f"Processados {concluidos} de {total} encontrados: {arquivo}")
+        self.progress_var.set((concluidos / total) * 100)
+
+    def _aplicar_registros(self, novos):
+        # Resultados parciais aparecem na tabela durante o processamento
+        self.resultados.acrescentar(novos)
+        if self.dados_exibidos is self.dados_processados:
+            self.tabela.atualizar()
+            self.label_contador.config(text=f"{len(self.dados_processados)} resultados")
+        # Totais mantidos a cada lote: atualizar custa O(tipos), não O(registros)
+        self.atualizar_dashboard()
+
+    def _aplicar_fim(self, fim):
+        self.finalizar_processamento(*fim)
+
+    def finalizar_processamento(self, resultado, erro):
+        """Atualiza a interface ao fim do processamento (na thread do Tk)"""
+        if erro is not None:
+            self.log(f"\n❌ ERRO: {str(erro)}")
+        else:
+            self.empresas_filtradas = resultado.empresas_filtradas
+            self.stats_labels['pdfs_ignorados'].config(text=str(resultado.ignorados))
+            self.metricas = resultado.metricas
+            self.atualizar_desempenho()
+            if self.dados_processados:
+                # Atualizar interface
+                self.atualizar_tabela()
+                self.atualizar_dashboard()
+
+        self.btn_processar.config(state="normal", text="🔄 Processar PDFs")
+        self.status_label.config(text="Processamento concluído")
+        self.progress_var.set(100)
 
     def atualizar_tabela(self, dados=None):
         """Atualiza a tabela de resultados"""
         if dados is None:
             dados = self.dados_processados
-            
-        # Limpar tabela
-        for item in self.tree_parcelamentos.get_children():
-            self.tree_parcelamentos.delete(item)
-        
-        # Preencher tabela
-        for row in dados:
-            valores = (
-                row['Nome_Empresa'],
-                row['CNPJ'],
-                row['Tipo'],
-                row['Subtipo'],
-                row['Conta'],
-                row['Modalidade'],
-                row['Status'],
-                row['Detalhes'],
-                f"R$ {row['Valor']:,.2f}" if row['Valor'] > 0 else "-",
-                row['Arquivo']
-            )
-            self.tree_parcelamentos.insert("", tk.END, values=valores)
+        self.dados_exibidos = dados
+
+        # Só a janela visível é redesenhada, qualquer que seja o tamanho de dados
+        self.tabela.definir_registros(dados)
         
         self.label_contador.config(text=f"{len(dados)} resultados")
 
     def atualizar_dashboard(self):
-        """Atualiza as estatísticas do dashboard"""
-        if not self.dados_processados:
+        """Atualiza as estatísticas do dashboard a partir dos totais do armazém"""
+        agregados = self.resultados.agregados
+        if not agregados.total_registros:
             return
-            
-        df = pd.DataFrame(self.dados_processados)
         
         # Estatísticas gerais
-        total_empresas = df['Nome_Empresa'].nunique()
-        total_parcelamentos = len(df)
-        empresas_atraso = len(df[df['Detalhes'].str.contains('Parcelas em atraso', na=False)]['Nome_Empresa'].unique())
-        valor_total = df['Valor'].sum()
-        
-        self.stats_labels['total_empresas'].config(text=str(total_empresas))
-        self.stats_labels['total_parcelamentos'].config(text=str(total_parcelamentos))
-        self.stats_labels['empresas_com_parcelas_atraso'].config(text=str(empresas_atraso))
-        self.stats_labels['valor_total_suspenso'].config(text=f"R$ {valor_total:,.2f}")
+        self.stats_labels['total_empresas'].config(text=str(len(agregados.empresas)))
+        self.stats_labels['total_parcelamentos'].config(text=str(agregados.total_registros))
+        self.stats_labels['empresas_com_parcelas_atraso'].config(text=str(len(agregados.empresas_com_atraso)))
+        self.stats_labels['valor_total_suspenso'].config(text=f"R$ {agregados.valor_total:,.2f}")
         
         # Resumo por tipo
         for item in self.tree_resumo.get_children():
             self.tree_resumo.delete(item)
-            
-        resumo_tipo = df.groupby('Tipo').agg({
-            'Nome_Empresa': 'nunique',
-            'CNPJ': 'count'
-        }).round(2)
         
-        for tipo, row in resumo_tipo.iterrows():
-            empresas = row['Nome_Empresa']
-            quantidade = row['CNPJ']
-            percentual = (quantidade / total_parcelamentos) * 100
-            
+        for tipo, quantidade, empresas, percentual in agregados.resumo_por_tipo():
             self.tree_resumo.insert("", tk.END, values=(
                 tipo, quantidade, empresas, f"{percentual:.1f}%"
             ))
 
+    def atualizar_desempenho(self, quantidade=15):
+        """Preenche a tabela de PDFs mais lentos e o histograma com as métricas da execução"""
+        for item in self.tree_lentos.get_children():
+            self.tree_lentos.delete(item)
+        if self.metricas is None:
+            return
+        for linha in self.metricas.mais_lentos(quantidade):
+            self.tree_lentos.insert("", tk.END, values=(
+                linha["Arquivo"], linha["Origem"], linha["Paginas"], f"{linha['Bytes'] / 1024:,.0f} KB",
+                f"{self.metricas.total(linha):.2f}", f"{linha.get('texto', 0.0):.2f}",
+                f"{linha.get('padroes', 0.0):.3f}"
+            ))
+        self.desenhar_histograma()
+
+    def desenhar_histograma(self):
+        """Barras com a quantidade de PDFs em cada faixa de tempo da etapa escolhida"""
+        canvas = self.canvas_histograma
+        canvas.delete("all")
+        if self.metricas is None:
+            return
+        etapa = self.etapa_histograma.get()
+        contagem = self.metricas.histograma(None if etapa == "total" else etapa)
+        maior = max(contagem) or 1
+        largura = int(canvas["width"])
+        altura_barra = int(canvas["height"]) // len(contagem)
+        for i, quantidade in enumerate(contagem):
+            y = i * altura_barra
+            canvas.create_text(5, y + altura_barra / 2, text=rotulo_faixa(i), anchor="w", font=("Arial", 8))
+            comprimento = (largura - 120) * quantidade / maior
+            canvas.create_rectangle(70, y + 3, 70 + comprimento, y + altura_barra - 3, fill="#1976D2", outline="")
+            canvas.create_text(75 + comprimento, y + altura_barra / 2, text=str(quantidade), anchor="w",
+                               font=("Arial", 8))
+
     def aplicar_filtros(self):
         """Aplica filtros na tabela"""
         if not self.dados_processados:
             return
-            
-        dados_filtrados = self.dados_processados.copy()
-        
-        # Filtro por empresa
-        filtro_emp = self.filtro_empresa.get().lower()
-        if filtro_emp:
-            dados_filtrados = [d for d in dados_filtrados if filtro_emp in d['Nome_Empresa'].lower()]
-        
-        # Filtro por tipo
+
+        filtros = {}
+        filtro_emp = self.filtro_empresa.get()
         filtro_tip = self.filtro_tipo.get()
         if filtro_tip != "Todos":
-            dados_filtrados = [d for d in dados_filtrados if d['Tipo'] == filtro_tip]
-        
-        self.atualizar_tabela(dados_filtrados)
+            filtros["Tipo"] = filtro_tip
+        if not filtro_emp and not filtros:
+            self.atualizar_tabela()
+            return
+
+        # Consulta nos índices do armazém; a tabela recebe uma visão, sem cópia
+        posicoes = self.resultados.filtrar(filtro_emp, **filtros)
+        self.atualizar_tabela(self.resultados.visao(posicoes))
 
     def limpar_filtros(self):
         """Limpa todos os filtros"""
@@ -657,22 +575,48 @@ class AnalisadorParcelamentos:
 
     def limpar_resultados(self):
         """Limpa todos os resultados"""
-        self.dados_processados = []
+        self.resultados = ArmazemResultados()
+        self.dados_processados = self.resultados.registros
         self.text_resultados.delete(1.0, tk.END)
         self.atualizar_tabela()
+        self.metricas = None
+        self.atualizar_desempenho()
         self.progress_var.set(0)
         self.status_label.config(text="Resultados limpos")
 
-    def salvar_config(self):
-        """Salva configuração atual"""
-        config = {
+    def obter_configuracao(self):
+        """Configuração atual da interface, no formato usado por processar_pasta"""
+        try:
+            processos = max(1, int(self.processos_paralelos.get()))
+        except (tk.TclError, ValueError):
+            processos = 1
+        try:
+            tamanho_lote = max(0, int(self.tamanho_lote.get()))
+        except (tk.TclError, ValueError):
+            tamanho_lote = 0
+        return {
             "pasta_pdfs": self.entrada_pasta_pdfs.get(),
             "excel_empresas": self.entrada_excel.get(),
             "pasta_saida": self.entrada_pasta_saida.get(),
             "incluir_detalhes_debitos": self.incluir_detalhes_debitos.get(),
             "agrupar_por_empresa": self.agrupar_por_empresa.get(),
-            "salvar_backup_json": self.salvar_backup_json.get()
+            "salvar_backup_json": self.salvar_backup_json.get(),
+            "salvar_parquet": self.salvar_parquet.get(),
+            "processos_paralelos": processos,
+            "tamanho_lote": tamanho_lote,
+            "ignorar_cache": self.ignorar_cache.get(),
+            "retomar": self.retomar.get(),
+            "incluir_subpastas": self.incluir_subpastas.get(),
+            "padroes_incluir": self.entrada_incluir.get(),
+            "padroes_excluir": self.entrada_excluir.get(),
+            "modificado_desde": self.entrada_desde.get().strip(),
+            "modificado_ate": self.entrada_ate.get().strip(),
+            "backend_extracao": self.backend_extracao.get() or BACKEND_PADRAO
         }
+
+    def salvar_config(self):
+        """Salva configuração atual"""
+        config = self.obter_configuracao()
         
         arquivo_config = filedialog.asksaveasfilename(
             title="Salvar configuração",
@@ -687,28 +631,29 @@ class AnalisadorParcelamentos:
 
     def exportar_filtrados(self):
         """Exporta dados atualmente filtrados"""
-        items = self.tree_parcelamentos.get_children()
-        if not items:
+        if not self.dados_exibidos:
             messagebox.showwarning("Aviso", "Nenhum dado para exportar!")
             return
             
         arquivo = filedialog.asksaveasfilename(
             title="Exportar dados filtrados",
             defaultextension=".xlsx",
-            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")]
+            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv"), ("Parquet", "*.parquet"), ("Arrow", "*.arrow")]
         )
         
-        if arquivo:
+        if arquivo.lower().endswith(('.parquet', '.arrow')):
+            # Formatos colunares usam os registros originais, com tipos preservados
+            try:
+                salvar_colunar(self.dados_exibidos, arquivo)
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao exportar: {str(e)}")
+                return
+            messagebox.showinfo("Sucesso", f"Dados exportados: {arquivo}")
+        elif arquivo:
             # Coletar dados da tabela
-            dados_exportar = []
-            for item in items:
-                valores = self.tree_parcelamentos.item(item)['values']
-                dados_exportar.append(dict(zip(
-                    ["Empresa", "CNPJ", "Tipo", "Subtipo", "Conta", "Modalidade", "Status", "Detalhes", "Valor", "Arquivo"],
-                    valores
-                )))
-            
-            df = pd.DataFrame(dados_exportar)
+            df = self.dados_exibidos.para_dataframe().rename(columns={"Nome_Empresa": "Empresa"})
+            df["Valor"] = df["Valor"].map(lambda v: f"R$ {v:,.2f}" if v > 0 else "-")
+            df = df[list(COLUNAS_TABELA)]
             
             if arquivo.endswith('.xlsx'):
                 df.to_excel(arquivo, index=False)
@@ -719,15 +664,14 @@ class AnalisadorParcelamentos:
 
     def copiar_selecionados(self):
         """Copia itens selecionados para clipboard"""
-        selecionados = self.tree_parcelamentos.selection()
+        selecionados = self.tabela.registros_selecionados()
         if not selecionados:
             messagebox.showwarning("Aviso", "Selecione pelo menos um item!")
             return
         
         texto = ""
-        for item in selecionados:
-            valores = self.tree_parcelamentos.item(item)['values']
-            texto += "\t".join(str(v) for v in valores) + "\n"
+        for row in selecionados:
+            texto += "\t".join(str(v) for v in valores_linha(row)) + "\n"
         
         self.janela.clipboard_clear()
         self.janela.clipboard_append(texto)
@@ -743,32 +687,30 @@ class AnalisadorParcelamentos:
         try:
             item = self.tree_parcelamentos.identify_row(event.y)
             if item:
-                self.tree_parcelamentos.selection_set(item)
+                self.tabela.selecionar_item(item)
                 self.menu_contexto.post(event.x_root, event.y_root)
         except:
             pass
 
     def copiar_cnpj(self):
         """Copia CNPJ selecionado"""
-        item = self.tree_parcelamentos.selection()[0]
-        cnpj = self.tree_parcelamentos.item(item)['values'][1]
+        cnpj = self.tabela.registros_selecionados()[0]['CNPJ']
         self.janela.clipboard_clear()
         self.janela.clipboard_append(cnpj)
 
     def copiar_linha(self):
         """Copia linha completa"""
-        item = self.tree_parcelamentos.selection()[0]
-        valores = self.tree_parcelamentos.item(item)['values']
+        valores = valores_linha(self.tabela.registros_selecionados()[0])
         texto = "\t".join(str(v) for v in valores)
         self.janela.clipboard_clear()
         self.janela.clipboard_append(texto)
 
     def abrir_pdf(self):
         """Abre PDF correspondente"""
-        item = self.tree_parcelamentos.selection()[0]
-        arquivo = self.tree_parcelamentos.item(item)['values'][-1]
+        arquivo = self.tabela.registros_selecionados()[0]['Arquivo']
         pasta_pdfs = self.entrada_pasta_pdfs.get()
-        caminho_pdf = os.path.join(pasta_pdfs, arquivo)
+        # Arquivo é o caminho relativo à pasta dos PDFs (pode incluir subpastas)
+        caminho_pdf = os.path.normpath(os.path.join(pasta_pdfs, arquivo))
         
         if os.path.exists(caminho_pdf):
             os.startfile(caminho_pdf)  # Windows
@@ -780,5 +722,6 @@ class AnalisadorParcelamentos:
 
 # Executar aplicação
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = AnalisadorParcelamentos()
     app.run()
\ No newline at end of file
@@ -1,9 +1,12 @@
 import os
-import re
 import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
+from parcelamentos.cruzamento import LIMIAR_SEMELHANCA, cruzar_por_nome, cruzar_por_nome_aproximado
+from parcelamentos.normalizacao import normalizar_cnpj_coluna, normalizar_nome_coluna
+from parcelamentos.planilhas import ler_colunas_excel
+
 def selecionar_excel_dados_desejados():
     arquivo = filedialog.askopenfilename(
         title="Selecione o Excel com os dados que você QUER",
@@ -28,39 +31,6 @@ def selecionar_pasta_saida():
         entrada_pasta_saida.delete(0, tk.END)
         entrada_pasta_saida.insert(0, pasta)
 
-def normalize_cnpj(value):
-    """
-    Remove tudo que não for dígito e completa com zeros à esquerda até 14 dígitos.
-    Se value for NaN ou vazio, retorna string vazia.
-    """
-    if pd.isna(value):
-        return ""
-    s = str(value)
-    # Remove tudo que não for dígito
-    digits = re.sub(r'\D', '', s)
-    if digits == "":
-        return ""
-    # Se tiver menos de 14 dígitos, acrescenta zeros à esquerda até 14
-    if len(digits) < 14:
-        digits = digits.zfill(14)
-    return digits
-
-def normalize_nome(value):
-    """
-    Normaliza o nome removendo espaços extras, acentos e convertendo para minúsculas.
-    """
-    if pd.isna(value):
-        return ""
-    nome = str(value).strip().lower()
-    # Remove acentos e caracteres especiais básicos
-    nome = (nome.replace('ã', 'a').replace('á', 'a').replace('à', 'a').replace('â', 'a')
-                .replace('é', 'e').replace('ê', 'e').replace('í', 'i').replace('ó', 'o')
-                .replace('ô', 'o').replace('õ', 'o').replace('ú', 'u').replace('ü', 'u')
-                .replace('ç', 'c').replace('ñ', 'n'))
-    # Remove espaços múltiplos
-    nome = re.sub(r'\s+', ' ', nome)
-    return nome
-
 def gerar_excel():
     excel_desejados = entrada_excel_desejados.get()
     excel_todas = entrada_excel_todas.get()
@@ -75,22 +45,21 @@ def gerar_excel():
         status_label.config(text="Carregando Excel com dados desejados...")
         janela.update()
 
-        # Lê o Excel com dados desejados (coluna A = Nome, coluna B = CNPJ)
-        df_desejados = pd.read_excel(excel_desejados, dtype=str, header=None)
+        # Lê só as colunas usadas do Excel com dados desejados (coluna A = Nome, coluna B = CNPJ)
+        df_desejados = ler_colunas_excel(excel_desejados, [0, 1], cabecalho=False)
         
-        # Verifica se tem pelo menos 2 colunas
+        # Verifica se tem as 2 colunas
         if len(df_desejados.columns) < 2:
             messagebox.showerror("Erro", "O Excel de dados desejados deve ter pelo menos 2 colunas (A=Nome, B=CNPJ)!")
             return
 
         # Define colunas A e B
-        df_desejados.columns = [f'Col_{i}' for i in range(len(df_desejados.columns))]
-        df_desejados['Nome_Desejado'] = df_desejados['Col_0']  # Coluna A
-        df_desejados['CNPJ_Desejado'] = df_desejados['Col_1']  # Coluna B
+        df_desejados['Nome_Desejado'] = df_desejados[0]  # Coluna A
+        df_desejados['CNPJ_Desejado'] = df_desejados[1]  # Coluna B
 
         # Normaliza dados desejados
-        df_desejados['Nome_Normalizado'] = df_desejados['Nome_Desejado'].apply(normalize_nome)
-        df_desejados['CNPJ_Normalizado'] = df_desejados['CNPJ_Desejado'].apply(normalize_cnpj)
+        df_desejados['Nome_Normalizado'] = normalizar_nome_coluna(df_desejados['Nome_Desejado'])
+        df_desejados['CNPJ_Normalizado'] = normalizar_cnpj_coluna(df_desejados['CNPJ_Desejado'], completar_zeros=True)
 
         # Remove linhas com nome vazio
         df_desejados = df_desejados[df_desejados['Nome_Normalizado'] != '']
@@ -98,22 +67,22 @@ def gerar_excel():
         status_label.config(text="Carregando Excel com todas as empresas...")
         janela.update()
 
-        # Lê o Excel com todas as empresas (coluna A = Código, coluna B = Nome, coluna C = CNPJ)
-        df_todas = pd.read_excel(excel_todas, dtype=str, header=None)
+        # Lê só as colunas usadas do Excel com todas as empresas (coluna A = Código, coluna B = Nome, coluna C = CNPJ)
+        df_todas = ler_colunas_excel(excel_todas, [0, 1, 2], cabecalho=False)
         
-        # Verifica se tem pelo menos 3 colunas
+        # Verifica se tem as 3 colunas
         if len(df_todas.columns) < 3:
             messagebox.showerror("Erro", "O Excel de todas as empresas deve ter pelo menos 3 colunas (A=Código, B=Nome, C=CNPJ)!")
             return
 
         # Define colunas A, B e C
-        df_todas.columns = [f'Col_{i}' for i in range(len(df_todas.columns))]
-        df_todas['Codigo'] = df_todas['Col_0']      # Coluna A
-        df_todas['Nome_Todas'] = df_todas['Col_1']   # Coluna B
-        df_todas['CNPJ_Todas'] = df_todas['Col_2']   # Coluna C
+        df_todas['Codigo'] = df_todas[0]      # Coluna A
+        df_todas['Nome_Todas'] = df_todas[1]   # Coluna B
+        df_todas['CNPJ_Todas'] = df_todas[2]   # Coluna C
 
         # Normaliza dados de todas as empresas
-        df_todas['Nome_Todas_Normalizado'] = df_todas['Nome_Todas'].apply(normalize_nome)
+        df_todas['Nome_Todas_Normalizado'] = normalizar_nome_coluna(df_todas['Nome_Todas'])
+        df_todas['CNPJ_Todas_Normalizado'] = normalizar_cnpj_coluna(df_todas['CNPJ_Todas'], completar_zeros=True)
 
         # Remove linhas com nome vazio
         df_todas = df_todas[df_todas['Nome_Todas_Normalizado'] != '']
@@ -121,46 +90,20 @@ def gerar_excel():
         status_label.config(text="Comparando dados por nome...")
         janela.update()
 
-        # Cria conjunto de nomes desejados para busca
-        nomes_desejados = set(df_desejados['Nome_Normalizado'])
+        # Junta por nome normalizado: cada empresa encontrada recebe o primeiro
+        # registro desejado com o mesmo nome
+        if var_aproximado.get():
+            df_resultado, df_duplicados = cruzar_por_nome_aproximado(df_desejados, df_todas, var_limiar.get())
+        else:
+            df_resultado, df_duplicados = cruzar_por_nome(df_desejados, df_todas)
 
-        # Encontra empresas que batem pelo nome
-        df_todas['Match'] = df_todas['Nome_Todas_Normalizado'].isin(nomes_desejados)
-        df_encontradas = df_todas[df_todas['Match']].copy()
-
-        if df_encontradas.empty:
+        if df_resultado.empty:
             messagebox.showwarning("Aviso", "Nenhuma empresa foi encontrada com os nomes fornecidos!")
             return
 
         status_label.config(text="Montando resultado final...")
         janela.update()
 
-        # Para cada empresa encontrada, busca os dados correspondentes no Excel desejado
-        resultado_final = []
-
-        for _, empresa in df_encontradas.iterrows():
-            nome_normalizado = empresa['Nome_Todas_Normalizado']
-            
-            # Busca dados correspondentes no Excel desejado
-            dados_desejados = df_desejados[df_desejados['Nome_Normalizado'] == nome_normalizado]
-            
-            if not dados_desejados.empty:
-                # Pega o primeiro match (caso haja duplicatas)
-                dados = dados_desejados.iloc[0]
-                
-                resultado_final.append({
-                    'Nº': empresa['Codigo'],
-                    'EMPRESA': dados['Nome_Desejado'],
-                    'CNPJ': dados['CNPJ_Normalizado']
-                })
-
-        if not resultado_final:
-            messagebox.showwarning("Aviso", "Nenhuma correspondência foi encontrada!")
-            return
-
-        # Cria DataFrame final
-        df_resultado = pd.DataFrame(resultado_final)
-
         # Remove linhas com código vazio
         df_resultado = df_resultado[df_resultado['Nº'].astype(str).str.strip() != '']
 
@@ -172,7 +115,11 @@ def gerar_excel():
 
         # Salva o resultado
         caminho_saida = os.path.join(pasta_saida, "empresas_filtradas.xlsx")
-        df_resultado.to_excel(caminho_saida, index=False)
+        with pd.ExcelWriter(caminho_saida) as writer:
+            df_resultado.to_excel(writer, index=False)
+            # Nomes repetidos ficam numa aba à parte para conferência
+            if not df_duplicados.empty:
+                df_duplicados.to_excel(writer, sheet_name="Nomes duplicados", index=False)
 
         # Limpa a tabela
         for item in tabela.get_children():
@@ -183,11 +130,17 @@ def gerar_excel():
             tabela.insert("", tk.END, values=(row['Nº'], row['EMPRESA'], row['CNPJ']))
 
         status_label.config(text=f"✅ Concluído! {len(df_resultado)} empresas processadas")
+        aviso_duplicados = (f"⚠️ Nomes duplicados: {len(df_duplicados)} (ver aba 'Nomes duplicados')\n"
+                            if not df_duplicados.empty else "")
+        if 'Critério' in df_resultado.columns:
+            aproximados = int((df_resultado['Critério'] != 'Exato').sum())
+            aviso_duplicados += f"🔎 Nomes aproximados: {aproximados} (conferir colunas Semelhança e Critério)\n"
         
         messagebox.showinfo("Sucesso", 
                           f"Novo Excel gerado com sucesso!\n"
                           f"📁 Local: {caminho_saida}\n"
-                          f"📊 Total de empresas: {len(df_resultado)}\n\n"
+                          f"📊 Total de empresas: {len(df_resultado)}\n"
+                          f"{aviso_duplicados}\n"
                           f"Estrutura do resultado:\n"
                           f"• Código: do Excel 2 (todas as empresas)\n"
                           f"• Nome e CNPJ: do Excel 1 (dados desejados)")
@@ -249,6 +202,17 @@ entrada_pasta_saida.pack(side="left", fill="x", expand=True, padx=(0, 5))
 tk.Button(frame_saida, text="Selecionar", command=selecionar_pasta_saida, 
           bg="#1976D2", fg="white").pack(side="right")
 
+# Cruzamento aproximado
+frame_aproximado = tk.Frame(main_frame)
+frame_aproximado.pack(fill="x")
+var_aproximado = tk.BooleanVar(value=False)
+tk.Checkbutton(frame_aproximado, text="🔎 Aceitar nomes parecidos (LTDA/ME, erros de digitação)",
+               variable=var_aproximado, font=("Arial", 9)).pack(side="left")
+var_limiar = tk.DoubleVar(value=LIMIAR_SEMELHANCA)
+tk.Spinbox(frame_aproximado, from_=0.5, to=1.0, increment=0.05, textvariable=var_limiar,
+           width=5, font=("Arial", 9)).pack(side="right")
+tk.Label(frame_aproximado, text="Semelhança mínima:", font=("Arial", 9)).pack(side="right", padx=(0, 5))
+
 # Frame dos botões
 frame_botoes = tk.Frame(main_frame)
 frame_botoes.pack(pady=10)
@@ -306,6 +270,7 @@ O sistema irá:
   - Código: da coluna A do Excel 2
   - Nome e CNPJ: das colunas A e B do Excel 1
 • Normalizar os CNPJs (apenas números, completando com zeros)
+• Com "nomes parecidos", aceitar também o nome mais semelhante (ou da mesma raiz de CNPJ)
 • Gerar um novo Excel com: Nº, EMPRESA, CNPJ
 """
 
@@ -0,0 +1 @@
+"""Benchmarks do motor de extração (executar a partir de Python_Codes com python -m)"""
@@ -0,0 +1,192 @@
+"""Benchmark por etapa do analisador sobre um corpus sintético de relatórios
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_corpus --pdfs 200 --paginas 2 30
+    python -m benchmarks.bench_corpus --corpus /tmp/corpus --backend pdfium --rotulo "teste pdfium"
+    python -m benchmarks.bench_corpus --comparar 5
+
+Etapas medidas: extração de texto, padrões (iterar_registros_texto), filtro
+de empresas, gravação do NDJSON (backup JSON) e do Excel, e a execução
+completa de processar_pasta. Cada execução é acrescentada como uma linha
+JSON em benchmarks/resultados/bench_corpus.jsonl, com o commit e o corpus
+usados, para comparar entre commits com --comparar.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.gerar_corpus import NOME_GABARITO, gerar_corpus
+from parcelamentos.backends import BACKEND_PADRAO, abrir_documento, backends_disponiveis
+from parcelamentos.extracao import iterar_registros_texto
+from parcelamentos.motor import filtrar_dados_arquivo, processar_pasta
+from parcelamentos.saida import GravadorNdjson, salvar_excel
+
+ARQUIVO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados", "bench_corpus.jsonl")
+ETAPAS = ("texto", "padroes", "filtro", "json", "excel", "completo")
+
+
+def commit_atual():
+    """Hash curto do commit (com "+" se houver alterações não commitadas), ou "?" fora do git"""
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=pasta, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        alterado = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=pasta,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "?"
+    return commit + ("+" if alterado else "")
+
+
+def etapa(segundos, itens, unidade):
+    return {"segundos": round(segundos, 4), "itens": itens, "unidade": unidade,
+            "por_segundo": round(itens / segundos, 1) if segundos else None}
+
+
+def medir(pasta, gabarito, backend, pasta_saida):
+    """Roda as etapas sobre o corpus e devolve (etapas, divergências com o gabarito)"""
+    arquivos = sorted(gabarito["arquivos"])
+    etapas = {}
+
+    inicio = time.perf_counter()
+    textos, paginas, caracteres = {}, 0, 0
+    for nome in arquivos:
+        with abrir_documento(os.path.join(pasta, nome), backend) as documento:
+            partes = [documento.texto_pagina(i) for i in range(len(documento))]
+        paginas += len(partes)
+        textos[nome] = "\n".join(t for t in partes if t)
+        caracteres += len(textos[nome])
+    etapas["texto"] = etapa(time.perf_counter() - inicio, paginas, "páginas")
+    etapas["texto"]["caracteres"] = caracteres
+
+    inicio = time.perf_counter()
+    registros = {nome: list(iterar_registros_texto(textos[nome], nome)) for nome in arquivos}
+    total = sum(len(r) for r in registros.values())
+    etapas["padroes"] = etapa(time.perf_counter() - inicio, len(arquivos), "PDFs")
+    etapas["padroes"]["registros"] = total
+
+    # Metade das empresas do corpus no "Excel de empresas"
+    cnpjs = sorted({a["cnpj"] for a in gabarito["arquivos"].values()})
+    permitidos = {c.replace(".", "").replace("/", "").replace("-", "") for c in cnpjs[::2]}
+    inicio = time.perf_counter()
+    filtrados = [filtrar_dados_arquivo(registros[nome], permitidos, log=lambda _: None) for nome in arquivos]
+    etapas["filtro"] = etapa(time.perf_counter() - inicio, total, "registros")
+    etapas["filtro"]["mantidos"] = sum(len(f) for f in filtrados)
+
+    caminho_ndjson = os.path.join(pasta_saida, "bench.ndjson")
+    inicio = time.perf_counter()
+    with GravadorNdjson(caminho_ndjson) as gravador:
+        for nome in arquivos:
+            gravador.gravar(registros[nome])
+    etapas["json"] = etapa(time.perf_counter() - inicio, total, "registros")
+    etapas["json"]["bytes"] = os.path.getsize(caminho_ndjson)
+
+    inicio = time.perf_counter()
+    salvar_excel(caminho_ndjson, os.path.join(pasta_saida, "bench.xlsx"))
+    etapas["excel"] = etapa(time.perf_counter() - inicio, total, "registros")
+
+    configuracao = {"pasta_pdfs": pasta, "pasta_saida": pasta_saida, "backend_extracao": backend,
+                    "ignorar_cache": True, "salvar_backup_json": False}
+    inicio = time.perf_counter()
+    resultado = processar_pasta(configuracao, log=lambda _: None, manter_dados=False)
+    etapas["completo"] = etapa(time.perf_counter() - inicio, len(arquivos), "PDFs")
+    etapas["completo"]["registros"] = resultado.total_registros
+
+    divergencias = []
+    for nome in arquivos:
+        esperado = gabarito["arquivos"][nome]
+        obtido = sorted((r["Tipo"], r["Conta"]) for r in registros[nome])
+        if obtido != sorted(map(tuple, esperado["registros"])):
+            divergencias.append(nome)
+        elif any(r["CNPJ"] != esperado["cnpj"] or r["Nome_Empresa"] != esperado["nome"] for r in registros[nome]):
+            divergencias.append(nome)
+    return etapas, divergencias
+
+
+def imprimir(etapas):
+    print(f"{'Etapa':<10} {'Tempo (s)':>10} {'Itens':>9} {'Itens/s':>12}")
+    for nome in ETAPAS:
+        dados = etapas[nome]
+        print(f"{nome:<10} {dados['segundos']:10.3f} {dados['itens']:9} "
+              f"{dados['por_segundo'] or 0:12,.1f} {dados['unidade']}/s")
+
+
+def comparar(caminho, quantidade):
+    """Tabela com as últimas execuções lado a lado (itens/s de cada etapa)"""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            execucoes = [json.loads(linha) for linha in f if linha.strip()][-quantidade:]
+    except OSError:
+        print(f"❌ Nenhum resultado em {caminho}")
+        return
+    print(f"{'Etapa':<10}" + "".join(f"{e['commit']:>14}" for e in execucoes))
+    print(f"{'corpus':<10}" + "".join(f"{e['corpus']['pdfs']:>9} PDFs" for e in execucoes))
+    print(f"{'backend':<10}" + "".join(f"{e['backend']:>14}" for e in execucoes))
+    for nome in ETAPAS:
+        print(f"{nome:<10}" + "".join(f"{(e['etapas'].get(nome) or {}).get('por_segundo') or 0:14,.1f}"
+                                       for e in execucoes))
+    for e in execucoes:
+        if e.get("rotulo"):
+            print(f"  {e['commit']}: {e['rotulo']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="pasta de um corpus já gerado (padrão: gera um temporário)")
+    parser.add_argument("--pdfs", type=int, default=100)
+    parser.add_argument("--empresas", type=int)
+    parser.add_argument("--paginas", type=int, nargs=2, default=[2, 20], metavar=("MIN", "MAX"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", default=BACKEND_PADRAO, choices=backends_disponiveis())
+    parser.add_argument("--rotulo", default="", help="descrição gravada junto do resultado")
+    parser.add_argument("--resultados", default=ARQUIVO_RESULTADOS)
+    parser.add_argument("--comparar", type=int, metavar="N", help="só mostra as últimas N execuções")
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(args.resultados, args.comparar)
+        return
+
+    with tempfile.TemporaryDirectory() as temporaria:
+        pasta = args.corpus or os.path.join(temporaria, "corpus")
+        if args.corpus and os.path.exists(os.path.join(pasta, NOME_GABARITO)):
+            with open(os.path.join(pasta, NOME_GABARITO), encoding="utf-8") as f:
+                gabarito = json.load(f)
+        else:
+            print("📄 Gerando corpus...")
+            gabarito = gerar_corpus(pasta, args.pdfs, args.empresas, tuple(args.paginas), seed=args.seed)
+        pasta_saida = os.path.join(temporaria, "saida")
+        os.makedirs(pasta_saida)
+
+        etapas, divergencias = medir(pasta, gabarito, args.backend, pasta_saida)
+
+    imprimir(etapas)
+    if divergencias:
+        print(f"⚠️ {len(divergencias)} PDFs diferentes do gabarito: {', '.join(divergencias[:5])}")
+
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit_atual(),
+        "rotulo": args.rotulo,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "backend": args.backend,
+        "corpus": {"pdfs": len(gabarito["arquivos"]), "empresas": gabarito["empresas"],
+                   "paginas": sum(a["paginas"] for a in gabarito["arquivos"].values()),
+                   "seed": gabarito["seed"], "mistura": gabarito["mistura"]},
+        "etapas": etapas,
+        "divergencias": len(divergencias),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.resultados)), exist_ok=True)
+    with open(args.resultados, "a", encoding="utf-8") as f:
+        f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    print(f"💾 Resultado gravado em {args.resultados}")
+
+
+if __name__ == "__main__":
+    main()
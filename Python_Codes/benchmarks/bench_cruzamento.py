@@ -0,0 +1,156 @@
+"""Benchmark: cruzamento do MEG_Parc por máscara em loop x junção por hash
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_cruzamento --desejados 10000 --todas 50000
+    python -m benchmarks.bench_cruzamento --aproximado --desejados 50000 --todas 50000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from parcelamentos.cruzamento import (chave_nome, cruzar_por_nome, cruzar_por_nome_aproximado, semelhanca,
+                                      trigramas)
+from parcelamentos.normalizacao import normalizar_nome
+
+RAMOS = ["comercio", "servicos", "construcoes", "alimentos", "transportes", "industria", "consultoria"]
+SILABAS = ["ba", "ca", "da", "fe", "ga", "li", "ma", "no", "pa", "ra", "si", "ta", "vo", "xe", "zu", "lo", "te", "mi"]
+SUFIXOS = ["ltda", "ltda.", "me", "eireli", "- me", ""]
+
+
+def gerar_planilhas(desejados, todas, seed=42):
+    """Planilhas já normalizadas, com nomes repetidos dos dois lados"""
+    rnd = random.Random(seed)
+    universo = [f"empresa {i} comercio ltda" for i in range(todas)]
+    nomes_desejados = rnd.sample(universo, desejados)
+    # Alguns nomes repetidos entre os desejados (a primeira linha deve vencer)
+    nomes_desejados += rnd.sample(nomes_desejados, desejados // 50)
+    df_desejados = pd.DataFrame({
+        "Nome_Desejado": [n.upper() for n in nomes_desejados],
+        "Nome_Normalizado": nomes_desejados,
+        "CNPJ_Normalizado": [f"{i:014d}" for i in range(len(nomes_desejados))],
+    })
+    # E algumas empresas com mais de um código no cadastro
+    nomes_todas = universo + rnd.sample(universo, todas // 100)
+    df_todas = pd.DataFrame({
+        "Codigo": [str(i + 1) for i in range(len(nomes_todas))],
+        "Nome_Todas_Normalizado": nomes_todas,
+    })
+    return df_desejados, df_todas
+
+
+def cruzar_legado(df_desejados, df_todas):
+    """Cópia do laço anterior de gerar_excel (iterrows + máscara por empresa)"""
+    nomes_desejados = set(df_desejados['Nome_Normalizado'])
+    df_todas = df_todas.copy()
+    df_todas['Match'] = df_todas['Nome_Todas_Normalizado'].isin(nomes_desejados)
+    df_encontradas = df_todas[df_todas['Match']].copy()
+
+    resultado_final = []
+    for _, empresa in df_encontradas.iterrows():
+        nome_normalizado = empresa['Nome_Todas_Normalizado']
+        dados_desejados = df_desejados[df_desejados['Nome_Normalizado'] == nome_normalizado]
+        if not dados_desejados.empty:
+            dados = dados_desejados.iloc[0]
+            resultado_final.append({
+                'Nº': empresa['Codigo'],
+                'EMPRESA': dados['Nome_Desejado'],
+                'CNPJ': dados['CNPJ_Normalizado']
+            })
+    return pd.DataFrame(resultado_final)
+
+
+def palavra(rnd):
+    return "".join(rnd.choice(SILABAS) for _ in range(rnd.randint(2, 4)))
+
+
+def variar(nome, rnd):
+    """Versão do nome como costuma vir de outra planilha: outro sufixo ou um erro de digitação"""
+    base = nome.rsplit(" ", 1)[0]
+    if rnd.random() < 0.5:
+        return f"{base} {rnd.choice(SUFIXOS)}".strip()
+    i = rnd.randrange(len(base))
+    return base[:i] + rnd.choice("abcdefghijklmnopqrstuvwxyz") + base[i + 1:] + " ltda"
+
+
+def gerar_planilhas_aproximadas(desejados, todas, seed=42):
+    """Cadastro com nomes realistas; 1/3 dos desejados igual, 1/3 variado, 1/3 ausente"""
+    rnd = random.Random(seed)
+    universo = [f"{palavra(rnd)} {palavra(rnd)} {rnd.choice(RAMOS)} ltda" for _ in range(todas)]
+    nomes_desejados, esperados = [], []
+    for i, indice in enumerate(rnd.sample(range(todas), desejados)):
+        if i % 3 == 0:
+            nomes_desejados.append(universo[indice])
+        elif i % 3 == 1:
+            nomes_desejados.append(variar(universo[indice], rnd))
+        else:
+            nomes_desejados.append(f"{palavra(rnd)} {palavra(rnd)} {rnd.choice(RAMOS)} me")
+        esperados.append(str(indice + 1) if i % 3 != 2 else "")
+    df_desejados = pd.DataFrame({"Nome_Desejado": [n.upper() for n in nomes_desejados]})
+    df_desejados["Nome_Normalizado"] = [normalizar_nome(n) for n in nomes_desejados]
+    df_desejados["CNPJ_Normalizado"] = [f"{i:014d}" for i in range(len(nomes_desejados))]
+    df_todas = pd.DataFrame({"Codigo": [str(i + 1) for i in range(todas)], "Nome_Todas_Normalizado": universo})
+    return df_desejados, df_todas, esperados
+
+
+def medir_aproximado(args):
+    df_desejados, df_todas, esperados = gerar_planilhas_aproximadas(args.desejados, args.todas)
+    print(f"Excel 1: {len(df_desejados)} linhas, Excel 2: {len(df_todas)} linhas")
+
+    inicio = time.perf_counter()
+    exato, _ = cruzar_por_nome(df_desejados, df_todas)
+    print(f"Exato:             {(time.perf_counter() - inicio) * 1000:10.1f} ms  ({len(exato)} linhas)")
+
+    inicio = time.perf_counter()
+    aproximado, _ = cruzar_por_nome_aproximado(df_desejados, df_todas)
+    tempo = time.perf_counter() - inicio
+    print(f"Aproximado (blocos): {tempo * 1000:8.1f} ms  ({len(aproximado)} linhas)")
+    print(aproximado["Critério"].value_counts().to_string())
+
+    # Qualidade: o par aceito é o da empresa que originou o nome desejado?
+    codigo_esperado = dict(zip(df_desejados["CNPJ_Normalizado"], esperados))
+    aceitos = aproximado[aproximado["Critério"] != "Exato"]
+    corretos = sum(codigo_esperado[c] == n for n, c in zip(aceitos["Nº"], aceitos["CNPJ"]))
+    print(f"Aproximados corretos: {corretos}/{len(aceitos)} (precisão {corretos / max(len(aceitos), 1):.1%})")
+
+    # Comparação par a par: amostra de 200 linhas do cadastro, extrapolada
+    chaves = [trigramas(chave_nome(n)) for n in df_desejados["Nome_Normalizado"]]
+    amostra = [trigramas(chave_nome(n)) for n in df_todas["Nome_Todas_Normalizado"][:200]]
+    inicio = time.perf_counter()
+    for alvo in amostra:
+        max(semelhanca(alvo, c) for c in chaves)
+    estimado = (time.perf_counter() - inicio) * len(df_todas) / len(amostra)
+    print(f"Par a par (estimado): {estimado:8.0f} s  -> {estimado / tempo:.0f}x mais lento")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--desejados", type=int, default=10000)
+    parser.add_argument("--todas", type=int, default=50000)
+    parser.add_argument("--aproximado", action="store_true", help="mede cruzar_por_nome_aproximado")
+    args = parser.parse_args()
+    if args.aproximado:
+        medir_aproximado(args)
+        return
+
+    df_desejados, df_todas = gerar_planilhas(args.desejados, args.todas)
+    print(f"Excel 1: {len(df_desejados)} linhas, Excel 2: {len(df_todas)} linhas")
+
+    inicio = time.perf_counter()
+    novo, duplicados = cruzar_por_nome(df_desejados, df_todas)
+    tempo_novo = time.perf_counter() - inicio
+    print(f"Junção por hash: {tempo_novo * 1000:10.1f} ms  ({len(novo)} linhas, {len(duplicados)} nomes duplicados)")
+
+    inicio = time.perf_counter()
+    legado = cruzar_legado(df_desejados, df_todas)
+    tempo_legado = time.perf_counter() - inicio
+    print(f"Laço anterior:   {tempo_legado * 1000:10.1f} ms  ({len(legado)} linhas)")
+    print(f"Speedup: {tempo_legado / tempo_novo:.0f}x")
+
+    if not legado.reset_index(drop=True).equals(novo.reset_index(drop=True)):
+        print("⚠️ Resultados diferentes do laço anterior!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark: Excel montado com DataFrame.to_excel x gravação em fluxo a partir do NDJSON
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_excel --linhas 10000 100000 500000
+
+Cada medição roda num processo separado para que o pico de memória (RSS) de
+uma não contamine a outra. O pico só é medido onde o módulo resource existe
+(Linux/macOS).
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MODOS = ("pandas", "fluxo_xlsxwriter", "fluxo_openpyxl")
+
+
+def gerar_ndjson(caminho, linhas, seed=42):
+    """Grava N registros sintéticos no formato produzido pela extração"""
+    rnd = random.Random(seed)
+    tipos = [("PARCMEI", "MEI"), ("PARCSN", "Simples Nacional"), ("SIEFPAR", "Receita Federal"),
+             ("SISPAR", "PGFN"), ("SICOB", "Débito Suspenso"), ("DÉBITO", "Pendência")]
+    with open(caminho, "w", encoding="utf-8") as f:
+        for i in range(linhas):
+            empresa = rnd.randint(1, max(1, linhas // 20))
+            tipo, subtipo = rnd.choice(tipos)
+            registro = {
+                "CNPJ": f"{empresa:08d}/0001-00",
+                "CNPJ_Numeros": f"{empresa:08d}000100",
+                "Nome_Empresa": f"{empresa} - EMPRESA {empresa} LTDA",
+                "Tipo": tipo,
+                "Subtipo": subtipo,
+                "Conta": str(rnd.randint(10**5, 10**6)),
+                "Modalidade": "PARCELAMENTO SIMPLIFICADO",
+                "Detalhes": f"Parcelas em atraso: {rnd.randint(0, 9)}",
+                "Status": "Em Parcelamento",
+                "Valor": round(rnd.uniform(0, 99999), 2),
+                "Arquivo": f"{empresa:05d}.pdf",
+            }
+            f.write(json.dumps(registro, ensure_ascii=False))
+            f.write("\n")
+
+
+def medir(modo, caminho_ndjson, caminho_excel):
+    """Executado no processo filho: grava o Excel e imprime tempo e pico de RSS em JSON"""
+    from parcelamentos import saida
+
+    inicio = time.perf_counter()
+    if modo == "pandas":
+        import pandas as pd
+        df = pd.DataFrame(list(saida.ler_ndjson(caminho_ndjson)))
+        df = df.sort_values(["Tipo", "Nome_Empresa"])
+        df.to_excel(caminho_excel, index=False)
+    else:
+        if modo == "fluxo_openpyxl":
+            saida.xlsxwriter = None
+        elif saida.xlsxwriter is None:
+            print(json.dumps({"erro": "xlsxwriter não instalado"}))
+            return
+        saida.salvar_excel(caminho_ndjson, caminho_excel)
+    tempo = time.perf_counter() - inicio
+
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    pico_mb = None
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        pico_mb = pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+    print(json.dumps({"tempo": tempo, "pico_mb": pico_mb}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    parser.add_argument("--medir", nargs=3, metavar=("MODO", "NDJSON", "XLSX"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir(*args.medir)
+        return
+
+    with tempfile.TemporaryDirectory() as pasta:
+        print(f"{'Linhas':>8}  {'Modo':<18} {'Tempo (s)':>10} {'Pico RSS (MB)':>14}")
+        for linhas in args.linhas:
+            caminho_ndjson = os.path.join(pasta, f"bench_{linhas}.ndjson")
+            gerar_ndjson(caminho_ndjson, linhas)
+            for modo in args.modos:
+                caminho_excel = os.path.join(pasta, f"bench_{linhas}_{modo}.xlsx")
+                saida = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_excel", "--medir", modo, caminho_ndjson, caminho_excel],
+                    capture_output=True, text=True, check=True
+                )
+                medida = json.loads(saida.stdout.strip().splitlines()[-1])
+                if "erro" in medida:
+                    print(f"{linhas:>8}  {modo:<18} {medida['erro']}")
+                    continue
+                pico = f"{medida['pico_mb']:14.0f}" if medida["pico_mb"] is not None else f"{'n/d':>14}"
+                print(f"{linhas:>8}  {modo:<18} {medida['tempo']:10.1f} {pico}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark: interface atualizada por fila drenada em lotes x um after() por mensagem
+
+Uso (a partir de Python_Codes; precisa de um display, no Linux use xvfb-run):
+    xvfb-run -a python -m benchmarks.bench_fila --pdfs 1000
+
+Uma thread simula o processamento de --pdfs PDFs: cada um envia dois logs, o
+progresso e um lote de registros, como processar_pasta na interface. "por
+mensagem" agenda um janela.after(0, ...) por mensagem; "fila" usa a fila
+drenada a cada INTERVALO_FILA_MS, como a interface. Mede o tempo até a última
+mensagem aparecer na tela e o maior intervalo em que o laço do Tk não
+respondeu (um pulso a cada 10 ms).
+"""
+import argparse
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from tkinter.scrolledtext import ScrolledText
+
+from benchmarks.bench_memoria import lotes_por_pdf
+from parcelamentos.resultados import CAMPOS, ArmazemResultados
+from tabela_virtual import TabelaVirtual
+
+INTERVALO_FILA_MS = 100
+INTERVALO_PULSO_MS = 10
+
+
+class TelaSimulada:
+    """Os widgets que recebem as atualizações do processamento na interface"""
+
+    def __init__(self, janela):
+        self.janela = janela
+        self.texto = ScrolledText(janela, height=10)
+        self.texto.pack(fill="x")
+        self.status = ttk.Label(janela)
+        self.status.pack(fill="x")
+        self.progresso = tk.DoubleVar()
+        ttk.Progressbar(janela, variable=self.progresso, maximum=100).pack(fill="x")
+        self.resultados = ArmazemResultados()
+        self.tabela = TabelaVirtual(janela, CAMPOS, lambda r: tuple(r[c] for c in CAMPOS))
+        self.tabela.tree.pack(fill="both", expand=True)
+        self.tabela.definir_registros(self.resultados.registros)
+        self.contador = ttk.Label(janela)
+        self.contador.pack(fill="x")
+
+    def log(self, linhas):
+        self.texto.insert(tk.END, "".join(linhas))
+        self.texto.see(tk.END)
+
+    def progredir(self, concluidos, total, arquivo):
+        self.status.config(text=f"Processados {concluidos} de {total} encontrados: {arquivo}")
+        self.progresso.set(concluidos / total * 100)
+
+    def acrescentar(self, registros):
+        self.resultados.acrescentar(registros)
+        self.tabela.atualizar()
+        self.contador.config(text=f"{len(self.resultados)} resultados")
+
+
+def mensagens(pdfs):
+    """Mensagens enviadas pelo processamento, na ordem, para pdfs PDFs"""
+    for i, lote in enumerate(lotes_por_pdf(pdfs * 8)):
+        arquivo = lote[0]["Arquivo"]
+        yield "log", f"[{i + 1}/{pdfs}] {arquivo}\n"
+        yield "log", f"  📊 {len(lote)} parcelamentos encontrados\n"
+        yield "registros", lote
+        yield "progresso", (i + 1, pdfs, arquivo)
+
+
+def executar(modo, pdfs):
+    """(segundos até a última mensagem aparecer, maior intervalo sem resposta do Tk em s)"""
+    janela = tk.Tk()
+    janela.geometry("1200x700")
+    tela = TelaSimulada(janela)
+    lista = list(mensagens(pdfs))
+    aplicar = {"log": lambda texto: tela.log([texto]), "registros": tela.acrescentar,
+               "progresso": lambda dados: tela.progredir(*dados)}
+    fila = queue.Queue()
+    estado = {"pulso": time.perf_counter(), "maior_intervalo": 0.0, "fim": None}
+
+    def pulso():
+        agora = time.perf_counter()
+        estado["maior_intervalo"] = max(estado["maior_intervalo"], agora - estado["pulso"])
+        estado["pulso"] = agora
+        janela.after(INTERVALO_PULSO_MS, pulso)
+
+    def terminar():
+        janela.update_idletasks()
+        estado["fim"] = time.perf_counter()
+        janela.quit()
+
+    def drenar():
+        linhas, progresso, novos, fim = [], None, [], False
+        try:
+            while True:
+                tipo, dados = fila.get_nowait()
+                if tipo == "log":
+                    linhas.append(dados)
+                elif tipo == "progresso":
+                    progresso = dados
+                elif tipo == "registros":
+                    novos.extend(dados)
+                else:
+                    fim = True
+        except queue.Empty:
+            pass
+        if linhas:
+            tela.log(linhas)
+        if progresso:
+            tela.progredir(*progresso)
+        if novos:
+            tela.acrescentar(novos)
+        if fim:
+            terminar()
+        else:
+            janela.after(INTERVALO_FILA_MS, drenar)
+
+    def trabalhar():
+        for tipo, dados in lista:
+            if modo == "fila":
+                fila.put((tipo, dados))
+            else:
+                janela.after(0, aplicar[tipo], dados)
+        if modo == "fila":
+            fila.put(("fim", None))
+        else:
+            janela.after(0, terminar)
+
+    if modo == "fila":
+        janela.after(INTERVALO_FILA_MS, drenar)
+    janela.after(INTERVALO_PULSO_MS, pulso)
+    janela.update()
+    inicio = estado["pulso"] = time.perf_counter()
+    threading.Thread(target=trabalhar, daemon=True).start()
+    janela.mainloop()
+    janela.destroy()
+    return estado["fim"] - inicio, estado["maior_intervalo"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdfs", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.pdfs} PDFs, {args.pdfs * 4} mensagens, {args.pdfs * 8} registros")
+    print(f"{'Modo':<14} {'Tempo (s)':>10} {'Maior travamento (ms)':>22}")
+    for modo in ("por mensagem", "fila"):
+        segundos, travamento = executar(modo, args.pdfs)
+        print(f"{modo:<14} {segundos:10.2f} {travamento * 1000:22.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Microbenchmark: filtros da tabela por varredura da lista x ArmazemResultados
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_filtros --registros 200000
+"""
+import argparse
+import random
+import time
+
+from parcelamentos.resultados import ArmazemResultados
+
+TIPOS = ["PARCMEI", "PARCSN", "SIEFPAR", "SISPAR", "SICOB", "DÉBITO"]
+PALAVRAS = ["COMERCIO", "SERVICOS", "SILVA", "SANTOS", "TRANSPORTES", "ALIMENTOS", "CONSTRUCOES",
+            "INDUSTRIA", "OLIVEIRA", "SOUZA", "TECNOLOGIA", "DISTRIBUIDORA", "AGRO", "PAPELARIA"]
+
+
+def gerar_registros(quantidade, empresas, seed=42):
+    rnd = random.Random(seed)
+    nomes = [f"{i} - {' '.join(rnd.sample(PALAVRAS, 3))} LTDA" for i in range(empresas)]
+    registros = []
+    for _ in range(quantidade):
+        i = rnd.randrange(empresas)
+        registros.append({
+            "CNPJ_Numeros": f"{i:08d}000100",
+            "Nome_Empresa": nomes[i],
+            "Tipo": rnd.choice(TIPOS),
+            "Status": rnd.choice(["Em Parcelamento", "Exigibilidade Suspensa", "Devedor"]),
+        })
+    return registros
+
+
+def filtrar_legado(dados, filtro_emp, filtro_tip):
+    """Cópia do aplicar_filtros anterior"""
+    dados_filtrados = dados.copy()
+    filtro_emp = filtro_emp.lower()
+    if filtro_emp:
+        dados_filtrados = [d for d in dados_filtrados if filtro_emp in d['Nome_Empresa'].lower()]
+    if filtro_tip != "Todos":
+        dados_filtrados = [d for d in dados_filtrados if d['Tipo'] == filtro_tip]
+    return dados_filtrados
+
+
+def melhor_tempo(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registros", type=int, default=200000)
+    parser.add_argument("--empresas", type=int, default=10000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    registros = gerar_registros(args.registros, args.empresas)
+    inicio = time.perf_counter()
+    armazem = ArmazemResultados(registros)
+    armazem.filtrar()
+    print(f"{args.registros} registros, {args.empresas} empresas; índices montados em "
+          f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    consultas = [("", "SISPAR"), ("silva", "Todos"), ("silva santos", "Todos"),
+                 ("123", "Todos"), ("tecnologia", "PARCSN"), ("li", "SICOB"), ("xyz", "Todos")]
+    print(f"{'Empresa':<14} {'Tipo':<8} {'Linhas':>7} {'Varredura (ms)':>15} {'Índice (ms)':>12}")
+    for empresa, tipo in consultas:
+        tempo_legado, legado = melhor_tempo(lambda: filtrar_legado(registros, empresa, tipo), args.repeticoes)
+        filtros = {} if tipo == "Todos" else {"Tipo": tipo}
+        # Sem aproveitar a busca anterior (digitação incremental), para medir o caso frio
+        def consultar():
+            armazem._ultima_busca = ("", None)
+            return armazem.filtrar(empresa, **filtros)
+
+        tempo_indice, posicoes = melhor_tempo(consultar, args.repeticoes)
+        campos = lambda registros: [(r["CNPJ_Numeros"], r["Nome_Empresa"], r["Tipo"]) for r in registros]
+        if campos(armazem.visao(posicoes)) != campos(legado):
+            print(f"⚠️ Divergência em empresa={empresa!r} tipo={tipo!r}")
+        print(f"{empresa!r:<14} {tipo:<8} {len(posicoes):>7} {tempo_legado * 1000:15.2f} {tempo_indice * 1000:12.3f}")
+
+
+if __name__ == "__main__":
+    main()
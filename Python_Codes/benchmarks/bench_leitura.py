@@ -0,0 +1,97 @@
+"""Benchmark: leitura sequencial x leitura antecipada, em disco local e em disco lento simulado
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_leitura --pdfs 60 --latencia 0.05 --mbps 10
+    python -m benchmarks.bench_leitura --corpus /tmp/corpus --janelas 2 4 8 --backend pdfium
+
+O disco lento é simulado no leitor: cada arquivo espera a latência mais o
+tempo de transferência na banda informada antes de ser lido, como uma pasta
+SMB. "sequencial" lê e analisa um PDF por vez (como o laço original);
+"antecipada K" usa LeituraAntecipada com K arquivos à frente.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.gerar_corpus import gerar_corpus
+from parcelamentos.backends import BACKEND_PADRAO, backends_disponiveis
+from parcelamentos.extracao import extrair_dados_pdf
+from parcelamentos.leitura import LeituraAntecipada, ler_arquivo
+
+
+class LeitorLento:
+    """ler_arquivo com latência e banda de rede simuladas"""
+
+    def __init__(self, latencia, mbps):
+        self.latencia = latencia
+        self.bytes_por_segundo = mbps * 1024 * 1024
+
+    def __call__(self, caminho):
+        time.sleep(self.latencia + os.path.getsize(caminho) / self.bytes_por_segundo)
+        return ler_arquivo(caminho)
+
+
+def analisar(caminho, conteudo, backend):
+    return extrair_dados_pdf(caminho, log=lambda _: None, backend=backend, conteudo=conteudo)
+
+
+def sequencial(caminhos, leitor, backend):
+    resultados = []
+    for caminho in caminhos:
+        conteudo, _ = leitor(caminho)
+        resultados.append(analisar(caminho, conteudo, backend))
+    return resultados
+
+
+def antecipada(caminhos, leitor, backend, janela):
+    resultados = []
+    leitura = LeituraAntecipada(((caminho, caminho) for caminho in caminhos), janela, leitor)
+    try:
+        for caminho, conteudo, _ in leitura:
+            resultados.append(analisar(caminho, conteudo, backend))
+    finally:
+        leitura.fechar()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="pasta de um corpus já gerado (padrão: gera um temporário)")
+    parser.add_argument("--pdfs", type=int, default=60)
+    parser.add_argument("--paginas", type=int, nargs=2, default=[2, 10], metavar=("MIN", "MAX"))
+    parser.add_argument("--latencia", type=float, default=0.05, help="segundos por arquivo no disco lento")
+    parser.add_argument("--mbps", type=float, default=10.0, help="banda do disco lento (MB/s)")
+    parser.add_argument("--janelas", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--backend", default=BACKEND_PADRAO, choices=backends_disponiveis())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporaria:
+        pasta = args.corpus or os.path.join(temporaria, "corpus")
+        if not args.corpus:
+            print("📄 Gerando corpus...")
+            gerar_corpus(pasta, args.pdfs, paginas=tuple(args.paginas))
+        caminhos = sorted(os.path.join(pasta, f) for f in os.listdir(pasta) if f.lower().endswith(".pdf"))
+        megabytes = sum(os.path.getsize(c) for c in caminhos) / 1024 / 1024
+        print(f"{len(caminhos)} PDFs, {megabytes:.1f} MB, backend {args.backend}; disco lento: "
+              f"{args.latencia * 1000:.0f} ms + {args.mbps:g} MB/s por arquivo")
+
+        esperado = None
+        print(f"{'Disco':<7} {'Modo':<14} {'Tempo (s)':>10} {'PDFs/s':>8}")
+        for disco, leitor in (("local", ler_arquivo), ("lento", LeitorLento(args.latencia, args.mbps))):
+            modos = [("sequencial", lambda: sequencial(caminhos, leitor, args.backend))]
+            modos += [(f"antecipada {k}", lambda k=k: antecipada(caminhos, leitor, args.backend, k))
+                      for k in args.janelas]
+            for modo, funcao in modos:
+                inicio = time.perf_counter()
+                resultados = funcao()
+                segundos = time.perf_counter() - inicio
+                print(f"{disco:<7} {modo:<14} {segundos:10.2f} {len(caminhos) / segundos:8.1f}")
+                if esperado is None:
+                    esperado = resultados
+                elif resultados != esperado:
+                    print("⚠️ Registros diferentes da leitura sequencial!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: pico de memória da montagem do Excel, tudo em memória x em lotes no disco
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_lotes --registros 200000 --lote 5000
+
+Simula o processamento com registros sintéticos no formato de extracao.py:
+"em memória" acumula a lista inteira e ordena antes de gravar (como a
+interface fazia), "em lotes" passa cada lote pela OrdenacaoExterna. O pico é
+medido com tracemalloc (só alocações Python) e as planilhas são comparadas.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from openpyxl import load_workbook
+
+from parcelamentos.ordenacao import OrdenacaoExterna
+from parcelamentos.saida import colunas_ordenacao, gravar_planilha
+
+TIPOS = ["PARCMEI", "PARCSN", "SIEFPAR", "SISPAR", "SICOB", "DÉBITO"]
+
+
+def gerar_lotes(registros, lote, seed=42):
+    """Listas de registros como as devolvidas por arquivo, agrupadas em lotes"""
+    rnd = random.Random(seed)
+    atual = []
+    for i in range(registros):
+        empresa = rnd.randint(0, registros // 20)
+        atual.append({"Arquivo": f"relatorio_{i // 10:06d}.pdf", "Nome_Empresa": f"EMPRESA {empresa} LTDA",
+                      "CNPJ": f"{empresa:014d}", "Tipo": rnd.choice(TIPOS), "Conta": str(rnd.randint(1, 10**9)),
+                      "Valor": f"{rnd.uniform(10, 10**5):.2f}", "Detalhes": "Parcelas em atraso: 3"})
+        if len(atual) == lote:
+            yield atual
+            atual = []
+    if atual:
+        yield atual
+
+
+def medir(funcao):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registros", type=int, default=200000)
+    parser.add_argument("--lote", type=int, default=5000)
+    parser.add_argument("--limite-arquivos", type=int, default=64, help="lotes intercalados por passada")
+    args = parser.parse_args()
+    colunas_ordem = colunas_ordenacao(False)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        em_memoria = os.path.join(pasta, "memoria.xlsx")
+        em_lotes = os.path.join(pasta, "lotes.xlsx")
+
+        def tudo_em_memoria():
+            registros, colunas = [], {}
+            for lote in gerar_lotes(args.registros, args.lote):
+                registros.extend(lote)
+                for registro in lote:
+                    colunas.update(dict.fromkeys(registro))
+            registros.sort(key=lambda r: tuple((r.get(c) is None, r.get(c) or "") for c in colunas_ordem))
+            gravar_planilha(em_memoria, list(colunas), registros)
+
+        def com_lotes():
+            ordenacao = OrdenacaoExterna(pasta, colunas_ordem, args.limite_arquivos)
+            for lote in gerar_lotes(args.registros, args.lote):
+                ordenacao.acrescentar(lote)
+                ordenacao.fechar_lote()
+            try:
+                gravar_planilha(em_lotes, list(ordenacao.colunas), ordenacao.registros())
+            finally:
+                ordenacao.remover()
+
+        print(f"{args.registros} registros, lotes de {args.lote}")
+        for rotulo, funcao in (("em memória", tudo_em_memoria), ("em lotes", com_lotes)):
+            segundos, pico = medir(funcao)
+            print(f"{rotulo:<11} {segundos:7.2f} s  pico {pico:8.1f} MB")
+
+        if [tuple(c.value for c in r) for r in load_workbook(em_memoria, read_only=True).active.iter_rows()] != \
+                [tuple(c.value for c in r) for r in load_workbook(em_lotes, read_only=True).active.iter_rows()]:
+            print("⚠️ Planilhas diferentes!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: memória dos resultados em lista de dicts x RegistrosCompactos/ArmazemResultados
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_memoria --registros 500000
+
+Os registros chegam como na interface: um lote por PDF, decodificado de JSON
+(cache/NDJSON/processo filho), então cada lote tem suas próprias strings.
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from parcelamentos.resultados import ArmazemResultados, RegistrosCompactos
+
+TIPOS = [
+    ("PARCMEI", "MEI", "MEI - Parcelamento", "Em Parcelamento"),
+    ("PARCSN", "Simples Nacional", "SIMPLES NACIONAL - RELP - EM PARCELAMENTO", "Em Parcelamento"),
+    ("SIEFPAR", "Receita Federal", "Parcelamento Simplificado", "Exigibilidade Suspensa"),
+    ("SISPAR", "PGFN", "PARCELAMENTO SEM GARANTIA - SIMPLES NACIONAL", "Exigibilidade Suspensa"),
+    ("SICOB", "Débito Suspenso", "SICOB", "Ativo/Em Dia"),
+]
+
+
+def lotes_por_pdf(registros, por_pdf=8, seed=42):
+    """Gera os lotes (um por PDF) já passados por JSON"""
+    rnd = random.Random(seed)
+    for pdf in range(registros // por_pdf):
+        cabecalho = {"CNPJ": f"{pdf:02d}.{pdf % 1000:03d}.456/0001-{pdf % 100:02d}",
+                     "CNPJ_Numeros": f"{pdf:08d}000100",
+                     "Nome_Empresa": f"{pdf} - EMPRESA EXEMPLO {pdf} LTDA"}
+        lote = []
+        for _ in range(por_pdf):
+            tipo, subtipo, modalidade, status = rnd.choice(TIPOS)
+            lote.append(dict(cabecalho, Tipo=tipo, Subtipo=subtipo, Conta=str(rnd.randint(10**5, 10**6)),
+                             Modalidade=modalidade, Detalhes=f"Parcelas em atraso: {rnd.randint(0, 9)}",
+                             Status=status, Valor=round(rnd.uniform(0, 99999), 2), Arquivo=f"{pdf:06d}.pdf"))
+        yield json.loads(json.dumps(lote, ensure_ascii=False))
+
+
+def medir(nome, criar, acrescentar, registros):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    destino = criar()
+    for lote in lotes_por_pdf(registros):
+        acrescentar(destino, lote)
+    tempo = time.perf_counter() - inicio
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{nome:<36} {memoria / 1024 / 1024:10.1f} MB {tempo:8.1f} s")
+    return memoria
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registros", type=int, default=500000)
+    args = parser.parse_args()
+
+    print(f"{args.registros} registros")
+    lista = medir("lista de dicts (anterior)", list, list.extend, args.registros)
+    compactos = medir("RegistrosCompactos", RegistrosCompactos, RegistrosCompactos.acrescentar, args.registros)
+    armazem = medir("ArmazemResultados (com índices)", ArmazemResultados, ArmazemResultados.acrescentar,
+                    args.registros)
+    print(f"Redução: {lista / compactos:.1f}x (só registros), {lista / armazem:.1f}x (com índices e totais)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: normalização de nomes/CNPJs com Series.apply x parcelamentos.normalizacao
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_normalizacao --linhas 1000000
+"""
+import argparse
+import random
+import re
+import time
+
+import pandas as pd
+
+from parcelamentos import normalizacao
+from parcelamentos.normalizacao import normalizar_cnpj_coluna, normalizar_nome_coluna
+
+PALAVRAS = ["COMÉRCIO", "SERVIÇOS", "JOÃO", "CONSTRUÇÕES", "AÇÚCAR", "INDÚSTRIA", "SÃO", "PAULO",
+            "LTDA", "ME", "EIRELI", "ALIMENTOS", "TÊXTIL", "MÓVEIS", "GESTÃO", "CAFÉ"]
+
+
+def normalize_cnpj(value):
+    """Cópia da versão anterior do MEG_Parc"""
+    if pd.isna(value):
+        return ""
+    s = str(value)
+    digits = re.sub(r'\D', '', s)
+    if digits == "":
+        return ""
+    if len(digits) < 14:
+        digits = digits.zfill(14)
+    return digits
+
+
+def normalize_nome(value):
+    """Cópia da versão anterior do MEG_Parc"""
+    if pd.isna(value):
+        return ""
+    nome = str(value).strip().lower()
+    nome = (nome.replace('ã', 'a').replace('á', 'a').replace('à', 'a').replace('â', 'a')
+                .replace('é', 'e').replace('ê', 'e').replace('í', 'i').replace('ó', 'o')
+                .replace('ô', 'o').replace('õ', 'o').replace('ú', 'u').replace('ü', 'u')
+                .replace('ç', 'c').replace('ñ', 'n'))
+    nome = re.sub(r'\s+', ' ', nome)
+    return nome
+
+
+def gerar_colunas(linhas, distintos, seed=42):
+    rnd = random.Random(seed)
+    nomes = [f" {i} - {'  '.join(rnd.sample(PALAVRAS, 3))} " for i in range(distintos)]
+    cnpjs = [f"{rnd.randint(0, 99):02d}.{rnd.randint(0, 999):03d}.{rnd.randint(0, 999):03d}/0001-{rnd.randint(0, 99):02d}"
+             for _ in range(distintos)]
+    escolhas = [rnd.randrange(distintos) for _ in range(linhas)]
+    return pd.Series([nomes[i] for i in escolhas]), pd.Series([cnpjs[i] for i in escolhas])
+
+
+def medir(funcao, serie):
+    # Cache limpo a cada medição: mede o custo de uma planilha nova
+    normalizacao._normalizar_nome_texto.cache_clear()
+    normalizacao._normalizar_cnpj_texto.cache_clear()
+    inicio = time.perf_counter()
+    resultado = funcao(serie)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=1000000)
+    parser.add_argument("--distintos", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'Coluna':<6} {'Distintos':>9} {'apply (linhas/s)':>17} {'coluna (linhas/s)':>18} {'Speedup':>8}")
+    for distintos in args.distintos:
+        nomes, cnpjs = gerar_colunas(args.linhas, distintos)
+        for rotulo, serie, anterior, atual in (
+            ("nome", nomes, lambda s: s.apply(normalize_nome), normalizar_nome_coluna),
+            ("cnpj", cnpjs, lambda s: s.apply(normalize_cnpj), lambda s: normalizar_cnpj_coluna(s, completar_zeros=True)),
+        ):
+            tempo_anterior, esperado = medir(anterior, serie)
+            tempo_atual, obtido = medir(atual, serie)
+            if esperado.tolist() != obtido.tolist():
+                print(f"⚠️ {rotulo}: resultados diferentes da versão anterior")
+            print(f"{rotulo:<6} {distintos:>9} {args.linhas / tempo_anterior:17,.0f} {args.linhas / tempo_atual:18,.0f} "
+                  f"{tempo_anterior / tempo_atual:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: lista de empresas com pd.read_excel x ler_colunas_excel (frio e com snapshot)
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_planilhas --linhas 200000
+
+Gera uma exportação de ERP com várias colunas (CNPJ ora texto, ora número) e
+mede o tempo até ter o conjunto de CNPJs.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+from openpyxl import Workbook
+
+from parcelamentos.normalizacao import normalizar_cnpj_coluna
+from parcelamentos.planilhas import carregar_cnpjs_excel, ler_colunas_excel
+
+COLUNAS = ["Código", "Razão Social", "CNPJ", "Município", "UF", "Regime", "Responsável", "E-mail",
+           "Telefone", "Observações"]
+
+
+def gerar_excel(caminho, linhas, seed=42):
+    rnd = random.Random(seed)
+    livro = Workbook(write_only=True)
+    planilha = livro.create_sheet()
+    planilha.append(COLUNAS)
+    for i in range(linhas):
+        cnpj = rnd.randint(10**11, 10**14 - 1)
+        planilha.append([i + 1, f"EMPRESA {i} LTDA", cnpj if i % 3 == 0 else f"{cnpj:014d}",
+                         "São Paulo", "SP", rnd.choice(["Simples", "Presumido", "Real"]), f"Fulano {i % 97}",
+                         f"contato{i}@exemplo.com.br", f"(11) 9{i % 10000:04d}-{i % 9999:04d}",
+                         "Cliente desde 2015" if i % 7 == 0 else None])
+    livro.save(caminho)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "empresas.xlsx")
+        gerar_excel(caminho, args.linhas)
+        snapshots = os.path.join(pasta, "snapshots")
+        print(f"{args.linhas} linhas x {len(COLUNAS)} colunas, {os.path.getsize(caminho) / 1024 / 1024:.1f} MB")
+
+        inicio = time.perf_counter()
+        df = pd.read_excel(caminho, dtype=str)
+        esperado = set(normalizar_cnpj_coluna(df["CNPJ"], completar_zeros=True)) - {""}
+        tempo_pandas = time.perf_counter() - inicio
+        print(f"pd.read_excel (todas as colunas): {tempo_pandas:7.2f} s")
+
+        for rotulo in ("ler_colunas_excel (sem snapshot)", "ler_colunas_excel (com snapshot)"):
+            inicio = time.perf_counter()
+            obtido = carregar_cnpjs_excel(caminho, pasta_snapshots=snapshots)
+            tempo = time.perf_counter() - inicio
+            print(f"{rotulo:<33} {tempo:7.2f} s  ({tempo_pandas / tempo:.0f}x)")
+            if obtido != esperado:
+                print("⚠️ CNPJs diferentes do pd.read_excel!")
+
+        # Mesmo conteúdo das colunas lidas por posição (como no MEG_Parc)
+        completo = pd.read_excel(caminho, dtype=str, header=None)
+        podado = ler_colunas_excel(caminho, [0, 1, 2], cabecalho=False, pasta_snapshots=None)
+        for coluna in podado.columns:
+            if completo[coluna].where(completo[coluna].notna(), None).tolist() != podado[coluna].tolist():
+                print(f"⚠️ Coluna {coluna} diferente do pd.read_excel!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Microbenchmark: varredura por seções x varredura repetida do texto completo
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.bench_secoes --paginas 100 --repeticoes 20
+"""
+import argparse
+import collections
+import random
+import re
+import time
+
+from parcelamentos.extracao import extrair_valor_monetario, iterar_registros_texto, normalizar_cnpj
+
+
+def gerar_texto_relatorio(paginas, seed=42):
+    """Gera o texto de um relatório com as seções conhecidas espalhadas por N páginas"""
+    rnd = random.Random(seed)
+    linhas = ["MINISTÉRIO DA FAZENDA", "Relatório de Situação Fiscal",
+              "CNPJ: 12.345.678/0001-90 - EMPRESA EXEMPLO COMERCIO LTDA"]
+    secoes = [
+        ["MEI - EM PARCELAMENTO", "Parcelas em atraso 4"],
+        ["SIMPLES NACIONAL - RELP - EM PARCELAMENTO", "Parcelas em atraso 2"],
+        ["Pendência – Parcelamento (SIEFPAR)"]
+        + [f"Parcelamento: {rnd.randint(10**9, 10**10)} Parcelas em Atraso: {rnd.randint(1, 9)} "
+           f"Valor em Atraso: {rnd.randint(100, 99999)},{rnd.randint(10, 99)}" for _ in range(5)],
+        ["Parcelamento com Exigibilidade Suspensa (SIEFPAR)"]
+        + [f"Parcelamento: {rnd.randint(10**9, 10**10)} Valor Suspenso: {rnd.randint(1, 99)}.{rnd.randint(100, 999)},{rnd.randint(10, 99)}"
+           for _ in range(5)],
+        ["Parcelamento com Exigibilidade Suspensa (SISPAR)"]
+        + [l for _ in range(5) for l in (f"Conta {rnd.randint(10**5, 10**6)} PARCELAMENTO CONVENCIONAL",
+                                          "Modalidade: PARCELAMENTO SEM GARANTIA - SIMPLES NACIONAL")],
+        ["Débito com Exigibilidade Suspensa (SICOB)"]
+        + [f"Parcelamento: {rnd.randint(10**5, 10**6)}-{rnd.randint(1, 9)} Situação: 000001 - ATIVO/EM DIA"
+           for _ in range(3)],
+    ]
+    paginas_secoes = sorted(rnd.sample(range(paginas), min(len(secoes), paginas)))
+    proxima = dict(zip(paginas_secoes, secoes))
+
+    for pagina in range(paginas):
+        linhas.append(f"Página {pagina + 1} de {paginas}")
+        linhas.extend(proxima.get(pagina, []))
+        for _ in range(45):
+            linhas.append(f"{rnd.randint(1000, 9999)}-{rnd.randint(10, 99)} - RECEITA DIVERSA "
+                          f"{rnd.randint(1, 12):02d}/{rnd.randint(2015, 2024)} {rnd.randint(100, 9999)},{rnd.randint(10, 99)}")
+    return "\n".join(linhas)
+
+
+def iterar_registros_legado(texto, nome_arquivo, incluir_detalhes_debitos=True):
+    """Cópia da varredura anterior: checagens "X in texto" + re.findall no texto completo"""
+    cnpj_match = re.search(r"CNPJ:\s*(\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2})", texto)
+    cnpj_formatado = cnpj_match.group(1) if cnpj_match else "Não encontrado"
+    cnpj_numeros = normalizar_cnpj(cnpj_formatado)
+    nome_match = re.search(r"CNPJ:\s*\d{2}\.\d{3}\.\d{3}.*?-\s*(.+)", texto)
+    nome_empresa = nome_match.group(1).strip() if nome_match else "Não encontrado"
+    base = {"CNPJ": cnpj_formatado, "CNPJ_Numeros": cnpj_numeros, "Nome_Empresa": nome_empresa}
+
+    if "MEI - EM PARCELAMENTO" in texto:
+        mei_match = re.search(r"MEI - EM PARCELAMENTO\s+Parcelas em atraso\s*(\d+)", texto)
+        if mei_match:
+            yield dict(base, Tipo="PARCMEI", Detalhes=mei_match.group(1))
+    if "SIMPLES NACIONAL - EM PARCELAMENTO" in texto or "SIMPLES NACIONAL - RELP - EM PARCELAMENTO" in texto:
+        for titulo, parcelas in re.findall(r"(SIMPLES NACIONAL.*EM PARCELAMENTO)(?:\s+Parcelas em atraso\s*(\d+))?", texto):
+            yield dict(base, Tipo="PARCSN", Detalhes=f"{titulo.strip()} {parcelas or '0'}")
+    if "Pendência – Parcelamento (SIEFPAR)" in texto:
+        for conta, parcelas, valor_str in re.findall(r"Parcelamento:\s*(\d+)\s+Parcelas em Atraso:\s*(\d+)\s+Valor em Atraso:\s*([\d\.,]+)", texto):
+            yield dict(base, Tipo="SIEFPAR", Detalhes=f"{conta} {parcelas} {extrair_valor_monetario(valor_str)}")
+    if "Parcelamento com Exigibilidade Suspensa (SIEFPAR)" in texto:
+        for conta, valor_str in re.findall(r"Parcelamento:\s*(\d+)\s+Valor Suspenso:\s*([\d\.,]+)", texto):
+            yield dict(base, Tipo="SIEFPAR", Detalhes=f"{conta} {extrair_valor_monetario(valor_str)}")
+    if "SISPAR" in texto:
+        for conta, tipo_parcela, modalidade in re.findall(r"(?:Conta\s*)?(\d+)\s+([^\n]+)\nModalidade:\s*([^\n]+)", texto):
+            yield dict(base, Tipo="SISPAR", Detalhes=f"{conta} {tipo_parcela.strip()} {modalidade.strip()}")
+    if "Débito com Exigibilidade Suspensa (SICOB)" in texto:
+        for parcela, situacao in re.findall(r"Parcelamento:\s*(\d+-\d+)\s+Situação:\s*(\d+\s*-\s*.+)", texto):
+            yield dict(base, Tipo="SICOB", Detalhes=f"{parcela} {situacao}")
+    if incluir_detalhes_debitos and "Pendência - Débito (SIEF)" in texto:
+        re.findall(r"(\d{4}-\d{2}\s*-\s*.+?)\s+(\d{2}/\d{4})\s+[\d/]+\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+(.+)", texto)
+
+
+def medir(funcao, texto, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        registros = list(funcao(texto, "bench.pdf"))
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, registros
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paginas", type=int, default=100)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    texto = gerar_texto_relatorio(args.paginas)
+    tempo_legado, legado = medir(iterar_registros_legado, texto, args.repeticoes)
+    tempo_secoes, atual = medir(iterar_registros_texto, texto, args.repeticoes)
+
+    print(f"Texto: {args.paginas} páginas, {len(texto) / 1024:.0f} KiB")
+    print(f"Varredura completa (anterior): {tempo_legado * 1000:8.2f} ms  ({len(legado)} registros)")
+    print(f"Seções em uma passada (atual): {tempo_secoes * 1000:8.2f} ms  ({len(atual)} registros)")
+    print(f"Speedup: {tempo_legado / tempo_secoes:.1f}x")
+
+    por_tipo_legado = collections.Counter(r["Tipo"] for r in legado)
+    por_tipo_atual = collections.Counter(r["Tipo"] for r in atual)
+    if por_tipo_legado != por_tipo_atual:
+        print(f"⚠️ Divergência por tipo: anterior={dict(por_tipo_legado)} atual={dict(por_tipo_atual)}")
+
+
+if __name__ == "__main__":
+    main()
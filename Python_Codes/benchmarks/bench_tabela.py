@@ -0,0 +1,75 @@
+"""Benchmark: tempo de resposta da TabelaVirtual com 10 mil a 1 milhão de registros
+
+Uso (a partir de Python_Codes; precisa de um display, no Linux use xvfb-run):
+    xvfb-run -a python -m benchmarks.bench_tabela --tamanhos 10000 100000 1000000
+
+Para cada tamanho mede, incluindo o redesenho do Tk (update_idletasks):
+definir_registros com o resultado inteiro, atualizar depois de acrescentar um
+lote (como durante o processamento) e rolar_para em posições aleatórias. A
+meta é ficar abaixo de --meta ms em qualquer tamanho.
+"""
+import argparse
+import random
+import statistics
+import time
+import tkinter as tk
+
+from benchmarks.bench_memoria import lotes_por_pdf
+from parcelamentos.resultados import CAMPOS, ArmazemResultados
+from tabela_virtual import TabelaVirtual
+
+
+def medir(janela, funcao):
+    """Milissegundos da chamada mais o redesenho da janela"""
+    inicio = time.perf_counter()
+    funcao()
+    janela.update_idletasks()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--meta", type=float, default=50.0, help="tempo máximo aceitável (ms)")
+    args = parser.parse_args()
+
+    janela = tk.Tk()
+    janela.geometry("1200x700")
+    tabela = TabelaVirtual(janela, CAMPOS, lambda r: tuple(r[c] for c in CAMPOS), altura=30)
+    tabela.tree.pack(fill="both", expand=True)
+    janela.update()
+    rnd = random.Random(42)
+
+    print(f"{'Registros':>10} {'Operação':<18} {'Mediana (ms)':>13} {'Máximo (ms)':>12}")
+    acima = False
+    for tamanho in args.tamanhos:
+        resultados = ArmazemResultados()
+        for lote in lotes_por_pdf(tamanho):
+            resultados.acrescentar(lote)
+        registros = resultados.registros
+        ultimo_lote = next(lotes_por_pdf(8, seed=7))
+
+        tempos = {
+            "definir_registros": [medir(janela, lambda: tabela.definir_registros(registros))
+                                  for _ in range(args.repeticoes)],
+            "atualizar": [],
+            "rolar_para": [medir(janela, lambda: tabela.rolar_para(rnd.randrange(len(registros))))
+                           for _ in range(args.repeticoes)],
+        }
+        for _ in range(args.repeticoes):
+            resultados.acrescentar(ultimo_lote)
+            tempos["atualizar"].append(medir(janela, tabela.atualizar))
+
+        for operacao, medidas in tempos.items():
+            maximo = max(medidas)
+            acima = acima or maximo > args.meta
+            print(f"{len(registros):>10} {operacao:<18} {statistics.median(medidas):13.2f} {maximo:12.2f}")
+
+    janela.destroy()
+    if acima:
+        print(f"⚠️ Alguma operação passou de {args.meta:g} ms")
+
+
+if __name__ == "__main__":
+    main()
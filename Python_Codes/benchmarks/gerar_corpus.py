@@ -0,0 +1,219 @@
+"""Gera Relatórios de Situação Fiscal sintéticos (PDF) para os benchmarks
+
+Uso (a partir de Python_Codes):
+    python -m benchmarks.gerar_corpus /tmp/corpus --pdfs 200 --empresas 150 --paginas 2 40
+    python -m benchmarks.gerar_corpus /tmp/corpus --mistura PARCMEI=0.1 SISPAR=0.9 DEBITO_SIEF=1
+
+Cada seção entra em um relatório com a probabilidade da mistura; as seções
+ficam espalhadas entre páginas de texto comum. Junto dos PDFs é gravado
+corpus.json com os registros esperados de cada arquivo (gabarito).
+Gravar os PDFs requer reportlab.
+"""
+import argparse
+import json
+import os
+import random
+
+NOME_GABARITO = "corpus.json"
+LINHAS_POR_PAGINA = 50
+# Limite de débitos por relatório aplicado por iterar_registros_texto
+MAXIMO_DEBITOS = 5
+
+# Probabilidade de cada seção aparecer em um relatório
+MISTURA_PADRAO = {
+    "PARCMEI": 0.15,
+    "PARCSN": 0.35,
+    "SIEFPAR_PENDENCIA": 0.25,
+    "SIEFPAR_SUSPENSO": 0.25,
+    "SISPAR": 0.3,
+    "SICOB": 0.1,
+    "DEBITO_SIEF": 0.5,
+}
+
+RAMOS = ["COMERCIO", "SERVICOS", "CONSTRUCOES", "ALIMENTOS", "TRANSPORTES", "INDUSTRIA", "CONSULTORIA"]
+PALAVRAS = ["ALFA", "BRASIL", "CENTRAL", "NOVA", "PAULISTA", "UNIÃO", "SÃO JOSÉ", "AÇO", "PRIME", "ESTRELA"]
+MODALIDADES_SISPAR = ["PARCELAMENTO SEM GARANTIA - SIMPLES NACIONAL", "TRANSACAO EXCEPCIONAL",
+                      "PARCELAMENTO SIMPLIFICADO - DEMAIS DEBITOS"]
+RECEITAS = ["IRPJ", "CSLL", "PIS", "COFINS", "IRRF", "CP SEGURADOS"]
+
+
+def formatar_cnpj(numeros):
+    return f"{numeros[:2]}.{numeros[2:5]}.{numeros[5:8]}/{numeros[8:12]}-{numeros[12:]}"
+
+
+def formatar_valor(valor):
+    return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def gerar_empresas(quantidade, rnd):
+    """(CNPJ formatado, nome) de cada empresa do corpus"""
+    empresas = []
+    for i in range(quantidade):
+        numeros = f"{rnd.randint(10**7, 10**8 - 1)}0001{rnd.randint(10, 99)}"
+        nome = f"{rnd.choice(PALAVRAS)} {rnd.choice(RAMOS)} {i} LTDA"
+        empresas.append((formatar_cnpj(numeros), nome))
+    return empresas
+
+
+def gerar_secao(secao, rnd):
+    """(linhas do PDF, registros esperados como (Tipo, Conta)) de uma seção"""
+    if secao == "PARCMEI":
+        return ["MEI - EM PARCELAMENTO", f"Parcelas em atraso {rnd.randint(0, 12)}"], [("PARCMEI", "-")]
+    if secao == "PARCSN":
+        titulo = rnd.choice(["SIMPLES NACIONAL - EM PARCELAMENTO", "SIMPLES NACIONAL - RELP - EM PARCELAMENTO"])
+        return [titulo, f"Parcelas em atraso {rnd.randint(0, 12)}"], [("PARCSN", "-")]
+
+    quantidade = rnd.randint(1, 8)
+    linhas, esperados = [], []
+    if secao == "SIEFPAR_PENDENCIA":
+        linhas.append("Pendência – Parcelamento (SIEFPAR)")
+        for _ in range(quantidade):
+            conta = str(rnd.randint(10**9, 10**10 - 1))
+            linhas.append(f"Parcelamento: {conta} Parcelas em Atraso: {rnd.randint(1, 30)} "
+                          f"Valor em Atraso: {formatar_valor(rnd.uniform(100, 250000))}")
+            esperados.append(("SIEFPAR", conta))
+    elif secao == "SIEFPAR_SUSPENSO":
+        linhas.append("Parcelamento com Exigibilidade Suspensa (SIEFPAR)")
+        for _ in range(quantidade):
+            conta = str(rnd.randint(10**9, 10**10 - 1))
+            linhas.append(f"Parcelamento: {conta} Valor Suspenso: {formatar_valor(rnd.uniform(100, 250000))}")
+            esperados.append(("SIEFPAR", conta))
+    elif secao == "SISPAR":
+        linhas.append("Parcelamento com Exigibilidade Suspensa (SISPAR)")
+        for _ in range(quantidade):
+            conta = str(rnd.randint(10**5, 10**7))
+            linhas.append(f"Conta {conta} PARCELAMENTO CONVENCIONAL")
+            linhas.append(f"Modalidade: {rnd.choice(MODALIDADES_SISPAR)}")
+            esperados.append(("SISPAR", conta))
+    elif secao == "SICOB":
+        linhas.append("Débito com Exigibilidade Suspensa (SICOB)")
+        for _ in range(quantidade):
+            conta = f"{rnd.randint(10**5, 10**6)}-{rnd.randint(1, 9)}"
+            linhas.append(f"Parcelamento: {conta} Situação: 000001 - ATIVO/EM DIA")
+            esperados.append(("SICOB", conta))
+    elif secao == "DEBITO_SIEF":
+        linhas.append("Pendência - Débito (SIEF)")
+        for _ in range(quantidade * 2):
+            receita = f"{rnd.randint(1000, 9999)}-{rnd.randint(10, 99)} - {rnd.choice(RECEITAS)}"
+            mes, ano = rnd.randint(1, 12), rnd.randint(2015, 2024)
+            valores = " ".join(formatar_valor(rnd.uniform(10, 50000)) for _ in range(5))
+            linhas.append(f"{receita} {mes:02d}/{ano} 20/{mes:02d}/{ano} {valores} DEVEDOR")
+            esperados.append(("DÉBITO", receita))
+        esperados = esperados[:MAXIMO_DEBITOS]
+    else:
+        raise ValueError(f"Seção desconhecida: {secao}")
+    return linhas, esperados
+
+
+def linha_comum(rnd):
+    """Texto corrido de relatório que não pertence a nenhuma seção"""
+    return (f"Diagnóstico fiscal - item {rnd.randint(1, 999)} - informação sem pendência para o "
+            f"período {rnd.randint(1, 12):02d}/{rnd.randint(2015, 2024)}")
+
+
+def montar_paginas(cnpj, nome, paginas, mistura, rnd):
+    """(linhas de cada página, registros esperados [(Tipo, Conta), ...]) de um relatório"""
+    blocos, esperados = [], []
+    for secao, probabilidade in mistura.items():
+        if rnd.random() < probabilidade:
+            linhas, registros = gerar_secao(secao, rnd)
+            blocos.append(linhas)
+            esperados.extend(registros)
+
+    # Cada bloco começa numa página sorteada; o resto é texto comum
+    inicio_blocos = {}
+    for bloco in blocos:
+        inicio_blocos.setdefault(rnd.randrange(paginas), []).append(bloco)
+
+    # Como no relatório: raiz do CNPJ com o nome, depois o estabelecimento
+    linhas = ["MINISTÉRIO DA FAZENDA", "SECRETARIA ESPECIAL DA RECEITA FEDERAL DO BRASIL",
+              "INFORMAÇÕES DE APOIO PARA EMISSÃO DE CERTIDÃO", f"CNPJ: {cnpj[:10]} - {nome}",
+              f"CNPJ: {cnpj} - ESTABELECIMENTO MATRIZ"]
+    conteudos = []
+    for pagina in range(paginas):
+        conteudo = linhas if pagina == 0 else [f"Página {pagina + 1} de {paginas}"]
+        for bloco in inicio_blocos.get(pagina, []):
+            conteudo.extend(bloco)
+        while len(conteudo) < LINHAS_POR_PAGINA:
+            conteudo.append(linha_comum(rnd))
+        conteudos.append(conteudo)
+    return conteudos, esperados
+
+
+def gerar_pdf(caminho, cnpj, nome, paginas, mistura, rnd):
+    """Grava um relatório e devolve os registros esperados [(Tipo, Conta), ...]"""
+    # Import local: os testes usam montar_paginas sem precisar do reportlab
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    conteudos, esperados = montar_paginas(cnpj, nome, paginas, mistura, rnd)
+    pdf = canvas.Canvas(caminho, pagesize=A4)
+    for conteudo in conteudos:
+        # Seções grandes continuam na mesma página (fonte menor), como no relatório real
+        altura = min(14, 780 / len(conteudo))
+        texto = pdf.beginText(40, 800)
+        texto.setFont("Helvetica", min(9, altura * 0.75))
+        texto.setLeading(altura)
+        for linha in conteudo:
+            texto.textLine(linha)
+        pdf.drawText(texto)
+        pdf.showPage()
+    pdf.save()
+    return esperados
+
+
+def gerar_corpus(pasta, pdfs=100, empresas=None, paginas=(2, 20), mistura=None, seed=42):
+    """Gera os PDFs e o gabarito em pasta; devolve o gabarito"""
+    rnd = random.Random(seed)
+    mistura = dict(MISTURA_PADRAO if mistura is None else mistura)
+    lista_empresas = gerar_empresas(empresas or pdfs, rnd)
+    os.makedirs(pasta, exist_ok=True)
+
+    arquivos = {}
+    for i in range(pdfs):
+        # Com menos empresas que PDFs, algumas empresas têm mais de um relatório
+        cnpj, nome = lista_empresas[i % len(lista_empresas)]
+        nome_arquivo = f"relatorio_{i:05d}.pdf"
+        total_paginas = rnd.randint(paginas[0], paginas[1])
+        esperados = gerar_pdf(os.path.join(pasta, nome_arquivo), cnpj, nome, total_paginas, mistura, rnd)
+        arquivos[nome_arquivo] = {"cnpj": cnpj, "nome": nome, "paginas": total_paginas,
+                                  "registros": [list(r) for r in esperados]}
+
+    gabarito = {"seed": seed, "empresas": len(lista_empresas), "paginas": list(paginas), "mistura": mistura,
+                "arquivos": arquivos}
+    with open(os.path.join(pasta, NOME_GABARITO), "w", encoding="utf-8") as f:
+        json.dump(gabarito, f, ensure_ascii=False, indent=1)
+    return gabarito
+
+
+def ler_mistura(itens):
+    """["PARCMEI=0.2", ...] -> {"PARCMEI": 0.2, ...}; seções omitidas ficam fora do corpus"""
+    mistura = {}
+    for item in itens:
+        secao, _, probabilidade = item.partition("=")
+        if secao not in MISTURA_PADRAO:
+            raise argparse.ArgumentTypeError(f"Seção desconhecida: {secao} (use {', '.join(MISTURA_PADRAO)})")
+        mistura[secao] = float(probabilidade or 1)
+    return mistura
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pasta")
+    parser.add_argument("--pdfs", type=int, default=100)
+    parser.add_argument("--empresas", type=int, help="empresas distintas (padrão: uma por PDF)")
+    parser.add_argument("--paginas", type=int, nargs=2, default=[2, 20], metavar=("MIN", "MAX"))
+    parser.add_argument("--mistura", nargs="+", metavar="SECAO=PROB",
+                        help=f"probabilidade de cada seção (padrão: {MISTURA_PADRAO})")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    mistura = ler_mistura(args.mistura) if args.mistura else None
+    gabarito = gerar_corpus(args.pasta, args.pdfs, args.empresas, tuple(args.paginas), mistura, args.seed)
+    registros = sum(len(a["registros"]) for a in gabarito["arquivos"].values())
+    paginas = sum(a["paginas"] for a in gabarito["arquivos"].values())
+    print(f"✅ {args.pdfs} PDFs, {paginas} páginas, {registros} registros esperados -> {args.pasta}")
+
+
+if __name__ == "__main__":
+    main()
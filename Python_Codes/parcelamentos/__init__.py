@@ -0,0 +1 @@
+"""Motor de extração dos Relatórios de Situação Fiscal (sem dependência de Tk)"""
@@ -0,0 +1,124 @@
+"""Execução em lote, sem interface gráfica
+
+Uso (a partir de Python_Codes):
+    python -m parcelamentos PASTA_PDFS --saida PASTA_SAIDA [opções]
+    python -m parcelamentos --config configuracao.json
+
+Códigos de saída: 0 = concluído, 1 = erro no processamento, 2 = argumentos inválidos.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from datetime import datetime
+
+from parcelamentos.backends import backends_disponiveis
+from parcelamentos.descoberta import ler_data
+from parcelamentos.motor import CONFIGURACAO_PADRAO, processar_pasta
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m parcelamentos",
+        description="Analisa uma pasta de Relatórios de Situação Fiscal e gera o Excel de parcelamentos."
+    )
+    parser.add_argument("pasta_pdfs", nargs="?", help="pasta com os PDFs")
+    parser.add_argument("-s", "--saida", dest="pasta_saida", help="pasta para salvar o resultado")
+    parser.add_argument("--sem-subpastas", action="store_false", dest="incluir_subpastas", default=None,
+                        help="procurar PDFs só na pasta informada, sem entrar nas subpastas")
+    parser.add_argument("--incluir", action="append", dest="padroes_incluir", metavar="PADRAO",
+                        help="padrão dos PDFs a processar, repetível (padrão: *.pdf; com \"/\" casa o "
+                             "caminho relativo, ex.: \"2024/*/*.pdf\")")
+    parser.add_argument("--excluir", action="append", dest="padroes_excluir", metavar="PADRAO",
+                        help="padrão de arquivos ou pastas a ignorar, repetível (ex.: \"backup\")")
+    parser.add_argument("--desde", dest="modificado_desde", metavar="AAAA-MM-DD",
+                        help="só PDFs modificados a partir desta data")
+    parser.add_argument("--ate", dest="modificado_ate", metavar="AAAA-MM-DD",
+                        help="só PDFs modificados até esta data (inclusive)")
+    parser.add_argument("-e", "--excel-empresas", help="Excel com a coluna CNPJ das empresas a manter")
+    parser.add_argument("-c", "--config", help="arquivo JSON salvo pela interface (Salvar Configuração)")
+    parser.add_argument("-p", "--processos", type=int, dest="processos_paralelos",
+                        help="processos paralelos (padrão: 1 = sequencial)")
+    parser.add_argument("-b", "--backend", dest="backend_extracao", choices=backends_disponiveis(),
+                        help="motor de extração de texto")
+    parser.add_argument("--lote", type=int, dest="tamanho_lote",
+                        help="PDFs por lote; os registros de cada lote vão ordenados para o disco "
+                             "e o Excel é montado intercalando os lotes (memória limitada)")
+    parser.add_argument("--leitura-antecipada", type=int, metavar="K",
+                        help="PDFs lidos à frente em threads enquanto o atual é analisado "
+                             "(padrão: 4; 0 desliga; útil em pastas de rede)")
+    parser.add_argument("--sem-debitos", action="store_false", dest="incluir_detalhes_debitos", default=None,
+                        help="não incluir detalhes de débitos pendentes")
+    parser.add_argument("--agrupar-por-empresa", action="store_true", default=None,
+                        help="ordenar por empresa em vez de por tipo")
+    parser.add_argument("--sem-json", action="store_false", dest="salvar_backup_json", default=None,
+                        help="não salvar o backup JSON")
+    parser.add_argument("--parquet", action="store_true", dest="salvar_parquet", default=None,
+                        help="salvar também os resultados em Parquet (requer pyarrow)")
+    parser.add_argument("--retomar", action="store_true", default=None,
+                        help="retomar a última execução interrompida desta pasta (diário na pasta de saída)")
+    parser.add_argument("--ignorar-cache", action="store_true", default=None,
+                        help="reprocessar todos os PDFs, sem usar o cache")
+    parser.add_argument("-q", "--silencioso", action="store_true",
+                        help="mostrar só erros e o resumo final")
+    return parser
+
+
+def montar_configuracao(args, parser):
+    config = dict(CONFIGURACAO_PADRAO)
+    if args.config:
+        try:
+            with open(args.config, encoding="utf-8") as f:
+                config.update(json.load(f))
+        except (OSError, ValueError) as e:
+            parser.error(f"não foi possível ler {args.config}: {e}")
+
+    # Argumentos da linha de comando têm prioridade sobre o arquivo
+    for chave in CONFIGURACAO_PADRAO:
+        valor = getattr(args, chave, None)
+        if valor is not None:
+            config[chave] = valor
+
+    if not config["pasta_pdfs"] or not os.path.isdir(config["pasta_pdfs"]):
+        parser.error("informe uma pasta de PDFs existente")
+    if not config["pasta_saida"]:
+        parser.error("informe a pasta de saída (--saida)")
+    for chave in ("modificado_desde", "modificado_ate"):
+        try:
+            ler_data(config[chave])
+        except ValueError as e:
+            parser.error(str(e))
+    return config
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    config = montar_configuracao(args, parser)
+    os.makedirs(config["pasta_saida"], exist_ok=True)
+
+    def log(mensagem):
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"[{timestamp}] {mensagem}", flush=True)
+
+    def log_silencioso(mensagem):
+        if "Erro" in mensagem or "ERRO" in mensagem:
+            log(mensagem)
+
+    try:
+        resultado = processar_pasta(config, log=log_silencioso if args.silencioso else log,
+                                    manter_dados=False)
+    except Exception as e:
+        log(f"❌ ERRO: {str(e)}")
+        return 1
+
+    if args.silencioso:
+        log(f"{resultado.total_arquivos} PDFs, {resultado.total_registros} parcelamentos, "
+            f"{resultado.tempo_total:.1f}s -> {resultado.caminho_excel or 'nenhum arquivo gerado'}")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
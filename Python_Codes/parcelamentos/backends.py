@@ -0,0 +1,81 @@
+import io
+from contextlib import contextmanager
+
+import pdfplumber
+
+try:
+    import pypdfium2
+except ImportError:  # opcional: instalado junto com versões recentes do pdfplumber
+    pypdfium2 = None
+
+BACKEND_PADRAO = "pdfplumber"
+
+
+class DocumentoPdfplumber:
+    """Texto com layout reconstruído caractere a caractere pelo pdfplumber (mais lento)"""
+
+    def __init__(self, caminho_pdf):
+        if isinstance(caminho_pdf, bytes):
+            caminho_pdf = io.BytesIO(caminho_pdf)
+        self.pdf = pdfplumber.open(caminho_pdf)
+
+    def __len__(self):
+        return len(self.pdf.pages)
+
+    def texto_pagina(self, indice):
+        return self.pdf.pages[indice].extract_text()
+
+    def fechar(self):
+        self.pdf.close()
+
+
+class DocumentoPdfium:
+    """Texto bruto do PDFium, sem análise de layout (várias vezes mais rápido)"""
+
+    def __init__(self, caminho_pdf):
+        self.pdf = pypdfium2.PdfDocument(caminho_pdf)
+
+    def __len__(self):
+        return len(self.pdf)
+
+    def texto_pagina(self, indice):
+        pagina = self.pdf[indice]
+        try:
+            pagina_texto = pagina.get_textpage()
+            try:
+                texto = pagina_texto.get_text_range()
+            finally:
+                pagina_texto.close()
+        finally:
+            pagina.close()
+        # As regras de extração esperam quebras de linha simples
+        return texto.replace("\r\n", "\n").replace("\r", "\n")
+
+    def fechar(self):
+        self.pdf.close()
+
+
+BACKENDS = {
+    "pdfplumber": DocumentoPdfplumber,
+    "pdfium": DocumentoPdfium,
+}
+
+
+def backends_disponiveis():
+    """Nomes dos backends cujas dependências estão instaladas"""
+    return [nome for nome in BACKENDS if nome != "pdfium" or pypdfium2 is not None]
+
+
+@contextmanager
+def abrir_documento(caminho_pdf, backend=BACKEND_PADRAO):
+    """Abre um PDF (caminho ou conteúdo já lido, em bytes) com o backend escolhido"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de extração desconhecido: {backend}")
+    if backend == "pdfium" and pypdfium2 is None:
+        raise ImportError("O backend 'pdfium' requer o pacote pypdfium2 (pip install pypdfium2)")
+
+    documento = BACKENDS[backend](caminho_pdf)
+    try:
+        yield documento
+    finally:
+        documento.fechar()
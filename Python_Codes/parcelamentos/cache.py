@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+from parcelamentos import backends, extracao, normalizacao, secoes
+from parcelamentos.backends import BACKEND_PADRAO
+
+NOME_ARQUIVO_CACHE = "cache_extracao.sqlite3"
+LIMITE_CACHE_MB = 512
+
+
+def _constantes_codigo(codigo, saida):
+    """Coleta recursivamente bytecode e constantes (regex, rótulos) de um code object"""
+    saida.append(codigo.co_code)
+    for const in codigo.co_consts:
+        if hasattr(const, "co_code"):
+            _constantes_codigo(const, saida)
+        else:
+            saida.append(repr(const).encode("utf-8"))
+
+
+def versao_parser():
+    """Impressão digital das regras de extração: muda sempre que regex ou lógica mudarem"""
+    partes = []
+    for modulo in (extracao, secoes, backends, normalizacao):
+        for nome, objeto in sorted(vars(modulo).items()):
+            if isinstance(objeto, re.Pattern):
+                partes.append(f"{nome}={objeto.pattern}".encode("utf-8"))
+            elif isinstance(objeto, (str, tuple)) and nome.isupper():
+                partes.append(f"{nome}={objeto!r}".encode("utf-8"))
+            elif getattr(objeto, "__module__", None) == modulo.__name__:
+                if hasattr(objeto, "__code__"):
+                    _constantes_codigo(objeto.__code__, partes)
+                else:
+                    # Classes: métodos em ordem de nome
+                    for _, membro in sorted(vars(objeto).items()):
+                        if hasattr(membro, "__code__"):
+                            _constantes_codigo(membro.__code__, partes)
+    return hashlib.sha256(b"\0".join(partes)).hexdigest()[:16]
+
+
+def hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    """SHA-256 do conteúdo do arquivo"""
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+class CacheExtracao:
+    """Cache em SQLite dos registros extraídos, endereçado pelo conteúdo do PDF"""
+
+    def __init__(self, caminho, limite_mb=LIMITE_CACHE_MB):
+        self.caminho = caminho
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.versao = versao_parser()
+        self.acertos = 0
+        self.falhas = 0
+        self._escritas_pendentes = 0
+
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS extracoes ("
+            " chave TEXT PRIMARY KEY,"
+            " dados TEXT NOT NULL,"
+            " tamanho INTEGER NOT NULL,"
+            " ultimo_acesso REAL NOT NULL)"
+        )
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_ultimo_acesso ON extracoes (ultimo_acesso)")
+        self.tamanho_total = self.conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM extracoes").fetchone()[0]
+
+    @classmethod
+    def na_pasta(cls, pasta, limite_mb=LIMITE_CACHE_MB):
+        return cls(os.path.join(pasta, NOME_ARQUIVO_CACHE), limite_mb)
+
+    def chave(self, caminho_pdf, incluir_detalhes_debitos=True, backend=BACKEND_PADRAO, hash_conteudo=None):
+        """Chave = hash do conteúdo + versão do parser + opções que alteram a saída"""
+        opcoes = "debitos" if incluir_detalhes_debitos else "sem_debitos"
+        return f"{hash_conteudo or hash_arquivo(caminho_pdf)}:{self.versao}:{backend}:{opcoes}"
+
+    def obter(self, chave, nome_arquivo):
+        """Retorna os registros em cache (com o nome de arquivo atual) ou None"""
+        linha = self.conexao.execute("SELECT dados FROM extracoes WHERE chave = ?", (chave,)).fetchone()
+        if linha is None:
+            self.falhas += 1
+            return None
+
+        self.acertos += 1
+        self.conexao.execute("UPDATE extracoes SET ultimo_acesso = ? WHERE chave = ?", (time.time(), chave))
+        self._registrar_escrita()
+
+        dados = json.loads(linha[0])
+        # O mesmo conteúdo pode aparecer com outro nome de arquivo
+        for registro in dados:
+            registro["Arquivo"] = nome_arquivo
+        return dados
+
+    def guardar(self, chave, dados):
+        conteudo = json.dumps(dados, ensure_ascii=False)
+        tamanho = len(conteudo.encode("utf-8"))
+
+        anterior = self.conexao.execute("SELECT tamanho FROM extracoes WHERE chave = ?", (chave,)).fetchone()
+        if anterior:
+            self.tamanho_total -= anterior[0]
+
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO extracoes (chave, dados, tamanho, ultimo_acesso) VALUES (?, ?, ?, ?)",
+            (chave, conteudo, tamanho, time.time())
+        )
+        self.tamanho_total += tamanho
+        if self.tamanho_total > self.limite_bytes:
+            self.remover_antigos()
+        self._registrar_escrita()
+
+    def remover_antigos(self):
+        """Remove as entradas usadas há mais tempo até ficar abaixo de 90% do limite"""
+        alvo = self.limite_bytes * 0.9
+        removidas = []
+        for chave, tamanho in self.conexao.execute("SELECT chave, tamanho FROM extracoes ORDER BY ultimo_acesso"):
+            if self.tamanho_total <= alvo:
+                break
+            removidas.append((chave,))
+            self.tamanho_total -= tamanho
+        self.conexao.executemany("DELETE FROM extracoes WHERE chave = ?", removidas)
+        return len(removidas)
+
+    def _registrar_escrita(self):
+        self._escritas_pendentes += 1
+        if self._escritas_pendentes >= 100:
+            self.conexao.commit()
+            self._escritas_pendentes = 0
+
+    def fechar(self):
+        self.conexao.commit()
+        self.conexao.close()
@@ -0,0 +1,50 @@
+"""Converte backups antigos (parcelamentos_backup_*.json, lista com indent=2) para NDJSON
+
+Uso (a partir de Python_Codes):
+    python -m parcelamentos.converter_backup ../excel/parcelamentos_backup_*.json
+
+Cada arquivo X.json gera X.ndjson ao lado; o original não é alterado.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+from parcelamentos.saida import GravadorNdjson
+
+
+def converter(caminho_json):
+    """Converte um backup JSON e retorna (caminho do NDJSON, total de registros)"""
+    with open(caminho_json, encoding="utf-8") as f:
+        registros = json.load(f)
+    if not isinstance(registros, list):
+        raise ValueError("o backup deve conter uma lista de registros")
+
+    caminho_ndjson = os.path.splitext(caminho_json)[0] + ".ndjson"
+    if os.path.exists(caminho_ndjson):
+        os.remove(caminho_ndjson)
+    with GravadorNdjson(caminho_ndjson) as gravador:
+        gravador.gravar(registros)
+    return caminho_ndjson, len(registros)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte backups JSON antigos para NDJSON")
+    parser.add_argument("arquivos", nargs="+", help="arquivos .json (aceita curingas)")
+    args = parser.parse_args(argv)
+
+    caminhos = [c for padrao in args.arquivos for c in (glob.glob(padrao) or [padrao])]
+    erros = 0
+    for caminho in caminhos:
+        try:
+            destino, total = converter(caminho)
+            print(f"✅ {caminho} -> {destino} ({total} registros)")
+        except (OSError, ValueError) as e:
+            erros += 1
+            print(f"❌ {caminho}: {e}")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
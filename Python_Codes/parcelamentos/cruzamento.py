@@ -0,0 +1,177 @@
+"""Cruzamento das planilhas do MEG_Parc: empresas desejadas x cadastro completo"""
+import re
+
+import pandas as pd
+
+# Cruzamento aproximado: termos que não identificam a empresa
+SUFIXOS_SOCIETARIOS = frozenset({"ltda", "me", "epp", "eireli", "mei", "sa", "s", "a", "cia", "slu", "ss"})
+LIMIAR_SEMELHANCA = 0.85
+# Mesma raiz de CNPJ (8 primeiros dígitos) aceita nomes menos parecidos
+LIMIAR_RAIZ_CNPJ = 0.5
+TAMANHO_RAIZ_CNPJ = 8
+# Palavras (ou pares) presentes em mais nomes que isto não formam bloco (ex.: "comercio")
+LIMITE_BLOCO = 50
+
+_SEPARADORES = re.compile(r"[\W_]+")
+
+
+def nomes_duplicados(df, coluna_nome, origem):
+    """Nomes normalizados que aparecem mais de uma vez, com as linhas do Excel (1 = primeira)"""
+    repetidos = df[df.duplicated(coluna_nome, keep=False)]
+    if repetidos.empty:
+        return pd.DataFrame(columns=["Origem", "Nome normalizado", "Ocorrências", "Linhas no Excel"])
+    # O índice do DataFrame lido com header=None é a linha do Excel menos 1
+    linhas = {}
+    for nome, indice in zip(repetidos[coluna_nome], repetidos.index):
+        linhas.setdefault(nome, []).append(indice + 1)
+    return pd.DataFrame({
+        "Origem": origem,
+        "Nome normalizado": list(linhas),
+        "Ocorrências": [len(l) for l in linhas.values()],
+        "Linhas no Excel": [", ".join(map(str, l)) for l in linhas.values()],
+    })
+
+
+def cruzar_por_nome(df_desejados, df_todas):
+    """Junta cada empresa do cadastro ao primeiro registro desejado com o mesmo nome
+
+    df_desejados precisa das colunas Nome_Normalizado, Nome_Desejado e
+    CNPJ_Normalizado; df_todas, de Codigo e Nome_Todas_Normalizado. Retorna
+    (resultado com Nº, EMPRESA e CNPJ na ordem do cadastro, nomes duplicados).
+    Um nome repetido entre os desejados usa só a primeira linha; repetido no
+    cadastro gera uma linha por código. Os dois casos são listados em duplicados.
+    """
+    # Tabela de consulta com uma linha por nome: a primeira ocorrência vence
+    primeiros = df_desejados.drop_duplicates("Nome_Normalizado", keep="first")
+    primeiros = primeiros[["Nome_Normalizado", "Nome_Desejado", "CNPJ_Normalizado"]]
+
+    # Junção por hash; em junções "inner" o pandas mantém a ordem do lado esquerdo
+    juntos = df_todas[["Codigo", "Nome_Todas_Normalizado"]].merge(
+        primeiros, how="inner", left_on="Nome_Todas_Normalizado", right_on="Nome_Normalizado", sort=False
+    )
+    resultado = pd.DataFrame({
+        "Nº": juntos["Codigo"].values,
+        "EMPRESA": juntos["Nome_Desejado"].values,
+        "CNPJ": juntos["CNPJ_Normalizado"].values,
+    })
+
+    duplicados = pd.concat([
+        nomes_duplicados(df_desejados, "Nome_Normalizado", "Excel 1 (desejados)"),
+        nomes_duplicados(df_todas[df_todas["Nome_Todas_Normalizado"].isin(primeiros["Nome_Normalizado"])],
+                         "Nome_Todas_Normalizado", "Excel 2 (todas)"),
+    ], ignore_index=True)
+    return resultado, duplicados
+
+
+def chave_nome(nome):
+    """Nome normalizado sem pontuação nem sufixos societários ("acme ltda." -> "acme")"""
+    palavras = [p for p in _SEPARADORES.sub(" ", nome).split() if p not in SUFIXOS_SOCIETARIOS]
+    return " ".join(palavras)
+
+
+def trigramas(chave):
+    texto = f" {chave} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def semelhanca(trigramas_a, trigramas_b):
+    """Coeficiente de Dice entre os trigramas de dois nomes (0 a 1)"""
+    if not trigramas_a or not trigramas_b:
+        return 0.0
+    return 2 * len(trigramas_a & trigramas_b) / (len(trigramas_a) + len(trigramas_b))
+
+
+def chaves_bloco(chave):
+    """Palavras do nome e pares de palavras vizinhas (raros mesmo com palavras comuns)"""
+    palavras = chave.split()
+    return set(palavras) | {f"{a} {b}" for a, b in zip(palavras, palavras[1:])}
+
+
+class IndiceBlocos:
+    """Candidatos por palavra (ou par de palavras) rara do nome e por raiz de CNPJ
+
+    Só os nomes que compartilham um bloco são comparados, em vez de todos
+    contra todos. Blocos com mais de LIMITE_BLOCO nomes são ignorados.
+    """
+
+    def __init__(self, chaves, raizes=None, limiar=LIMIAR_SEMELHANCA):
+        self.limiar = limiar
+        self.trigramas = [trigramas(chave) for chave in chaves]
+        por_chave = {}
+        for posicao, chave in enumerate(chaves):
+            for bloco in chaves_bloco(chave):
+                por_chave.setdefault(bloco, []).append(posicao)
+        self.por_chave = {bloco: posicoes for bloco, posicoes in por_chave.items() if len(posicoes) <= LIMITE_BLOCO}
+        self.por_raiz = {}
+        for posicao, raiz in enumerate(raizes or ()):
+            if raiz:
+                self.por_raiz.setdefault(raiz, []).append(posicao)
+
+    def candidatos(self, chave, raiz=""):
+        posicoes = set()
+        for bloco in chaves_bloco(chave):
+            posicoes.update(self.por_chave.get(bloco, ()))
+        return posicoes, set(self.por_raiz.get(raiz, ()))
+
+    def melhor(self, chave, raiz=""):
+        """(posição, semelhança, pela raiz do CNPJ) do melhor candidato; posição -1 se nenhum serve"""
+        por_nome, por_raiz = self.candidatos(chave, raiz)
+        alvo = trigramas(chave)
+        melhor = (-1, 0.0, False)
+        # Em empate vence a primeira linha do Excel, como no cruzamento exato
+        for posicao in sorted(por_nome | por_raiz):
+            nota = semelhanca(alvo, self.trigramas[posicao])
+            mesma_raiz = posicao in por_raiz
+            if nota >= (LIMIAR_RAIZ_CNPJ if mesma_raiz else self.limiar) and nota > melhor[1]:
+                melhor = (posicao, nota, mesma_raiz)
+        return melhor
+
+
+def cruzar_por_nome_aproximado(df_desejados, df_todas, limiar=LIMIAR_SEMELHANCA):
+    """Como cruzar_por_nome, mas aceita nomes parecidos quando não há igual
+
+    Nomes iguais continuam casando direto (semelhança 1). Os demais buscam
+    candidatos no IndiceBlocos e ficam com o mais parecido, se atingir o
+    limiar (ou LIMIAR_RAIZ_CNPJ quando a raiz do CNPJ coincide; para isso
+    df_todas precisa de CNPJ_Todas_Normalizado). O resultado ganha as colunas
+    Nome no cadastro, Semelhança e Critério para conferência.
+    """
+    primeiros = df_desejados.drop_duplicates("Nome_Normalizado", keep="first")
+    nomes = primeiros["Nome_Normalizado"].tolist()
+    cnpjs = primeiros["CNPJ_Normalizado"].tolist()
+    posicao_exata = {nome: i for i, nome in enumerate(nomes)}
+
+    indice = IndiceBlocos([chave_nome(nome) for nome in nomes], [c[:TAMANHO_RAIZ_CNPJ] for c in cnpjs],
+                          limiar)
+
+    if "CNPJ_Todas_Normalizado" in df_todas.columns:
+        raizes_todas = [c[:TAMANHO_RAIZ_CNPJ] for c in df_todas["CNPJ_Todas_Normalizado"]]
+    else:
+        raizes_todas = [""] * len(df_todas)
+
+    linhas = {"Nº": [], "EMPRESA": [], "CNPJ": [], "Nome no cadastro": [], "Semelhança": [], "Critério": []}
+    desejados = primeiros["Nome_Desejado"].tolist()
+    for codigo, nome, nome_original, raiz in zip(df_todas["Codigo"], df_todas["Nome_Todas_Normalizado"],
+                                                 df_todas.get("Nome_Todas", df_todas["Nome_Todas_Normalizado"]),
+                                                 raizes_todas):
+        posicao = posicao_exata.get(nome)
+        if posicao is not None:
+            nota, criterio = 1.0, "Exato"
+        else:
+            posicao, nota, mesma_raiz = indice.melhor(chave_nome(nome), raiz)
+            if posicao < 0:
+                continue
+            criterio = "Raiz do CNPJ" if mesma_raiz else "Nome aproximado"
+        linhas["Nº"].append(codigo)
+        linhas["EMPRESA"].append(desejados[posicao])
+        linhas["CNPJ"].append(cnpjs[posicao])
+        linhas["Nome no cadastro"].append(nome_original)
+        linhas["Semelhança"].append(round(nota, 3))
+        linhas["Critério"].append(criterio)
+
+    duplicados = pd.concat([
+        nomes_duplicados(df_desejados, "Nome_Normalizado", "Excel 1 (desejados)"),
+        nomes_duplicados(df_todas[df_todas["Nome_Todas_Normalizado"].isin(posicao_exata)],
+                         "Nome_Todas_Normalizado", "Excel 2 (todas)"),
+    ], ignore_index=True)
+    return pd.DataFrame(linhas), duplicados
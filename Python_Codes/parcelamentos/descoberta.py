@@ -0,0 +1,108 @@
+"""Busca dos PDFs a processar, percorrendo a pasta sob demanda com os.scandir
+
+Os arquivos são entregues à medida que são encontrados (sem listar a árvore
+inteira antes do primeiro PDF), com filtros por padrão de nome e por data de
+modificação. Padrões sem "/" valem para o nome do arquivo ou da pasta; com
+"/", para o caminho relativo (ex.: "2024/*/ACME*/*.pdf"). Pastas que casam
+com um padrão de exclusão não são percorridas.
+"""
+import os
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
+
+PADROES_INCLUIR_PADRAO = ("*.pdf",)
+
+
+def ler_data(texto, fim_do_dia=False):
+    """Timestamp de uma data AAAA-MM-DD (ou DD/MM/AAAA); None se vazia"""
+    if not texto:
+        return None
+    for formato in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            data = datetime.strptime(texto.strip(), formato)
+        except ValueError:
+            continue
+        if fim_do_dia:
+            data += timedelta(days=1)
+        return data.timestamp()
+    raise ValueError(f"Data inválida: {texto} (use AAAA-MM-DD)")
+
+
+def _normalizar_padroes(padroes):
+    if isinstance(padroes, str):
+        padroes = padroes.split(";")
+    return [p.strip().replace("\\", "/").lower() for p in padroes or () if p.strip()]
+
+
+def casa_padrao(caminho_relativo, nome, padroes):
+    """Se o arquivo/pasta casa com algum dos padrões (sem diferenciar maiúsculas)"""
+    caminho_relativo = caminho_relativo.lower()
+    nome = nome.lower()
+    return any(fnmatchcase(caminho_relativo if "/" in p else nome, p) for p in padroes)
+
+
+class DescobertaPdfs:
+    """Percorre pasta (e subpastas) entregando (caminho relativo, caminho) dos PDFs
+
+    Conta em encontrados os arquivos entregues e em pastas as pastas lidas;
+    concluida fica True quando a árvore inteira foi percorrida. Erros ao ler
+    subpastas ou arquivos vão para ao_erro; os da própria pasta são levantados.
+    """
+
+    def __init__(self, pasta, incluir_subpastas=True, incluir=PADROES_INCLUIR_PADRAO, excluir=(),
+                 modificado_desde=None, modificado_ate=None, ao_erro=None):
+        self.pasta = pasta
+        self.incluir_subpastas = incluir_subpastas
+        self.incluir = _normalizar_padroes(incluir) or list(PADROES_INCLUIR_PADRAO)
+        self.excluir = _normalizar_padroes(excluir)
+        self.desde = ler_data(modificado_desde) if isinstance(modificado_desde, str) else modificado_desde
+        self.ate = ler_data(modificado_ate, fim_do_dia=True) if isinstance(modificado_ate, str) else modificado_ate
+        self.ao_erro = ao_erro
+        self.encontrados = 0
+        self.pastas = 0
+        self.concluida = False
+
+    def _dentro_da_janela(self, entrada):
+        if self.desde is None and self.ate is None:
+            return True
+        modificado = entrada.stat().st_mtime
+        return (self.desde is None or modificado >= self.desde) and (self.ate is None or modificado < self.ate)
+
+    def __iter__(self):
+        # Pilha de (caminho, relativo): os arquivos de cada pasta saem antes das subpastas
+        pendentes = [(self.pasta, "")]
+        while pendentes:
+            pasta, relativo_pasta = pendentes.pop()
+            subpastas = []
+            try:
+                with os.scandir(pasta) as entradas:
+                    self.pastas += 1
+                    for entrada in entradas:
+                        relativo = relativo_pasta + entrada.name
+                        try:
+                            if entrada.is_dir(follow_symlinks=False):
+                                if self.incluir_subpastas and not casa_padrao(relativo, entrada.name, self.excluir):
+                                    subpastas.append((entrada.path, relativo + "/"))
+                                continue
+                            if not entrada.is_file():
+                                continue
+                            if not casa_padrao(relativo, entrada.name, self.incluir) or \
+                                    casa_padrao(relativo, entrada.name, self.excluir):
+                                continue
+                            if not self._dentro_da_janela(entrada):
+                                continue
+                        except OSError as e:
+                            if self.ao_erro is not None:
+                                self.ao_erro(entrada.path, e)
+                            continue
+                        self.encontrados += 1
+                        yield relativo, entrada.path
+            except OSError as e:
+                # A pasta informada ilegível é um erro da execução, não de um arquivo
+                if not relativo_pasta:
+                    raise
+                if self.ao_erro is not None:
+                    self.ao_erro(pasta, e)
+            # Ordem inversa na pilha: as subpastas são visitadas na ordem em que apareceram
+            pendentes.extend(reversed(subpastas))
+        self.concluida = True
@@ -0,0 +1,121 @@
+"""Diário de execução: permite retomar um processamento interrompido
+
+Cada execução grava na pasta de saída um diario_<timestamp>.ndjson: a primeira
+linha identifica a execução (pasta, opções e versão do parser) e cada linha
+seguinte é um PDF concluído, com o hash do conteúdo e os registros extraídos
+(antes do filtro de empresas). O diário é apagado quando a execução termina;
+se ele ainda existe, a execução foi interrompida e pode ser retomada. A execução
+retomada usa o mesmo timestamp: o NDJSON parcial da interrompida é regravado
+(completo) em vez de ficar esquecido ao lado do novo.
+"""
+import glob
+import json
+import os
+
+from parcelamentos.cache import versao_parser
+
+PREFIXO_DIARIO = "diario_"
+
+
+def identificacao(pasta_pdfs, incluir_debitos, backend, excel_empresas):
+    """Cabeçalho do diário: só um diário com o mesmo cabeçalho pode ser retomado"""
+    return {
+        "pasta_pdfs": os.path.abspath(pasta_pdfs),
+        "incluir_detalhes_debitos": bool(incluir_debitos),
+        "backend_extracao": backend,
+        "excel_empresas": os.path.abspath(excel_empresas) if excel_empresas else "",
+        "versao_parser": versao_parser(),
+    }
+
+
+def ler_diario(caminho):
+    """(cabeçalho, {arquivo: (hash, registros)}, bytes válidos) de um diário
+
+    A última linha pode ter ficado pela metade se o processo morreu durante a
+    gravação; ela e o que vier depois são descartados.
+    """
+    cabecalho = None
+    concluidos = {}
+    validos = 0
+    with open(caminho, "rb") as f:
+        for linha in f:
+            try:
+                entrada = json.loads(linha)
+            except ValueError:
+                break
+            if not linha.endswith(b"\n"):
+                break
+            if cabecalho is None:
+                cabecalho = entrada
+            else:
+                concluidos[entrada["Arquivo"]] = (entrada["Hash"], entrada["Registros"])
+            validos += len(linha)
+    return cabecalho, concluidos, validos
+
+
+def localizar_diario(pasta_saida, cabecalho):
+    """Diário interrompido mais recente com o mesmo cabeçalho (ou None)"""
+    for caminho in sorted(glob.glob(os.path.join(pasta_saida, PREFIXO_DIARIO + "*.ndjson")), reverse=True):
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                if json.loads(f.readline()) == cabecalho:
+                    return caminho
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+class DiarioExecucao:
+    """Registra os PDFs concluídos de uma execução, uma linha por PDF
+
+    Cada linha é descarregada no disco ao ser gravada (sem fsync): um erro ou
+    o fechamento da janela não perde o que já foi processado.
+    """
+
+    def __init__(self, caminho, cabecalho, retomar=False):
+        self.caminho = caminho
+        self.retomado = retomar
+        self.concluidos = {}
+        if retomar:
+            _, self.concluidos, validos = ler_diario(caminho)
+            self._arquivo = open(caminho, "r+b")
+            self._arquivo.truncate(validos)
+            self._arquivo.seek(validos)
+        else:
+            self._arquivo = open(caminho, "wb")
+            self._escrever(cabecalho)
+
+    @classmethod
+    def na_pasta(cls, pasta_saida, timestamp, cabecalho, retomar=False):
+        """Retoma o diário interrompido compatível, se pedido, ou começa um novo"""
+        if retomar:
+            existente = localizar_diario(pasta_saida, cabecalho)
+            if existente:
+                return cls(existente, cabecalho, retomar=True)
+        return cls(os.path.join(pasta_saida, f"{PREFIXO_DIARIO}{timestamp}.ndjson"), cabecalho)
+
+    @property
+    def timestamp(self):
+        """Timestamp da execução dona do diário (o dos outros arquivos dela)"""
+        return os.path.basename(self.caminho)[len(PREFIXO_DIARIO):-len(".ndjson")]
+
+    def _escrever(self, entrada):
+        self._arquivo.write(json.dumps(entrada, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._arquivo.flush()
+
+    def concluido(self, arquivo, hash_conteudo):
+        """Registros salvos de um PDF já concluído com o mesmo conteúdo (ou None)"""
+        salvo = self.concluidos.get(arquivo)
+        if salvo is None or salvo[0] != hash_conteudo:
+            return None
+        return salvo[1]
+
+    def registrar(self, arquivo, hash_conteudo, registros):
+        self._escrever({"Arquivo": arquivo, "Hash": hash_conteudo, "Registros": registros})
+
+    def fechar(self):
+        self._arquivo.close()
+
+    def remover(self):
+        self.fechar()
+        os.remove(self.caminho)
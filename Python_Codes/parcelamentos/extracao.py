@@ -0,0 +1,263 @@
+import os
+import re
+import time
+
+from parcelamentos.backends import BACKEND_PADRAO, abrir_documento
+from parcelamentos.normalizacao import normalizar_cnpj
+from parcelamentos.secoes import localizar_secoes
+
+PADRAO_VALOR = re.compile(r'[\d\.,]+(?=\s*(?:reais?|R\$|\b))')
+PADRAO_CNPJ = re.compile(r"CNPJ:\s*(\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2})")
+PADRAO_NOME = re.compile(r"CNPJ:\s*\d{2}\.\d{3}\.\d{3}.*?-\s*(.+)")
+PADRAO_MEI = re.compile(r"MEI - EM PARCELAMENTO\s+Parcelas em atraso\s*(\d+)")
+PADRAO_SN = re.compile(r"(SIMPLES NACIONAL.*EM PARCELAMENTO)(?:\s+Parcelas em atraso\s*(\d+))?")
+PADRAO_SIEFPAR_PENDENCIA = re.compile(r"Parcelamento:\s*(\d+)\s+Parcelas em Atraso:\s*(\d+)\s+Valor em Atraso:\s*([\d\.,]+)")
+PADRAO_SIEFPAR_SUSPENSO = re.compile(r"Parcelamento:\s*(\d+)\s+Valor Suspenso:\s*([\d\.,]+)")
+PADRAO_SISPAR = re.compile(r"(?:Conta\s*)?(\d+)\s+([^\n]+)\nModalidade:\s*([^\n]+)")
+PADRAO_SICOB = re.compile(r"Parcelamento:\s*(\d+-\d+)\s+Situação:\s*(\d+\s*-\s*.+)")
+PADRAO_DEBITO = re.compile(r"(\d{4}-\d{2}\s*-\s*.+?)\s+(\d{2}/\d{4})\s+([\d/]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+(.+)")
+
+MARCADORES_PARCSN = ("SIMPLES NACIONAL - EM PARCELAMENTO", "SIMPLES NACIONAL - RELP - EM PARCELAMENTO")
+
+
+def extrair_valor_monetario(texto):
+    """Extrai valores monetários do texto"""
+    matches = PADRAO_VALOR.findall(texto)
+    if matches:
+        # Pega o maior valor encontrado
+        valores = []
+        for match in matches:
+            try:
+                valor = float(match.replace('.', '').replace(',', '.'))
+                valores.append(valor)
+            except:
+                continue
+        return max(valores) if valores else 0
+    return 0
+
+
+def iterar_registros_texto(texto, nome_arquivo, incluir_detalhes_debitos=True):
+    """Aplica as regras de extração ao texto de um relatório, gerando um registro por parcelamento"""
+    # Extrair CNPJ e Nome da empresa
+    cnpj_match = PADRAO_CNPJ.search(texto)
+    cnpj_formatado = cnpj_match.group(1) if cnpj_match else "Não encontrado"
+    cnpj_numeros = normalizar_cnpj(cnpj_formatado)
+
+    # Extrair nome da empresa
+    nome_match = PADRAO_NOME.search(texto)
+    nome_empresa = nome_match.group(1).strip() if nome_match else "Não encontrado"
+
+    # Uma única passada localiza todas as seções; cada padrão roda só no seu trecho
+    secoes = localizar_secoes(texto)
+
+    # 1) PARCMEI - MEI
+    if "PARCMEI" in secoes:
+        mei_match = secoes.search(PADRAO_MEI, "PARCMEI")
+        if mei_match:
+            yield {
+                "CNPJ": cnpj_formatado,
+                "CNPJ_Numeros": cnpj_numeros,
+                "Nome_Empresa": nome_empresa,
+                "Tipo": "PARCMEI",
+                "Subtipo": "MEI",
+                "Conta": "-",
+                "Modalidade": "MEI - Parcelamento",
+                "Detalhes": f"Parcelas em atraso: {mei_match.group(1)}",
+                "Status": "Em Parcelamento",
+                "Valor": 0,
+                "Arquivo": nome_arquivo
+            }
+
+    # 2) PARCSN - Simples Nacional
+    if any(m in linha for linha in secoes.linhas_marcador("PARCSN") for m in MARCADORES_PARCSN):
+        sn_matches = secoes.findall(PADRAO_SN, "PARCSN")
+        for match in sn_matches:
+            titulo, parcelas = match
+            parcelas = parcelas if parcelas else "0"
+            yield {
+                "CNPJ": cnpj_formatado,
+                "CNPJ_Numeros": cnpj_numeros,
+                "Nome_Empresa": nome_empresa,
+                "Tipo": "PARCSN",
+                "Subtipo": "Simples Nacional",
+                "Conta": "-",
+                "Modalidade": titulo.strip(),
+                "Detalhes": f"Parcelas em atraso: {parcelas}",
+                "Status": "Em Parcelamento",
+                "Valor": 0,
+                "Arquivo": nome_arquivo
+            }
+
+    # 3) SIEFPAR - Parcelamento com Exigibilidade Suspensa (Receita Federal)
+    if "SIEFPAR_PENDENCIA" in secoes:
+        matches = secoes.findall(PADRAO_SIEFPAR_PENDENCIA, "SIEFPAR_PENDENCIA")
+        for conta, parcelas, valor_str in matches:
+            valor = extrair_valor_monetario(valor_str)
+            yield {
+                "Tipo": "SIEFPAR",
+                "Subtipo": "Receita Federal",
+                "Conta": conta.strip(),
+                "Modalidade": "Parcelamento Simplificado",
+                "Detalhes": f"Parcelas em atraso: {parcelas}, Valor em atraso: R$ {valor_str}",
+                "Status": "Exigibilidade Suspensa",
+                "Valor": valor,
+                "Arquivo": nome_arquivo,
+                "CNPJ": cnpj_formatado,
+                "CNPJ_Numeros": cnpj_numeros,
+                "Nome_Empresa": nome_empresa,
+            }
+
+    if "SIEFPAR_SUSPENSO" in secoes:
+        matches = secoes.findall(PADRAO_SIEFPAR_SUSPENSO, "SIEFPAR_SUSPENSO")
+        for conta, valor_str in matches:
+            valor = extrair_valor_monetario(valor_str)
+            yield {
+                "Tipo": "SIEFPAR",
+                "Subtipo": "Receita Federal",
+                "Conta": conta.strip(),
+                "Modalidade": "Parcelamento Simplificado",
+                "Detalhes": f"Valor suspenso: R$ {valor_str}",
+                "Status": "Exigibilidade Suspensa",
+                "Valor": valor,
+                "Arquivo": nome_arquivo,
+                "CNPJ": cnpj_formatado,
+                "CNPJ_Numeros": cnpj_numeros,
+                "Nome_Empresa": nome_empresa,
+            }
+
+    # 4) SISPAR - Parcelamento com Exigibilidade Suspensa (PGFN)
+    if "SISPAR" in secoes:
+        matches = secoes.findall(PADRAO_SISPAR, "SISPAR")
+
+        for conta, tipo_parcela, modalidade in matches:
+            yield {
+                "CNPJ": cnpj_formatado,
+                "CNPJ_Numeros": cnpj_numeros,
+                "Nome_Empresa": nome_empresa,
+                "Tipo": "SISPAR",
+                "Subtipo": "PGFN",
+                "Conta": conta.strip(),
+                "Modalidade": modalidade.strip(),
+                "Detalhes": tipo_parcela.strip(),
+                "Status": "Exigibilidade Suspensa",
+                "Valor": 0,
+                "Arquivo": nome_arquivo
+            }
+
+    # 5) SICOB - Débito com Exigibilidade Suspensa
+    if "SICOB" in secoes:
+        matches = secoes.findall(PADRAO_SICOB, "SICOB")
+
+        for parcela, situacao in matches:
+            yield {
+                "CNPJ": cnpj_formatado,
+                "CNPJ_Numeros": cnpj_numeros,
+                "Nome_Empresa": nome_empresa,
+                "Tipo": "SICOB",
+                "Subtipo": "Débito Suspenso",
+                "Conta": parcela.strip(),
+                "Modalidade": "RFB LEI 10522/02",
+                "Detalhes": f"Situação: {situacao}",
+                "Status": "Ativo/Em Dia",
+                "Valor": 0,
+                "Arquivo": nome_arquivo
+            }
+
+    # Incluir detalhes de débitos se solicitado
+    if incluir_detalhes_debitos and "DEBITO_SIEF" in secoes:
+        # Extrair débitos pendentes
+        debitos = secoes.findall(PADRAO_DEBITO, "DEBITO_SIEF")
+
+        for receita, periodo, dt_vcto, vl_orig, sdo_dev, multa, juros, sdo_cons, situacao in debitos[:5]:  # Limita a 5 débitos
+            valor_total = extrair_valor_monetario(sdo_cons) if sdo_cons else 0
+            yield {
+                "CNPJ": cnpj_formatado,
+                "CNPJ_Numeros": cnpj_numeros,
+                "Nome_Empresa": nome_empresa,
+                "Tipo": "DÉBITO",
+                "Subtipo": "Pendência",
+                "Conta": receita.strip(),
+                "Modalidade": f"Período: {periodo}",
+                "Detalhes": f"Situação: {situacao.strip()}",
+                "Status": "Devedor",
+                "Valor": valor_total,
+                "Arquivo": nome_arquivo
+            }
+
+
+def extrair_dados_pdf(caminho_pdf, incluir_detalhes_debitos=True, log=print, cnpjs_permitidos=None,
+                      backend=BACKEND_PADRAO, metricas=None, conteudo=None):
+    """Extrai os parcelamentos de um Relatório de Situação Fiscal em PDF
+
+    Com cnpjs_permitidos, lê primeiro só a página 1: se o CNPJ do cabeçalho não
+    estiver no conjunto, retorna None sem processar o restante do arquivo.
+    backend escolhe o motor de extração de texto (ver parcelamentos.backends).
+    metricas, se informado, recebe os segundos de abrir/texto/padroes, páginas,
+    tamanho e em "secoes" o tempo dos padrões por tipo de registro.
+    conteudo, se informado, são os bytes do PDF já lidos (o arquivo não é reaberto).
+    """
+    dados = []
+    nome_arquivo = os.path.basename(caminho_pdf)
+    if metricas is None:
+        metricas = {}
+    metricas.setdefault("secoes", {})
+
+    try:
+        metricas["Bytes"] = os.path.getsize(caminho_pdf) if conteudo is None else len(conteudo)
+        inicio = time.perf_counter()
+        with abrir_documento(caminho_pdf if conteudo is None else conteudo, backend) as documento:
+            total_paginas = metricas["Paginas"] = len(documento)
+            aberto = time.perf_counter()
+            metricas["abrir"] = aberto - inicio
+            primeira = documento.texto_pagina(0) if total_paginas else None
+
+            if cnpjs_permitidos is not None and primeira:
+                cnpj_match = PADRAO_CNPJ.search(primeira)
+                if cnpj_match and normalizar_cnpj(cnpj_match.group(1)) not in cnpjs_permitidos:
+                    metricas["texto"] = time.perf_counter() - aberto
+                    return None
+
+            textos = [primeira] + [documento.texto_pagina(i) for i in range(1, total_paginas)]
+            texto = "\n".join(t for t in textos if t)
+            metricas["texto"] = time.perf_counter() - aberto
+
+        # Registros gerados antes de um eventual erro são mantidos; o tempo até
+        # cada registro é somado ao seu tipo (inclui a busca das seções)
+        secoes = metricas["secoes"]
+        inicio = anterior = time.perf_counter()
+        try:
+            for registro in iterar_registros_texto(texto, nome_arquivo, incluir_detalhes_debitos):
+                dados.append(registro)
+                agora = time.perf_counter()
+                secoes[registro["Tipo"]] = secoes.get(registro["Tipo"], 0.0) + agora - anterior
+                anterior = agora
+        finally:
+            metricas["padroes"] = time.perf_counter() - inicio
+
+    except Exception as e:
+        log(f"Erro ao processar {nome_arquivo}: {str(e)}")
+
+    return dados
+
+
+# Filtro de CNPJs do processo filho, definido uma única vez pelo initializer do pool
+_cnpjs_permitidos_processo = None
+
+
+def definir_filtro_processo(cnpjs_permitidos):
+    """Initializer do ProcessPoolExecutor: evita serializar o filtro a cada tarefa"""
+    global _cnpjs_permitidos_processo
+    _cnpjs_permitidos_processo = cnpjs_permitidos
+
+
+def extrair_em_processo(caminho_pdf, incluir_detalhes_debitos=True, cnpjs_permitidos=None,
+                        backend=BACKEND_PADRAO, conteudo=None):
+    """Executa extrair_dados_pdf num processo filho e devolve (dados, mensagens de log, métricas)"""
+    if cnpjs_permitidos is None:
+        cnpjs_permitidos = _cnpjs_permitidos_processo
+    mensagens = []
+    metricas = {}
+    dados = extrair_dados_pdf(caminho_pdf, incluir_detalhes_debitos, log=mensagens.append,
+                              cnpjs_permitidos=cnpjs_permitidos, backend=backend, metricas=metricas,
+                              conteudo=conteudo)
+    return dados, mensagens, metricas
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import json
+import os
+import re
+
+from parcelamentos.cache import hash_arquivo
+
+PADRAO_CNPJ_ARQUIVO = re.compile(r"\d{14}")
+
+
+def cnpj_do_nome_arquivo(nome_arquivo):
+    """CNPJ a partir do nome do arquivo quando o RelaEcac não obteve o nome da empresa"""
+    base = os.path.splitext(os.path.basename(nome_arquivo))[0].strip()
+    return base if PADRAO_CNPJ_ARQUIVO.fullmatch(base) else None
+
+
+def indexar_json_responses(pasta_json):
+    """Mapeia o SHA-256 de cada PDF salvo em json_responses/<cnpj>.json para o CNPJ"""
+    indice = {}
+    for entrada in os.scandir(pasta_json):
+        cnpj = cnpj_do_nome_arquivo(entrada.name)
+        if not cnpj or not entrada.name.lower().endswith(".json"):
+            continue
+        try:
+            with open(entrada.path, encoding="utf-8") as f:
+                resposta = json.load(f)
+            dados = json.loads(resposta["dados"])
+            pdf = base64.b64decode(dados["pdf"])
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        indice[hashlib.sha256(pdf).hexdigest()] = cnpj
+    return indice
+
+
+def localizar_json_responses(pasta_pdfs):
+    """Pasta json_responses do RelaEcac: dentro ou ao lado da pasta de PDFs"""
+    for candidata in (os.path.join(pasta_pdfs, "json_responses"),
+                      os.path.join(os.path.dirname(os.path.abspath(pasta_pdfs)), "json_responses")):
+        if os.path.isdir(candidata):
+            return candidata
+    return None
+
+
+class PreFiltroCnpj:
+    """Decide, sem abrir o PDF, se um arquivo pertence às empresas filtradas
+
+    Usa o nome do arquivo (quando é o próprio CNPJ) ou o índice de json_responses.
+    Quando nenhum dos dois identifica o CNPJ, o arquivo segue para a extração,
+    que ainda confere o cabeçalho da primeira página.
+    """
+
+    def __init__(self, cnpjs_permitidos, pasta_json=None):
+        self.cnpjs_permitidos = cnpjs_permitidos
+        self.indice_json = indexar_json_responses(pasta_json) if pasta_json else {}
+
+    def usa_hash(self, caminho_pdf):
+        """Se a decisão sobre o arquivo depende do hash do conteúdo (índice json_responses)"""
+        return bool(self.indice_json) and cnpj_do_nome_arquivo(caminho_pdf) is None
+
+    def cnpj_conhecido(self, caminho_pdf, hash_pdf=None):
+        cnpj = cnpj_do_nome_arquivo(caminho_pdf)
+        if cnpj or not self.indice_json:
+            return cnpj
+        if hash_pdf is None:
+            hash_pdf = hash_arquivo(caminho_pdf)
+        return self.indice_json.get(hash_pdf)
+
+    def deve_processar(self, caminho_pdf, hash_pdf=None):
+        cnpj = self.cnpj_conhecido(caminho_pdf, hash_pdf)
+        return cnpj is None or cnpj in self.cnpjs_permitidos
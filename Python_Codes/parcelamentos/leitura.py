@@ -0,0 +1,68 @@
+"""Leitura antecipada dos PDFs em threads (pastas em rede)
+
+Enquanto um PDF é analisado, os próximos já estão sendo lidos para a memória:
+a espera pela rede (SMB) acontece em paralelo com o uso de CPU. A janela
+limita quantos arquivos ficam lidos à frente, e arquivos grandes demais não
+são bufferizados (são abertos pelo caminho, como antes).
+"""
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+JANELA_PADRAO = 4
+TAMANHO_MAXIMO_MB = 64
+
+
+def ler_arquivo(caminho, tamanho_maximo=TAMANHO_MAXIMO_MB * 1024 * 1024):
+    """(conteúdo, SHA-256) do arquivo; (None, None) se for grande demais ou ilegível"""
+    try:
+        if os.path.getsize(caminho) > tamanho_maximo:
+            return None, None
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+    except OSError:
+        return None, None
+    # hashlib libera o GIL em blocos grandes: o hash também sai da thread principal
+    return conteudo, hashlib.sha256(conteudo).hexdigest()
+
+
+class LeituraAntecipada:
+    """Lê os arquivos de itens em ordem, até janela arquivos à frente do consumo
+
+    itens produz (item, caminho) e pode ser um gerador (ex.: a busca dos PDFs):
+    ele só é avançado conforme a janela libera espaço. A iteração devolve
+    (item, conteúdo, hash); caminho None marca um item que não deve ser lido
+    (conteúdo e hash None). No máximo janela + 1 arquivos (de até
+    TAMANHO_MAXIMO_MB cada) ficam em memória ao mesmo tempo. leitor permite
+    trocar a função de leitura (ex.: disco lento simulado).
+    """
+
+    def __init__(self, itens, janela=JANELA_PADRAO, leitor=ler_arquivo):
+        self.itens = itens
+        self.janela = max(1, janela)
+        self.leitor = leitor
+        self.fila = deque()
+        self.executor = ThreadPoolExecutor(max_workers=self.janela, thread_name_prefix="leitura")
+
+    def _agendar(self, fonte):
+        """Agenda a leitura do próximo item da fonte; False quando ela acabou"""
+        for item, caminho in fonte:
+            futuro = self.executor.submit(self.leitor, caminho) if caminho is not None else None
+            self.fila.append((item, futuro))
+            return True
+        return False
+
+    def __iter__(self):
+        fonte = iter(self.itens)
+        while len(self.fila) < self.janela and self._agendar(fonte):
+            pass
+        while self.fila:
+            item, futuro = self.fila.popleft()
+            self._agendar(fonte)
+            conteudo, hash_conteudo = futuro.result() if futuro is not None else (None, None)
+            yield item, conteudo, hash_conteudo
+
+    def fechar(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.fila.clear()
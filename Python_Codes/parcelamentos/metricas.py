@@ -0,0 +1,118 @@
+"""Tempos por arquivo e por etapa de uma execução de processar_pasta
+
+Cada PDF ganha uma linha com a origem (extraído, cache, ignorado), páginas,
+tamanho e os segundos gastos em cada etapa; as etapas da execução inteira
+(Excel, Parquet...) ficam à parte. O resultado vai para um CSV (uma linha por
+PDF) e um JSON (resumo, histogramas e as linhas) ao lado do Excel.
+"""
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+# Etapas por arquivo, na ordem em que acontecem
+ETAPAS_ARQUIVO = ("leitura", "prefiltro", "cache", "abrir", "texto", "padroes", "filtro", "gravacao")
+COLUNAS_CSV = ("Arquivo", "Origem", "Paginas", "Bytes", "Registros", "Total") + ETAPAS_ARQUIVO
+# Limites superiores (segundos) das faixas dos histogramas; a última é "acima"
+FAIXAS_HISTOGRAMA = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+@contextmanager
+def cronometrar(destino, etapa):
+    """Soma em destino[etapa] os segundos gastos no bloco"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        destino[etapa] = destino.get(etapa, 0.0) + time.perf_counter() - inicio
+
+
+def rotulo_faixa(indice):
+    if indice == 0:
+        return f"< {FAIXAS_HISTOGRAMA[0] * 1000:.0f} ms"
+    if indice == len(FAIXAS_HISTOGRAMA):
+        return f"≥ {FAIXAS_HISTOGRAMA[-1]:g} s"
+    limite = FAIXAS_HISTOGRAMA[indice]
+    return f"< {limite * 1000:.0f} ms" if limite < 1 else f"< {limite:g} s"
+
+
+class MetricasExecucao:
+    """Linhas por PDF e tempos das etapas da execução"""
+
+    def __init__(self):
+        self.arquivos = []
+        self.etapas = {}
+
+    def arquivo(self, nome, origem="extraido"):
+        """Nova linha para um PDF; as etapas são preenchidas por quem processa"""
+        linha = {"Arquivo": nome, "Origem": origem, "Paginas": 0, "Bytes": 0, "Registros": 0, "secoes": {}}
+        self.arquivos.append(linha)
+        return linha
+
+    def etapa(self, nome):
+        """Cronometra uma etapa da execução inteira (ex.: with metricas.etapa("excel"))"""
+        return cronometrar(self.etapas, nome)
+
+    @staticmethod
+    def total(linha):
+        return sum(linha.get(etapa, 0.0) for etapa in ETAPAS_ARQUIVO)
+
+    def mais_lentos(self, quantidade=10):
+        return sorted(self.arquivos, key=self.total, reverse=True)[:quantidade]
+
+    def totais_por_etapa(self):
+        return {etapa: sum(linha.get(etapa, 0.0) for linha in self.arquivos) for etapa in ETAPAS_ARQUIVO}
+
+    def totais_por_secao(self):
+        """Segundos de padrões gastos em cada tipo de registro (somados entre os PDFs)"""
+        totais = {}
+        for linha in self.arquivos:
+            for secao, segundos in linha["secoes"].items():
+                totais[secao] = totais.get(secao, 0.0) + segundos
+        return totais
+
+    def histograma(self, etapa=None):
+        """Quantidade de PDFs por faixa de tempo (da etapa ou do total do arquivo)"""
+        contagem = [0] * (len(FAIXAS_HISTOGRAMA) + 1)
+        for linha in self.arquivos:
+            if linha["Origem"] == "ignorado":
+                continue
+            segundos = self.total(linha) if etapa is None else linha.get(etapa, 0.0)
+            indice = 0
+            while indice < len(FAIXAS_HISTOGRAMA) and segundos >= FAIXAS_HISTOGRAMA[indice]:
+                indice += 1
+            contagem[indice] += 1
+        return contagem
+
+    def resumo_log(self, log, quantidade=5):
+        """Tempo por etapa e os PDFs mais lentos, para o log da execução"""
+        partes = [f"{etapa} {segundos:.2f}s" for etapa, segundos in self.totais_por_etapa().items() if segundos]
+        partes += [f"{etapa} {segundos:.2f}s" for etapa, segundos in self.etapas.items()]
+        log(f"⏱️ Etapas: {', '.join(partes)}")
+        for linha in self.mais_lentos(quantidade):
+            log(f"   🐢 {linha['Arquivo']}: {self.total(linha):.2f}s, {linha['Paginas']} páginas ({linha['Origem']})")
+
+    def salvar(self, caminho_base):
+        """Grava caminho_base.csv e caminho_base.json; devolve o caminho do JSON"""
+        with open(caminho_base + ".csv", "w", newline="", encoding="utf-8-sig") as f:
+            escritor = csv.writer(f, delimiter=";")
+            escritor.writerow(COLUNAS_CSV)
+            for linha in self.arquivos:
+                escritor.writerow([linha["Arquivo"], linha["Origem"], linha["Paginas"], linha["Bytes"],
+                                   linha["Registros"], f"{self.total(linha):.4f}"]
+                                  + [f"{linha.get(etapa, 0.0):.4f}" for etapa in ETAPAS_ARQUIVO])
+
+        resumo = {
+            "etapas_execucao": self.etapas,
+            "etapas_arquivos": self.totais_por_etapa(),
+            "secoes": self.totais_por_secao(),
+            "histogramas": {
+                "faixas": [rotulo_faixa(i) for i in range(len(FAIXAS_HISTOGRAMA) + 1)],
+                "total": self.histograma(),
+                **{etapa: self.histograma(etapa) for etapa in ETAPAS_ARQUIVO},
+            },
+            "arquivos": [dict(linha, Total=self.total(linha)) for linha in self.arquivos],
+        }
+        with open(caminho_base + ".json", "w", encoding="utf-8") as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=1)
+        return caminho_base + ".json"
@@ -0,0 +1,482 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from datetime import datetime
+
+from parcelamentos.backends import BACKEND_PADRAO
+from parcelamentos.cache import CacheExtracao, hash_arquivo
+from parcelamentos.descoberta import PADROES_INCLUIR_PADRAO, DescobertaPdfs
+from parcelamentos.diario import DiarioExecucao, identificacao, localizar_diario
+from parcelamentos.extracao import definir_filtro_processo, extrair_em_processo
+from parcelamentos.filtro import PreFiltroCnpj, cnpj_do_nome_arquivo, localizar_json_responses
+from parcelamentos.leitura import JANELA_PADRAO, LeituraAntecipada
+from parcelamentos.metricas import MetricasExecucao, cronometrar
+from parcelamentos.planilhas import carregar_cnpjs_excel
+from parcelamentos.ordenacao import OrdenacaoExterna
+from parcelamentos.saida import (GravadorNdjson, colunas_ordenacao, gravar_planilha, ler_ndjson, salvar_colunar,
+                                 salvar_excel)
+
+# Mesmas chaves do arquivo gerado por "Salvar Configuração" na interface
+CONFIGURACAO_PADRAO = {
+    "pasta_pdfs": "",
+    "excel_empresas": "",
+    "pasta_saida": "",
+    "incluir_detalhes_debitos": True,
+    "agrupar_por_empresa": False,
+    "salvar_backup_json": True,
+    "salvar_parquet": False,
+    "processos_paralelos": 1,
+    "ignorar_cache": False,
+    "backend_extracao": BACKEND_PADRAO,
+    "tamanho_lote": 0,
+    "retomar": False,
+    "leitura_antecipada": JANELA_PADRAO,
+    "incluir_subpastas": True,
+    "padroes_incluir": ";".join(PADROES_INCLUIR_PADRAO),
+    "padroes_excluir": "",
+    "modificado_desde": "",
+    "modificado_ate": "",
+}
+
+# Extrações enviadas aos processos filhos sem resultado coletado, por processo
+EM_ANDAMENTO_POR_PROCESSO = 4
+
+
+class ResultadoProcessamento:
+    """Resumo de uma execução de processar_pasta"""
+
+    def __init__(self):
+        self.dados = []
+        self.total_registros = 0
+        self.empresas_filtradas = set()
+        self.total_arquivos = 0
+        self.ignorados = 0
+        self.caminho_excel = None
+        self.caminho_json = None
+        self.caminho_parquet = None
+        self.caminho_metricas = None
+        self.metricas = MetricasExecucao()
+        self.tempo_total = 0.0
+
+
+def carregar_empresas_filtradas(excel_empresas):
+    """Conjunto de CNPJs (só números) da coluna CNPJ do Excel de empresas"""
+    return carregar_cnpjs_excel(excel_empresas)
+
+
+def filtrar_dados_arquivo(dados, empresas_filtradas, log):
+    """Aplica o filtro de empresas aos registros de um PDF e registra no log"""
+    if empresas_filtradas:
+        dados_filtrados = [d for d in dados if d['CNPJ_Numeros'] in empresas_filtradas]
+        if dados_filtrados:
+            log(f"  ✅ {len(dados_filtrados)} parcelamentos encontrados (filtrado)")
+        return dados_filtrados
+    if dados:
+        log(f"  📊 {len(dados)} parcelamentos encontrados")
+    return dados
+
+
+def identificador_execucao(pasta_saida, inicio):
+    """Timestamp dos arquivos da execução, com sufixo se outra já o usou na pasta
+
+    Duas execuções no mesmo segundo acrescentariam registros ao mesmo NDJSON.
+    """
+    timestamp = base = inicio.strftime("%Y%m%d_%H%M%S")
+    sufixo = 1
+    while os.path.exists(os.path.join(pasta_saida, f"parcelamentos_backup_{timestamp}.ndjson")):
+        sufixo += 1
+        timestamp = f"{base}_{sufixo}"
+    return timestamp
+
+
+def abrir_cache(pasta_saida, log):
+    """Abre o cache de extração na pasta de saída (None se não for possível)"""
+    try:
+        return CacheExtracao.na_pasta(pasta_saida)
+    except Exception as e:
+        log(f"⚠️ Cache indisponível: {str(e)}")
+        return None
+
+
+def calcular_hash(caminho):
+    """Hash do conteúdo do PDF (None se não for possível ler)"""
+    try:
+        return hash_arquivo(caminho)
+    except OSError:
+        return None
+
+
+def consultar_cache(cache, caminho, incluir_debitos, backend, usar_cache, hash_conteudo=None):
+    """Retorna (chave, dados em cache ou None)"""
+    if cache is None:
+        return None, None
+    try:
+        chave = cache.chave(caminho, incluir_debitos, backend, hash_conteudo)
+    except OSError:
+        return None, None
+    if not usar_cache:
+        return chave, None
+    return chave, cache.obter(chave, os.path.basename(caminho))
+
+
+def registrar_extracao(cache, chave, dados, mensagens, log):
+    """Registra no log as mensagens da extração e guarda o resultado no cache"""
+    for mensagem in mensagens:
+        log(mensagem)
+    # Extrações com erro (ou puladas pelo pré-filtro) não são guardadas
+    if cache is not None and chave is not None and dados is not None and not mensagens:
+        cache.guardar(chave, dados)
+
+
+def registrar_metricas(linha, tempos, mensagens):
+    """Copia para a linha do PDF os tempos medidos na extração"""
+    linha.update(tempos)
+    if mensagens:
+        linha["Origem"] = "erro"
+
+
+def processar_pasta(configuracao, log=print, progresso=None, manter_dados=True, ao_gravar=None, executor=None):
+    """Processa todos os PDFs de uma pasta e grava os resultados, sem depender de interface
+
+    configuracao usa as chaves de CONFIGURACAO_PADRAO. progresso, se informado,
+    é chamado como progresso(concluidos, encontrados, arquivo) a cada PDF
+    concluído (encontrados cresce enquanto a busca dos PDFs não termina) e
+    ao_gravar(registros) a cada lote gravado no NDJSON, na ordem dos arquivos.
+    Os registros vão para o NDJSON da execução assim que extraídos; com
+    manter_dados=False eles não são acumulados em memória (resultado.dados vazio):
+    com tamanho_lote, a memória da execução fica constante. Quem recebe ao_gravar
+    decide o que guardar; a interface guarda todos os registros para a tabela e
+    os filtros (em ArmazemResultados, compacto), então lá a memória ainda cresce
+    com o número de registros. A memória constante vale para a CLI e o serviço.
+    Cada PDF concluído vai também para o diário da execução; com "retomar" os
+    PDFs já concluídos por uma execução interrompida não são processados de novo.
+    executor, se informado, é um ProcessPoolExecutor já aberto (ex.: o do serviço
+    residente) usado com processos_paralelos > 1; ele não é encerrado ao final.
+    """
+    config = dict(CONFIGURACAO_PADRAO, **configuracao)
+    pasta_pdfs = config["pasta_pdfs"]
+    pasta_saida = config["pasta_saida"]
+    incluir_debitos = config["incluir_detalhes_debitos"]
+    backend = config["backend_extracao"] or BACKEND_PADRAO
+    processos = max(1, int(config["processos_paralelos"] or 1))
+
+    resultado = ResultadoProcessamento()
+    metricas = resultado.metricas
+    inicio = datetime.now()
+    timestamp = identificador_execucao(pasta_saida, inicio)
+
+    # Carrega lista de empresas se fornecida
+    if config["excel_empresas"]:
+        try:
+            with metricas.etapa("empresas"):
+                resultado.empresas_filtradas = carregar_empresas_filtradas(config["excel_empresas"])
+            log(f"✅ Carregadas {len(resultado.empresas_filtradas)} empresas do Excel")
+        except Exception as e:
+            log(f"⚠️ Erro ao carregar Excel: {str(e)}")
+    empresas_filtradas = resultado.empresas_filtradas
+
+    # Pré-filtro: descarta PDFs de empresas fora do Excel antes da extração completa
+    cnpjs_permitidos = None
+    prefiltro = None
+    if empresas_filtradas:
+        cnpjs_permitidos = frozenset(empresas_filtradas)
+        pasta_json = localizar_json_responses(pasta_pdfs)
+        prefiltro = PreFiltroCnpj(cnpjs_permitidos, pasta_json)
+        if pasta_json:
+            log(f"🔎 Pré-filtro: {len(prefiltro.indice_json)} PDFs indexados em {pasta_json}")
+
+    # Antes de criar qualquer arquivo na saída (a busca só lê a pasta depois)
+    if not os.path.isdir(pasta_pdfs):
+        raise FileNotFoundError(f"Pasta de PDFs não encontrada: {pasta_pdfs}")
+
+    # Busca dos PDFs: cada arquivo é processado assim que encontrado, sem
+    # esperar a listagem da árvore inteira
+    descoberta = DescobertaPdfs(pasta_pdfs, config["incluir_subpastas"], config["padroes_incluir"],
+                                config["padroes_excluir"], config["modificado_desde"], config["modificado_ate"],
+                                ao_erro=lambda caminho, e: log(f"⚠️ Erro ao ler {caminho}: {str(e)}"))
+    arquivos_pdf = []
+    linhas_metricas = []
+
+    log(f"📁 Procurando PDFs em {pasta_pdfs}{' (com subpastas)' if config['incluir_subpastas'] else ''}...")
+    log(f"🔧 Motor de extração: {backend}")
+
+    cache = abrir_cache(pasta_saida, log)
+    usar_cache = cache is not None and not config["ignorar_cache"]
+
+    cabecalho_diario = identificacao(pasta_pdfs, incluir_debitos, backend, config["excel_empresas"])
+    interrompido = localizar_diario(pasta_saida, cabecalho_diario)
+    diario = DiarioExecucao.na_pasta(pasta_saida, timestamp, cabecalho_diario, config["retomar"])
+    if diario.retomado:
+        # Mesmos nomes de arquivo da execução interrompida: o NDJSON parcial
+        # dela é regravado por inteiro (os PDFs retomados vêm do diário)
+        timestamp = diario.timestamp
+        log(f"♻️ Retomando execução interrompida: {len(diario.concluidos)} PDFs já concluídos "
+            f"({os.path.basename(diario.caminho)})")
+    elif interrompido and not config["retomar"]:
+        log("💡 Há uma execução interrompida desta pasta: marque \"retomar\" para reaproveitá-la")
+
+    caminho_ndjson = os.path.join(pasta_saida, f"parcelamentos_backup_{timestamp}.ndjson")
+    gravador = GravadorNdjson(caminho_ndjson)
+
+    # Resultados são gravados na ordem original dos arquivos para que a saída
+    # não dependa da ordem de conclusão; só os que chegam adiantados esperam
+    aguardando_gravacao = {}
+    proximo_gravar = 0
+    concluidos = 0
+
+    def registrar_concluido(i, dados, origem="", hash_conteudo=None):
+        nonlocal concluidos, proximo_gravar
+        concluidos += 1
+        arquivo = arquivos_pdf[i]
+        if dados is None:
+            resultado.ignorados += 1
+            linhas_metricas[i]["Origem"] = "ignorado"
+            origem = " ⏭️ ignorado (CNPJ fora do filtro)"
+            dados = []
+        else:
+            # A extração e o cache só conhecem o nome do PDF: com subpastas, o
+            # caminho relativo é o que distingue (e permite abrir) cada arquivo
+            for registro in dados:
+                registro["Arquivo"] = arquivo
+            if hash_conteudo is not None:
+                with cronometrar(linhas_metricas[i], "gravacao"):
+                    diario.registrar(arquivo, hash_conteudo, dados)
+        # "+" enquanto a busca ainda não terminou: o total pode crescer
+        encontrados = f"{descoberta.encontrados}{'' if descoberta.concluida else '+'}"
+        log(f"[{concluidos}/{encontrados}] {arquivo}{origem}")
+        with cronometrar(linhas_metricas[i], "filtro"):
+            aguardando_gravacao[i] = filtrar_dados_arquivo(dados, empresas_filtradas, log)
+        linhas_metricas[i]["Registros"] = len(aguardando_gravacao[i])
+        while proximo_gravar in aguardando_gravacao:
+            dados = aguardando_gravacao.pop(proximo_gravar)
+            with cronometrar(linhas_metricas[proximo_gravar], "gravacao"):
+                gravador.gravar(dados)
+                if ordenacao is not None:
+                    ordenacao.acrescentar(dados)
+                if ao_gravar is not None and dados:
+                    ao_gravar(dados)
+            if manter_dados:
+                resultado.dados.extend(dados)
+            proximo_gravar += 1
+
+        if progresso is not None:
+            progresso(concluidos, descoberta.encontrados, arquivo)
+
+    # Modo em lotes: os registros de cada lote são ordenados e guardados no
+    # disco, e o Excel sai da intercalação dos lotes (memória constante)
+    tamanho_lote = max(0, int(config["tamanho_lote"] or 0))
+    ordenacao = None
+    if tamanho_lote:
+        ordenacao = OrdenacaoExterna(pasta_saida, colunas_ordenacao(config["agrupar_por_empresa"]))
+        log(f"📦 Processamento em lotes de {tamanho_lote} PDFs")
+
+    # Pool próprio só é criado (e encerrado) quando não vem um de fora; num
+    # pool de fora o filtro de CNPJs vai junto de cada PDF
+    executor_proprio = executor is None
+    cnpjs_por_tarefa = None if executor_proprio else cnpjs_permitidos
+
+    def itens_encontrados():
+        """((índice, caminho), caminho a ler) de cada PDF encontrado pela busca"""
+        for i, (arquivo, caminho) in enumerate(descoberta):
+            arquivos_pdf.append(arquivo)
+            linhas_metricas.append(metricas.arquivo(arquivo))
+            # PDFs descartados pelo nome no pré-filtro não precisam ser lidos
+            cnpj = cnpj_do_nome_arquivo(arquivo) if prefiltro is not None else None
+            descartado = cnpj is not None and cnpj not in cnpjs_permitidos and arquivo not in diario.concluidos
+            yield (i, caminho), None if descartado else caminho
+
+    # Leitura antecipada: os próximos PDFs são lidos em threads enquanto o
+    # atual é analisado
+    janela_leitura = max(0, int(config["leitura_antecipada"] or 0))
+    leitura = None
+    if janela_leitura:
+        leitura = LeituraAntecipada(itens_encontrados(), janela_leitura)
+        fonte = iter(leitura)
+    else:
+        fonte = ((item, None, None) for item, _ in itens_encontrados())
+
+    # Extrações em andamento nos processos filhos: (índice, chave do cache, hash)
+    futuros = {}
+
+    def coletar(prontos):
+        for futuro in prontos:
+            i, chave, hash_conteudo = futuros.pop(futuro)
+            try:
+                dados, mensagens, tempos = futuro.result()
+            except Exception as e:
+                dados, mensagens, tempos = [], [f"Erro ao processar {arquivos_pdf[i]}: {str(e)}"], {}
+            registrar_metricas(linhas_metricas[i], tempos, mensagens)
+            registrar_extracao(cache, chave, dados, mensagens, log)
+            registrar_concluido(i, dados, hash_conteudo=None if mensagens else hash_conteudo)
+
+    def processar_arquivo(i, caminho, conteudo, hash_conteudo):
+        nonlocal executor
+        arquivo = arquivos_pdf[i]
+        linha = linhas_metricas[i]
+        tamanho = len(conteudo) if conteudo is not None else None
+
+        if arquivo in diario.concluidos:
+            with cronometrar(linha, "cache"):
+                hash_conteudo = hash_conteudo or calcular_hash(caminho)
+                dados = diario.concluido(arquivo, hash_conteudo)
+            if dados is not None:
+                linha["Origem"] = "retomado"
+                linha["Bytes"] = tamanho or os.path.getsize(caminho)
+                registrar_concluido(i, dados, " (retomado)")
+                return
+
+        if prefiltro is not None:
+            with cronometrar(linha, "prefiltro"):
+                # Sem leitura antecipada o hash é calculado aqui, uma só vez: o
+                # mesmo serve ao pré-filtro, ao cache e ao diário
+                if hash_conteudo is None and prefiltro.usa_hash(caminho):
+                    hash_conteudo = calcular_hash(caminho)
+                processar = prefiltro.deve_processar(caminho, hash_conteudo)
+            if not processar:
+                registrar_concluido(i, None)
+                return
+
+        with cronometrar(linha, "cache"):
+            # Um só hash do conteúdo serve ao cache e ao diário
+            hash_conteudo = hash_conteudo or calcular_hash(caminho)
+            chave, dados = consultar_cache(cache, caminho, incluir_debitos, backend, usar_cache, hash_conteudo)
+        if dados is not None:
+            linha["Origem"] = "cache"
+            linha["Bytes"] = tamanho or os.path.getsize(caminho)
+            registrar_concluido(i, dados, " (cache)", hash_conteudo)
+        elif processos > 1:
+            if executor is None:
+                log(f"⚙️ Modo paralelo: {processos} processos")
+                executor = ProcessPoolExecutor(max_workers=processos, initializer=definir_filtro_processo,
+                                               initargs=(cnpjs_permitidos,))
+            # Os processos filhos abrem o PDF pelo caminho; no limite de extrações
+            # em andamento, espera a próxima terminar antes de enviar outra
+            futuros[executor.submit(extrair_em_processo, caminho, incluir_debitos, cnpjs_por_tarefa, backend)] = \
+                (i, chave, hash_conteudo)
+            if len(futuros) >= processos * EM_ANDAMENTO_POR_PROCESSO:
+                prontos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+                coletar(prontos)
+        else:
+            dados, mensagens, tempos = extrair_em_processo(caminho, incluir_debitos, cnpjs_permitidos, backend,
+                                                           conteudo)
+            registrar_metricas(linha, tempos, mensagens)
+            registrar_extracao(cache, chave, dados, mensagens, log)
+            # PDFs com erro ficam fora do diário e são tentados de novo ao retomar
+            registrar_concluido(i, dados, hash_conteudo=None if mensagens else hash_conteudo)
+
+    lotes = 0
+
+    def concluir_lote():
+        """Espera as extrações em andamento; no modo em lotes, leva o lote ao disco"""
+        nonlocal lotes
+        coletar(as_completed(list(futuros)))
+        # Todo o lote já foi gravado em ordem: vai para o disco já ordenado
+        if ordenacao is not None and concluidos > lotes * tamanho_lote:
+            ordenacao.fechar_lote()
+            lotes += 1
+            log(f"📦 Lote {lotes}: {concluidos} PDFs, {ordenacao.total} registros no disco")
+
+    try:
+        while True:
+            # Espera pela busca e, com leitura antecipada, pelo conteúdo do PDF
+            inicio_espera = time.perf_counter()
+            try:
+                (i, caminho), conteudo, hash_conteudo = next(fonte)
+            except StopIteration:
+                break
+            linhas_metricas[i]["leitura"] = time.perf_counter() - inicio_espera
+
+            processar_arquivo(i, caminho, conteudo, hash_conteudo)
+            # Extrações já terminadas são gravadas a cada PDF: os resultados
+            # (cache, retomados) que chegam depois delas não esperam o fim do lote
+            if futuros:
+                prontos, _ = wait(futuros, timeout=0)
+                coletar(prontos)
+            if tamanho_lote and (i + 1) % tamanho_lote == 0:
+                concluir_lote()
+        concluir_lote()
+    except BaseException:
+        if ordenacao is not None:
+            ordenacao.remover()
+        raise
+    finally:
+        fonte.close()
+        if leitura is not None:
+            leitura.fechar()
+        if executor is not None and executor_proprio:
+            executor.shutdown()
+        gravador.fechar()
+        diario.fechar()
+        if cache is not None:
+            # Fecha (e grava) o cache antes do log: no serviço, log escreve para
+            # um cliente que pode já ter desconectado
+            cache.fechar()
+            log(f"🗄️ Cache: {cache.acertos} reaproveitados, {cache.falhas} extraídos")
+
+    resultado.total_arquivos = len(arquivos_pdf)
+    log(f"📁 {resultado.total_arquivos} PDFs encontrados em {descoberta.pastas} pastas")
+    if prefiltro is not None:
+        log(f"⏭️ {resultado.ignorados} PDFs ignorados pelo pré-filtro de CNPJ")
+
+    resultado.total_registros = gravador.total
+
+    # Processar e salvar resultados: o Excel é montado a partir do NDJSON
+    if resultado.total_registros:
+        resultado.caminho_excel = os.path.join(pasta_saida, f"parcelamentos_detalhados_{timestamp}.xlsx")
+        with metricas.etapa("excel"):
+            if ordenacao is not None:
+                try:
+                    _, total_empresas = gravar_planilha(resultado.caminho_excel, list(ordenacao.colunas),
+                                                        ordenacao.registros())
+                finally:
+                    ordenacao.remover()
+            else:
+                _, total_empresas = salvar_excel(caminho_ndjson, resultado.caminho_excel,
+                                                 config["agrupar_por_empresa"])
+
+        # Cópia colunar (tipada) para análises fora do Excel
+        if config["salvar_parquet"]:
+            caminho_parquet = os.path.join(pasta_saida, f"parcelamentos_detalhados_{timestamp}.parquet")
+            try:
+                with metricas.etapa("parquet"):
+                    salvar_colunar(ler_ndjson(caminho_ndjson), caminho_parquet)
+                resultado.caminho_parquet = caminho_parquet
+            except Exception as e:
+                log(f"⚠️ Erro ao salvar Parquet: {str(e)}")
+
+        # Salvar backup JSON se solicitado
+        if config["salvar_backup_json"]:
+            resultado.caminho_json = caminho_ndjson
+        else:
+            os.remove(caminho_ndjson)
+
+        fim = datetime.now()
+        resultado.tempo_total = (fim - inicio).total_seconds()
+
+        log(f"\n✅ PROCESSAMENTO CONCLUÍDO!")
+        log(f"⏱️ Tempo total: {resultado.tempo_total:.1f} segundos")
+        log(f"📊 Total de parcelamentos: {resultado.total_registros}")
+        log(f"🏢 Empresas processadas: {total_empresas}")
+        log(f"💾 Arquivo salvo: {resultado.caminho_excel}")
+        if resultado.caminho_parquet:
+            log(f"💾 Parquet salvo: {resultado.caminho_parquet}")
+    else:
+        os.remove(caminho_ndjson)
+        if ordenacao is not None:
+            ordenacao.remover()
+        resultado.tempo_total = (datetime.now() - inicio).total_seconds()
+        log(f"\n⚠️ Nenhum parcelamento foi encontrado nos PDFs!")
+
+    # Resultados completos gravados: a execução não precisa mais ser retomada
+    os.remove(diario.caminho)
+
+    # Tempos por PDF e por etapa, ao lado do Excel
+    if arquivos_pdf:
+        metricas.resumo_log(log)
+        try:
+            resultado.caminho_metricas = metricas.salvar(os.path.join(pasta_saida, f"metricas_{timestamp}"))
+            log(f"📈 Métricas salvas: {resultado.caminho_metricas} (e .csv)")
+        except OSError as e:
+            log(f"⚠️ Erro ao salvar métricas: {str(e)}")
+
+    return resultado
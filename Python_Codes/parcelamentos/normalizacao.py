@@ -0,0 +1,96 @@
+"""Normalização de nomes de empresa e CNPJs, por valor e por coluna inteira
+
+As funções de coluna normalizam só os valores distintos (pd.factorize) e
+espalham o resultado com numpy; os valores ficam num cache LRU limitado, então
+os mesmos nomes/CNPJs vindos de planilhas diferentes não são refeitos.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+TAMANHO_CACHE = 1 << 16
+TAMANHO_CNPJ = 14
+
+_NAO_DIGITOS = re.compile(r"\D")
+_ESPACOS = re.compile(r"\s+")
+
+
+def _tabela_latin():
+    """Atalho para os acentos do Latin-1/Latin Extended-A (os dos cadastros)"""
+    tabela = {}
+    for codigo in range(0xC0, 0x180):
+        base = "".join(c for c in unicodedata.normalize("NFKD", chr(codigo)) if not unicodedata.combining(c))
+        if base != chr(codigo):
+            tabela[codigo] = base
+    return tabela
+
+
+_LATIN_SEM_ACENTO = _tabela_latin()
+
+
+def remover_acentos(texto):
+    """Remove diacríticos de qualquer letra: decompõe (NFKD) e descarta as marcas combinantes"""
+    if texto.isascii():
+        return texto
+    texto = texto.translate(_LATIN_SEM_ACENTO)
+    if texto.isascii():
+        return texto
+    return "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+
+
+def _vazio(valor):
+    return valor is None or (isinstance(valor, float) and valor != valor)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _normalizar_nome_texto(texto):
+    nome = remover_acentos(texto.strip().lower())
+    return _ESPACOS.sub(" ", nome)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _normalizar_cnpj_texto(texto, completar_zeros):
+    digitos = _NAO_DIGITOS.sub("", texto)
+    if completar_zeros and digitos and len(digitos) < TAMANHO_CNPJ:
+        digitos = digitos.zfill(TAMANHO_CNPJ)
+    return digitos
+
+
+def normalizar_nome(valor):
+    """Minúsculas, sem acentos e com espaços simples; vazio/NaN vira ''"""
+    if _vazio(valor):
+        return ""
+    return _normalizar_nome_texto(str(valor))
+
+
+def normalizar_cnpj(valor, completar_zeros=False):
+    """Só os dígitos; com completar_zeros, completa com zeros à esquerda até 14"""
+    if _vazio(valor) or valor == "":
+        return ""
+    return _normalizar_cnpj_texto(str(valor), completar_zeros)
+
+
+def _normalizar_coluna(serie, texto_cacheado, *args):
+    """Normaliza uma vez cada valor distinto e monta a coluna resultante"""
+    # Import local: a extração (processos filhos) usa só as funções por valor
+    import numpy as np
+    import pandas as pd
+
+    serie = pd.Series(serie)
+    codigos, distintos = pd.factorize(serie)
+    # Com mais distintos que o cache, ele só seria descartado: usa a função direta
+    funcao = texto_cacheado.__wrapped__ if len(distintos) > TAMANHO_CACHE else texto_cacheado
+    normalizados = np.empty(len(distintos) + 1, dtype=object)
+    normalizados[:-1] = [funcao(str(valor), *args) for valor in distintos]
+    normalizados[-1] = ""  # código -1 (vazio/NaN) aponta para a última posição
+    return pd.Series(normalizados[codigos], index=serie.index, dtype=object)
+
+
+def normalizar_nome_coluna(serie):
+    """normalizar_nome para uma coluna inteira (Series ou lista)"""
+    return _normalizar_coluna(serie, _normalizar_nome_texto)
+
+
+def normalizar_cnpj_coluna(serie, completar_zeros=False):
+    """normalizar_cnpj para uma coluna inteira (Series ou lista)"""
+    return _normalizar_coluna(serie, _normalizar_cnpj_texto, completar_zeros)
@@ -0,0 +1,80 @@
+"""Ordenação externa dos registros: lotes ordenados no disco e intercalação
+
+Usada no processamento em lotes: cada lote de PDFs vira um arquivo NDJSON já
+ordenado e, no fim, os arquivos são intercalados com heapq.merge. Em memória
+fica só o lote atual e uma linha de cada arquivo durante a intercalação.
+"""
+import heapq
+import json
+import os
+import shutil
+import tempfile
+
+from parcelamentos.saida import ler_ndjson
+
+# Acima disto a intercalação é feita em mais de uma passada (arquivos abertos ao mesmo tempo)
+LIMITE_ARQUIVOS_ABERTOS = 64
+
+
+class OrdenacaoExterna:
+    """Ordena registros pelas colunas informadas sem mantê-los todos em memória
+
+    A ordem é a mesma de um sort estável (ausentes no final), então empates
+    mantêm a ordem de chegada, como em salvar_excel.
+    """
+
+    def __init__(self, pasta, colunas_ordem, limite_arquivos=LIMITE_ARQUIVOS_ABERTOS):
+        self.pasta = tempfile.mkdtemp(prefix="lotes_", dir=pasta)
+        self.colunas_ordem = colunas_ordem
+        self.limite_arquivos = max(2, limite_arquivos)
+        self.lote = []
+        self.arquivos = []
+        self.gravados = 0
+        self.colunas = {}
+        self.total = 0
+
+    def chave(self, registro):
+        return tuple((registro.get(c) is None, registro.get(c) or "") for c in self.colunas_ordem)
+
+    def acrescentar(self, registros):
+        for registro in registros:
+            for coluna in registro:
+                if coluna not in self.colunas:
+                    self.colunas[coluna] = None
+        self.lote.extend(registros)
+        self.total += len(registros)
+
+    def _gravar(self, registros):
+        caminho = os.path.join(self.pasta, f"lote_{self.gravados:06d}.ndjson")
+        self.gravados += 1
+        with open(caminho, "w", encoding="utf-8") as f:
+            for registro in registros:
+                f.write(json.dumps(registro, ensure_ascii=False))
+                f.write("\n")
+        return caminho
+
+    def fechar_lote(self):
+        """Grava o lote atual ordenado no disco e libera a memória"""
+        if self.lote:
+            self.lote.sort(key=self.chave)
+            self.arquivos.append(self._gravar(self.lote))
+            self.lote = []
+
+    def _intercalar(self, arquivos):
+        return heapq.merge(*(ler_ndjson(caminho) for caminho in arquivos), key=self.chave)
+
+    def registros(self):
+        """Todos os registros em ordem, lidos dos lotes"""
+        self.fechar_lote()
+        # Grupos de lotes vizinhos: a ordem entre os lotes (e a estabilidade) se mantém
+        while len(self.arquivos) > self.limite_arquivos:
+            grupos = [self.arquivos[i:i + self.limite_arquivos]
+                      for i in range(0, len(self.arquivos), self.limite_arquivos)]
+            self.arquivos = [self._gravar(self._intercalar(grupo)) for grupo in grupos]
+            for grupo in grupos:
+                for caminho in grupo:
+                    os.remove(caminho)
+        return self._intercalar(self.arquivos)
+
+    def remover(self):
+        shutil.rmtree(self.pasta, ignore_errors=True)
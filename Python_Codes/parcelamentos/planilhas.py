@@ -0,0 +1,143 @@
+"""Leitura das planilhas de empresas: só as colunas usadas, com snapshot em disco
+
+As listas de empresas (exportações do ERP) mudam pouco entre execuções. A
+primeira leitura percorre a planilha em modo read-only do openpyxl, guarda só
+as colunas pedidas e grava um snapshot JSON identificado por caminho, mtime e
+tamanho; as leituras seguintes do mesmo arquivo só carregam o snapshot.
+"""
+import hashlib
+import json
+import os
+
+from openpyxl import load_workbook
+
+from parcelamentos.normalizacao import normalizar_cnpj_coluna
+
+PASTA_SNAPSHOTS = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"),
+                               "ReportX", "planilhas")
+# Muda quando a conversão dos valores mudar, invalidando os snapshots antigos
+VERSAO_SNAPSHOT = 1
+EXTENSOES_OPENPYXL = (".xlsx", ".xlsm")
+
+
+def _texto(valor):
+    """Valor da célula como o pd.read_excel(dtype=str) devolveria"""
+    if valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, float) and valor.is_integer():
+        # CNPJ/código digitado como número: sem o ".0"
+        return str(int(valor))
+    return str(valor)
+
+
+def _ler_openpyxl(caminho, colunas, cabecalho):
+    """{coluna: [valores]} lendo linha a linha só as colunas necessárias"""
+    livro = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        planilha = livro.worksheets[0]
+        linhas = planilha.iter_rows(values_only=True)
+        if cabecalho:
+            nomes = next(linhas, ())
+            indices = {coluna: nomes.index(coluna) for coluna in colunas if coluna in nomes}
+        else:
+            indices = {coluna: coluna for coluna in colunas}
+        if not indices:
+            return {}
+
+        ultima = max(indices.values()) + 1
+        dados = {coluna: [] for coluna in indices}
+        for linha in planilha.iter_rows(min_row=2 if cabecalho else 1, max_col=ultima, values_only=True):
+            for coluna, indice in indices.items():
+                dados[coluna].append(_texto(linha[indice]) if indice < len(linha) else None)
+    finally:
+        livro.close()
+
+    # Como no pandas: sem as linhas vazias do final nem as colunas sem nenhum valor
+    tamanho = max((max((i + 1 for i, v in enumerate(valores) if v is not None), default=0)
+                   for valores in dados.values()), default=0)
+    return {coluna: valores[:tamanho] for coluna, valores in dados.items() if any(v is not None for v in valores)}
+
+
+def _ler_pandas(caminho, colunas, cabecalho):
+    """Formatos que o openpyxl não lê (.xls): pandas com usecols"""
+    import pandas as pd
+
+    if cabecalho:
+        df = pd.read_excel(caminho, dtype=str, usecols=lambda nome: nome in colunas)
+    else:
+        df = pd.read_excel(caminho, dtype=str, header=None)
+        df = df[[c for c in colunas if c in df.columns]]
+    return {coluna: [None if pd.isna(v) else v for v in df[coluna]] for coluna in df.columns}
+
+
+def _caminho_snapshot(caminho, colunas, cabecalho, pasta_snapshots):
+    """(arquivo do snapshot, prefixo dos snapshots do mesmo Excel)"""
+    absoluto = os.path.abspath(caminho)
+    estado = os.stat(absoluto)
+    prefixo = hashlib.sha256(absoluto.encode("utf-8")).hexdigest()[:16]
+    chave = json.dumps([estado.st_mtime_ns, estado.st_size, list(colunas), cabecalho, VERSAO_SNAPSHOT])
+    return os.path.join(pasta_snapshots, f"{prefixo}_{hashlib.sha256(chave.encode('utf-8')).hexdigest()[:16]}.json"), prefixo
+
+
+def _gravar_snapshot(arquivo, prefixo, dados):
+    pasta = os.path.dirname(arquivo)
+    os.makedirs(pasta, exist_ok=True)
+    temporario = f"{arquivo}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporario, arquivo)
+    # Versões anteriores do mesmo Excel não servem mais
+    for entrada in os.scandir(pasta):
+        if entrada.name.startswith(prefixo + "_") and entrada.path != arquivo:
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                pass
+
+
+def ler_colunas_excel(caminho, colunas, cabecalho=True, pasta_snapshots=PASTA_SNAPSHOTS):
+    """DataFrame (texto) com só as colunas pedidas da primeira aba
+
+    Com cabecalho=True, colunas são nomes da primeira linha; com False, índices
+    a partir de 0 (A = 0) e o índice do DataFrame é a linha do Excel menos 1.
+    Colunas ausentes ou vazias não aparecem no resultado. pasta_snapshots=None
+    desliga o snapshot.
+    """
+    # Import local: só quem lê planilhas paga o import do pandas (não a abertura da GUI)
+    import pandas as pd
+
+    colunas = list(colunas)
+    arquivo = prefixo = None
+    if pasta_snapshots:
+        arquivo, prefixo = _caminho_snapshot(caminho, colunas, cabecalho, pasta_snapshots)
+        try:
+            with open(arquivo, encoding="utf-8") as f:
+                dados = json.load(f)
+            # JSON só tem chaves texto: índices voltam a ser números
+            return pd.DataFrame({(coluna if cabecalho else int(coluna)): valores for coluna, valores in dados.items()},
+                                dtype=object)
+        except (OSError, ValueError):
+            pass
+
+    if caminho.lower().endswith(EXTENSOES_OPENPYXL):
+        dados = _ler_openpyxl(caminho, colunas, cabecalho)
+    else:
+        dados = _ler_pandas(caminho, colunas, cabecalho)
+
+    if arquivo:
+        try:
+            _gravar_snapshot(arquivo, prefixo, dados)
+        except OSError:
+            pass  # Sem snapshot a próxima leitura só fica mais lenta
+    return pd.DataFrame(dados, dtype=object)
+
+
+def carregar_cnpjs_excel(caminho, coluna="CNPJ", pasta_snapshots=PASTA_SNAPSHOTS):
+    """Conjunto de CNPJs (só números, 14 dígitos) da coluna informada; vazio se ela não existir"""
+    df = ler_colunas_excel(caminho, [coluna], pasta_snapshots=pasta_snapshots)
+    if coluna not in df.columns:
+        return set()
+    # CNPJ gravado como número perde os zeros à esquerda: completa até 14 dígitos
+    cnpjs = set(normalizar_cnpj_coluna(df[coluna], completar_zeros=True))
+    cnpjs.discard("")
+    return cnpjs
@@ -0,0 +1,358 @@
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+from parcelamentos.normalizacao import normalizar_nome
+
+# Colunas com índice invertido (valor -> posições) para filtros por igualdade
+COLUNAS_INDEXADAS = ("Tipo", "Status", "CNPJ_Numeros")
+TAMANHO_NGRAMA = 3
+
+# Representação compacta: campos iguais em todos os registros de um PDF ficam
+# juntos num cabeçalho compartilhado; rótulos repetidos viram códigos
+CAMPOS = ("CNPJ", "CNPJ_Numeros", "Nome_Empresa", "Tipo", "Subtipo", "Conta",
+          "Modalidade", "Detalhes", "Status", "Valor", "Arquivo")
+CAMPOS_CABECALHO = ("CNPJ", "CNPJ_Numeros", "Nome_Empresa", "Arquivo")
+CAMPOS_CATEGORICOS = ("Tipo", "Subtipo", "Modalidade", "Status")
+CAMPOS_TEXTO = ("Conta", "Detalhes")
+_CONJUNTO_CAMPOS = frozenset(CAMPOS)
+
+
+def ngramas(texto, tamanho=TAMANHO_NGRAMA):
+    return {texto[i:i + tamanho] for i in range(len(texto) - tamanho + 1)}
+
+
+def _agrupar_posicoes(codigos, quantidade):
+    """Índice invertido: para cada código, as posições em que aparece (em ordem)"""
+    # Ordenação estável: as posições de cada código saem em ordem crescente
+    ordem = np.argsort(codigos, kind="stable")
+    limites = np.concatenate(([0], np.cumsum(np.bincount(codigos, minlength=quantidade))))
+    return [ordem[limites[c]:limites[c + 1]] for c in range(quantidade)]
+
+
+class ColunaCategorica:
+    """Cada valor distinto é guardado uma vez; as linhas guardam só o código"""
+
+    def __init__(self):
+        self.valores = []
+        self.codigos = {}
+        self.linhas = array("q")
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def __getitem__(self, indice):
+        return self.valores[self.linhas[indice]]
+
+    def acrescentar(self, valor):
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        self.linhas.append(codigo)
+        return codigo
+
+    def vetor_codigos(self):
+        return np.frombuffer(self.linhas, dtype=np.int64) if self.linhas else np.empty(0, dtype=np.int64)
+
+    def coluna(self, posicoes):
+        """Valores das posições informadas, como vetor de objetos"""
+        valores = np.empty(len(self.valores), dtype=object)
+        valores[:] = self.valores
+        return valores[self.vetor_codigos()[posicoes]]
+
+
+class RegistrosCompactos:
+    """Sequência de registros guardada por colunas (struct-of-arrays)
+
+    Os campos de cabeçalho (CNPJ, nome, arquivo) são compartilhados por todos
+    os registros do mesmo PDF, os rótulos fixos viram códigos e Valor fica num
+    array de floats. Cada item acessado é montado como dict na hora, então o
+    restante do código continua lendo registro['Campo'].
+    """
+
+    def __init__(self):
+        self.cabecalhos = ColunaCategorica()
+        self.categorias = {campo: ColunaCategorica() for campo in CAMPOS_CATEGORICOS}
+        self.textos = {campo: [] for campo in CAMPOS_TEXTO}
+        self.valores = array("d")
+        self.extras = {}  # posição -> campos fora de CAMPOS (raro)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def acrescentar(self, registros):
+        """Acrescenta uma lista de registros (dicts no formato da extração)"""
+        # Laço único com as colunas em variáveis locais: roda para cada registro
+        categoricas = [(campo, coluna.codigos, coluna.valores, coluna.linhas)
+                       for campo, coluna in self.categorias.items()]
+        cabecalhos = self.cabecalhos
+        contas = self.textos["Conta"]
+        detalhes = self.textos["Detalhes"]
+        for registro in registros:
+            obter = registro.get
+            if not _CONJUNTO_CAMPOS.issuperset(registro):
+                self.extras[len(self)] = {c: v for c, v in registro.items() if c not in _CONJUNTO_CAMPOS}
+            cabecalhos.acrescentar((obter("CNPJ"), obter("CNPJ_Numeros"), obter("Nome_Empresa"), obter("Arquivo")))
+            for campo, codigos, valores, linhas in categoricas:
+                valor = obter(campo)
+                codigo = codigos.get(valor)
+                if codigo is None:
+                    codigo = codigos[valor] = len(valores)
+                    valores.append(valor)
+                linhas.append(codigo)
+            contas.append(obter("Conta"))
+            detalhes.append(obter("Detalhes"))
+            self.valores.append(float(obter("Valor") or 0))
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        cnpj, cnpj_numeros, nome, arquivo = self.cabecalhos[indice]
+        categorias = self.categorias
+        registro = {
+            "CNPJ": cnpj,
+            "CNPJ_Numeros": cnpj_numeros,
+            "Nome_Empresa": nome,
+            "Tipo": categorias["Tipo"][indice],
+            "Subtipo": categorias["Subtipo"][indice],
+            "Conta": self.textos["Conta"][indice],
+            "Modalidade": categorias["Modalidade"][indice],
+            "Detalhes": self.textos["Detalhes"][indice],
+            "Status": categorias["Status"][indice],
+            "Valor": self.valores[indice],
+            "Arquivo": arquivo,
+        }
+        if indice in self.extras:
+            registro.update(self.extras[indice])
+        return registro
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def para_dataframe(self, posicoes=None):
+        """DataFrame montado coluna a coluna, sem criar um dict por registro"""
+        import pandas as pd
+
+        if posicoes is None:
+            posicoes = np.arange(len(self))
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+
+        cabecalhos = self.cabecalhos.coluna(posicoes)
+        colunas = {}
+        for campo in CAMPOS:
+            if campo in CAMPOS_CABECALHO:
+                k = CAMPOS_CABECALHO.index(campo)
+                colunas[campo] = [cabecalho[k] for cabecalho in cabecalhos]
+            elif campo in self.categorias:
+                colunas[campo] = self.categorias[campo].coluna(posicoes)
+            elif campo in self.textos:
+                texto = self.textos[campo]
+                colunas[campo] = [texto[p] for p in posicoes.tolist()]
+            else:
+                colunas[campo] = np.frombuffer(self.valores, dtype=np.float64)[posicoes] if len(self) else []
+        return pd.DataFrame(colunas, columns=CAMPOS)
+
+
+class VisaoRegistros:
+    """Sequência somente leitura com parte dos registros, sem copiá-los"""
+
+    def __init__(self, registros, posicoes):
+        self.registros = registros
+        self.posicoes = posicoes
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.registros[p] for p in self.posicoes[indice]]
+        return self.registros[int(self.posicoes[indice])]
+
+    def __iter__(self):
+        registros = self.registros
+        for posicao in self.posicoes.tolist():
+            yield registros[posicao]
+
+    def para_dataframe(self):
+        return self.registros.para_dataframe(self.posicoes)
+
+
+class AgregadosDashboard:
+    """Totais do dashboard atualizados a cada registro, sem reprocessar a lista"""
+
+    def __init__(self):
+        self.total_registros = 0
+        self.valor_total = 0.0
+        self.empresas = set()
+        self.empresas_com_atraso = set()
+        self.por_tipo = {}  # tipo -> [quantidade, empresas]
+
+    def acrescentar(self, registros):
+        for registro in registros:
+            nome = registro.get("Nome_Empresa")
+            tipo = registro.get("Tipo")
+            self.total_registros += 1
+            self.valor_total += registro.get("Valor") or 0
+            self.empresas.add(nome)
+            if "Parcelas em atraso" in (registro.get("Detalhes") or ""):
+                self.empresas_com_atraso.add(nome)
+
+            totais = self.por_tipo.get(tipo)
+            if totais is None:
+                totais = self.por_tipo[tipo] = [0, set()]
+            totais[0] += 1
+            totais[1].add(nome)
+
+    def resumo_por_tipo(self):
+        """Linhas (tipo, quantidade, empresas, percentual), em ordem de tipo"""
+        linhas = []
+        for tipo in sorted(self.por_tipo, key=str):
+            quantidade, empresas = self.por_tipo[tipo]
+            linhas.append((tipo, quantidade, len(empresas), quantidade / self.total_registros * 100))
+        return linhas
+
+
+class ArmazemResultados:
+    """Registros de uma execução, em forma compacta, com índices para filtrar
+
+    Cada coluna de COLUNAS_INDEXADAS tem um vetor de códigos e um índice
+    invertido (código -> posições, em ordem). Os nomes de empresa distintos
+    ficam num índice de trigramas, então a busca por trecho só confere os
+    nomes que contêm todos os trigramas do texto procurado.
+    """
+
+    def __init__(self, registros=None):
+        self.registros = RegistrosCompactos()
+        self.agregados = AgregadosDashboard()
+        # CNPJ e nome vêm do cabeçalho compartilhado: um código por cabeçalho
+        self._codigos_cnpj = {}
+        self._cnpj_cabecalho = array("q")
+        self._id_nome = {}
+        self._nome_cabecalho = array("q")
+        self._nomes_busca = []
+        self._indice_ngramas = defaultdict(set)
+        self._vetores = None
+        self._ultima_busca = ("", None)
+        if registros:
+            self.acrescentar(registros)
+
+    def __len__(self):
+        return len(self.registros)
+
+    def acrescentar(self, registros):
+        """Acrescenta registros (ex.: à medida que chegam do processamento)"""
+        self.agregados.acrescentar(registros)
+        cabecalhos = self.registros.cabecalhos.valores
+        self.registros.acrescentar(registros)
+        for cabecalho in cabecalhos[len(self._cnpj_cabecalho):]:
+            self._indexar_cabecalho(cabecalho)
+
+        # Os vetores numpy são refeitos na próxima consulta
+        self._vetores = None
+        self._ultima_busca = ("", None)
+
+    def _indexar_cabecalho(self, cabecalho):
+        cnpj_numeros = cabecalho[CAMPOS_CABECALHO.index("CNPJ_Numeros")]
+        nome = cabecalho[CAMPOS_CABECALHO.index("Nome_Empresa")]
+        self._cnpj_cabecalho.append(self._codigos_cnpj.setdefault(cnpj_numeros, len(self._codigos_cnpj)))
+
+        id_nome = self._id_nome.get(nome)
+        if id_nome is None:
+            id_nome = self._id_nome[nome] = len(self._nomes_busca)
+            nome_busca = normalizar_nome(nome)
+            self._nomes_busca.append(nome_busca)
+            for ngrama in ngramas(nome_busca):
+                self._indice_ngramas[ngrama].add(id_nome)
+        self._nome_cabecalho.append(id_nome)
+
+    def _codigos(self, coluna):
+        if coluna == "CNPJ_Numeros":
+            return self._codigos_cnpj
+        return self.registros.categorias[coluna].codigos
+
+    def _obter_vetores(self):
+        if self._vetores is None:
+            cabecalhos = self.registros.cabecalhos.vetor_codigos()
+            colunas = {
+                "Tipo": self.registros.categorias["Tipo"].vetor_codigos(),
+                "Status": self.registros.categorias["Status"].vetor_codigos(),
+                "CNPJ_Numeros": np.asarray(self._cnpj_cabecalho, dtype=np.int64)[cabecalhos],
+                "Nome_Empresa": np.asarray(self._nome_cabecalho, dtype=np.int64)[cabecalhos],
+            }
+            posicoes = {coluna: _agrupar_posicoes(colunas[coluna], len(self._codigos(coluna)))
+                        for coluna in COLUNAS_INDEXADAS}
+            posicoes["Nome_Empresa"] = _agrupar_posicoes(colunas["Nome_Empresa"], len(self._nomes_busca))
+            self._vetores = (colunas, posicoes)
+        return self._vetores
+
+    def valores(self, coluna):
+        """Valores distintos de uma coluna indexada, na ordem em que apareceram"""
+        return list(self._codigos(coluna))
+
+    def nomes_contendo(self, trecho):
+        """Ids dos nomes de empresa que contêm o trecho (sem diferenciar maiúsculas nem acentos)"""
+        trecho = normalizar_nome(trecho)
+        anterior, encontrados = self._ultima_busca
+        if encontrados is not None and anterior in trecho:
+            # Digitação incremental: o novo trecho só pode estar nos nomes já encontrados
+            candidatos = encontrados
+        elif len(trecho) < TAMANHO_NGRAMA:
+            candidatos = range(len(self._nomes_busca))
+        else:
+            # Os dois trigramas mais raros já cortam quase todos os nomes; a
+            # conferência abaixo é mais barata que intersectar os demais
+            conjuntos = sorted((self._indice_ngramas.get(g, set()) for g in ngramas(trecho)), key=len)
+            candidatos = conjuntos[0].intersection(*conjuntos[1:2])
+        # Trigramas em comum não garantem a ordem: confere o trecho em cada candidato
+        nomes = self._nomes_busca
+        encontrados = [i for i in candidatos if trecho in nomes[i]]
+        self._ultima_busca = (trecho, encontrados)
+        return encontrados
+
+    def filtrar(self, empresa="", **igualdades):
+        """Posições (em ordem) dos registros que atendem a todos os filtros
+
+        empresa é um trecho do nome; igualdades usa as colunas indexadas,
+        ex.: filtrar(empresa="silva", Tipo="SISPAR").
+        """
+        colunas, posicoes = self._obter_vetores()
+        condicoes = []
+        for coluna, valor in igualdades.items():
+            codigo = self._codigos(coluna).get(valor)
+            if codigo is None:
+                return np.empty(0, dtype=np.int64)
+            condicoes.append((coluna, codigo))
+
+        # Parte do menor índice invertido e confere os demais só nesses registros
+        condicoes.sort(key=lambda c: len(posicoes[c[0]][c[1]]))
+        if condicoes:
+            coluna, codigo = condicoes[0]
+            candidatos = posicoes[coluna][codigo]
+            for coluna, codigo in condicoes[1:]:
+                candidatos = candidatos[colunas[coluna][candidatos] == codigo]
+        else:
+            candidatos = None
+
+        if empresa:
+            ids = self.nomes_contendo(empresa)
+            nomes = colunas["Nome_Empresa"]
+            mascara = np.zeros(len(self._nomes_busca), dtype=bool)
+            mascara[ids] = True
+            if candidatos is not None:
+                candidatos = candidatos[mascara[nomes[candidatos]]]
+            elif len(ids) * 16 < len(self._nomes_busca):
+                # Poucos nomes: junta as posições de cada um pelo índice invertido
+                partes = [posicoes["Nome_Empresa"][i] for i in ids]
+                candidatos = np.sort(np.concatenate(partes)) if partes else np.empty(0, dtype=np.int64)
+            else:
+                candidatos = np.flatnonzero(mascara[nomes])
+
+        if candidatos is None:
+            return np.arange(len(self.registros))
+        return candidatos
+
+    def visao(self, posicoes):
+        return VisaoRegistros(self.registros, posicoes)
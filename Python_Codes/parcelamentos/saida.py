@@ -0,0 +1,311 @@
+import itertools
+import json
+import re
+import time
+from array import array
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+try:
+    import xlsxwriter
+except ImportError:  # opcional: grava o Excel mais rápido que o openpyxl
+    xlsxwriter = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # opcional: só necessário para a saída Parquet/Arrow
+    pa = None
+    pq = None
+
+# Valores conhecidos de cada coluna categórica (ver extracao.py); valores novos
+# são acrescentados ao final do dicionário durante a gravação
+CATEGORIAS = {
+    "Tipo": ["PARCMEI", "PARCSN", "SIEFPAR", "SISPAR", "SICOB", "DÉBITO"],
+    "Subtipo": ["MEI", "Simples Nacional", "Receita Federal", "PGFN", "Débito Suspenso", "Pendência"],
+    "Status": ["Em Parcelamento", "Exigibilidade Suspensa", "Ativo/Em Dia", "Devedor"],
+}
+PADRAO_PARCELAS_ATRASO = re.compile(r"Parcelas em atraso:\s*(\d+)", re.IGNORECASE)
+
+
+class GravadorNdjson:
+    """Grava registros como JSON por linha à medida que são extraídos
+
+    O arquivo é descarregado no disco periodicamente, então uma execução
+    interrompida mantém tudo o que já foi processado. Um arquivo existente é
+    substituído (o de uma execução retomada é regravado por inteiro).
+    """
+
+    def __init__(self, caminho, intervalo_flush=1.0):
+        self.caminho = caminho
+        self.intervalo_flush = intervalo_flush
+        self.total = 0
+        self._arquivo = open(caminho, "w", encoding="utf-8")
+        self._ultimo_flush = time.monotonic()
+
+    def gravar(self, registros):
+        for registro in registros:
+            self._arquivo.write(json.dumps(registro, ensure_ascii=False))
+            self._arquivo.write("\n")
+        self.total += len(registros)
+
+        agora = time.monotonic()
+        if agora - self._ultimo_flush >= self.intervalo_flush:
+            self._arquivo.flush()
+            self._ultimo_flush = agora
+
+    def fechar(self):
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
+
+
+def ler_ndjson(caminho):
+    """Lê os registros de um arquivo NDJSON, um por vez"""
+    with open(caminho, encoding="utf-8") as f:
+        for linha in f:
+            linha = linha.strip()
+            if linha:
+                yield json.loads(linha)
+
+
+def indexar_ndjson(caminho, colunas_ordem):
+    """Lê o NDJSON uma vez guardando só a posição de cada linha e as chaves de ordenação
+
+    Retorna (posicoes, chaves, colunas): chaves[k][i] é o código do valor da
+    coluna colunas_ordem[k] na linha i; colunas segue a ordem em que as colunas
+    aparecem nos registros (como num DataFrame).
+    """
+    posicoes = array("q")
+    codigos = [{} for _ in colunas_ordem]
+    chaves = [array("l") for _ in colunas_ordem]
+    colunas = {}
+
+    with open(caminho, "rb") as f:
+        posicao = 0
+        for linha in f:
+            if linha.strip():
+                registro = json.loads(linha)
+                posicoes.append(posicao)
+                for coluna in registro:
+                    if coluna not in colunas:
+                        colunas[coluna] = None
+                for codigo, chave, coluna in zip(codigos, chaves, colunas_ordem):
+                    valor = registro.get(coluna)
+                    chave.append(codigo.setdefault(valor, len(codigo)))
+            posicao += len(linha)
+
+    # Troca os códigos (ordem de chegada) pela posição do valor na ordenação;
+    # valores ausentes vão para o final, como no pandas
+    for k, codigo in enumerate(codigos):
+        ordenados = sorted(codigo, key=lambda v: (v is None, "" if v is None else v))
+        posto = [0] * len(codigo)
+        for i, valor in enumerate(ordenados):
+            posto[codigo[valor]] = i
+        chaves[k] = array("l", (posto[c] for c in chaves[k]))
+    return posicoes, chaves, list(colunas)
+
+
+class PlanilhaXlsxwriter:
+    """Planilha gravada linha a linha pelo xlsxwriter em modo de memória constante"""
+
+    def __init__(self, caminho):
+        self.livro = xlsxwriter.Workbook(caminho, {"constant_memory": True, "strings_to_urls": False})
+        self.planilha = self.livro.add_worksheet("Sheet1")
+        self.formato_cabecalho = self.livro.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        self.linha = 0
+
+    def cabecalho(self, colunas):
+        self.planilha.write_row(0, 0, colunas, self.formato_cabecalho)
+        self.linha = 1
+
+    def gravar(self, valores):
+        # Gravação direta por tipo: write_row testaria cada texto contra vários padrões
+        linha = self.linha
+        for coluna, valor in enumerate(valores):
+            if isinstance(valor, str):
+                self.planilha.write_string(linha, coluna, valor)
+            elif isinstance(valor, (int, float)) and not isinstance(valor, bool):
+                self.planilha.write_number(linha, coluna, valor)
+            elif valor is not None:
+                self.planilha.write(linha, coluna, valor)
+        self.linha += 1
+
+    def fechar(self):
+        self.livro.close()
+
+
+class PlanilhaOpenpyxl:
+    """Planilha gravada linha a linha pelo openpyxl em modo write_only"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.livro = Workbook(write_only=True)
+        self.planilha = self.livro.create_sheet("Sheet1")
+
+    def cabecalho(self, colunas):
+        linha = []
+        for coluna in colunas:
+            celula = WriteOnlyCell(self.planilha, value=coluna)
+            celula.font = Font(bold=True)
+            celula.border = Border(*(Side(style="thin"),) * 4)
+            celula.alignment = Alignment(horizontal="center", vertical="top")
+            linha.append(celula)
+        self.planilha.append(linha)
+
+    def gravar(self, valores):
+        self.planilha.append(valores)
+
+    def fechar(self):
+        self.livro.save(self.caminho)
+
+
+def colunas_ordenacao(agrupar_por_empresa=False):
+    """Colunas pelas quais o Excel é ordenado"""
+    return ("Nome_Empresa", "Tipo") if agrupar_por_empresa else ("Tipo", "Nome_Empresa")
+
+
+def gravar_planilha(caminho_excel, colunas, registros):
+    """Grava os registros (já na ordem final) um a um; retorna (linhas, empresas)"""
+    total = 0
+    empresas = set()
+    planilha = PlanilhaXlsxwriter(caminho_excel) if xlsxwriter is not None else PlanilhaOpenpyxl(caminho_excel)
+    try:
+        planilha.cabecalho(colunas)
+        for registro in registros:
+            planilha.gravar([registro.get(coluna) for coluna in colunas])
+            empresas.add(registro.get("Nome_Empresa"))
+            total += 1
+    finally:
+        planilha.fechar()
+    return total, len(empresas)
+
+
+def salvar_excel(caminho_ndjson, caminho_excel, agrupar_por_empresa=False):
+    """Grava o Excel de parcelamentos a partir do NDJSON, sem montar tudo em memória
+
+    Em memória ficam só a posição e as chaves de ordenação de cada linha; os
+    registros são relidos do NDJSON já na ordem final e gravados um a um.
+    Retorna (total de linhas, número de empresas).
+    """
+    posicoes, (chave1, chave2), colunas = indexar_ndjson(caminho_ndjson, colunas_ordenacao(agrupar_por_empresa))
+    # Uma chave inteira por linha; sorted é estável, então empates mantêm a
+    # ordem do NDJSON, como no sort_values do pandas
+    fator = max(chave2, default=0) + 1
+    chave = array("q", (c1 * fator + c2 for c1, c2 in zip(chave1, chave2)))
+    linhas = sorted(range(len(posicoes)), key=chave.__getitem__)
+
+    def registros_ordenados(f):
+        for i in linhas:
+            f.seek(posicoes[i])
+            yield json.loads(f.readline())
+
+    with open(caminho_ndjson, "rb") as f:
+        return gravar_planilha(caminho_excel, colunas, registros_ordenados(f))
+
+
+def esquema_arrow():
+    """Esquema fixo da saída colunar: categorias como dicionário, Valor numérico"""
+    categoria = pa.dictionary(pa.int8(), pa.string())
+    return pa.schema([
+        ("CNPJ", pa.string()),
+        ("CNPJ_Numeros", pa.string()),
+        ("Nome_Empresa", pa.string()),
+        ("Tipo", categoria),
+        ("Subtipo", categoria),
+        ("Conta", pa.string()),
+        ("Modalidade", pa.string()),
+        ("Detalhes", pa.string()),
+        ("Status", categoria),
+        ("Valor", pa.float64()),
+        ("Parcelas_em_atraso", pa.int32()),
+        ("Arquivo", pa.string()),
+    ])
+
+
+def parcelas_em_atraso(detalhes):
+    """Número de parcelas em atraso citado em Detalhes (None quando não há)"""
+    match = PADRAO_PARCELAS_ATRASO.search(detalhes or "")
+    return int(match.group(1)) if match else None
+
+
+class ConversorArrow:
+    """Converte registros em RecordBatches com o esquema fixo
+
+    Os dicionários das colunas categóricas só crescem (novos valores vão para o
+    final), o que mantém os lotes compatíveis entre si no formato Arrow IPC.
+    """
+
+    def __init__(self):
+        self.esquema = esquema_arrow()
+        self.categorias = {coluna: list(valores) for coluna, valores in CATEGORIAS.items()}
+        self.indices = {coluna: {v: i for i, v in enumerate(valores)} for coluna, valores in self.categorias.items()}
+
+    def _indices_categoria(self, coluna, valores):
+        indices = self.indices[coluna]
+        categorias = self.categorias[coluna]
+        resultado = []
+        for valor in valores:
+            if valor is None:
+                resultado.append(None)
+                continue
+            indice = indices.get(valor)
+            if indice is None:
+                indice = indices[valor] = len(categorias)
+                categorias.append(valor)
+            resultado.append(indice)
+        return pa.DictionaryArray.from_arrays(pa.array(resultado, type=pa.int8()),
+                                              pa.array(categorias, type=pa.string()))
+
+    def lote(self, registros):
+        arrays = []
+        for campo in self.esquema:
+            nome = campo.name
+            if nome == "Valor":
+                arrays.append(pa.array([float(r.get("Valor") or 0) for r in registros], type=pa.float64()))
+            elif nome == "Parcelas_em_atraso":
+                arrays.append(pa.array([parcelas_em_atraso(r.get("Detalhes")) for r in registros], type=pa.int32()))
+            else:
+                valores = [str(r[nome]) if r.get(nome) is not None else None for r in registros]
+                if nome in self.categorias:
+                    arrays.append(self._indices_categoria(nome, valores))
+                else:
+                    arrays.append(pa.array(valores, type=pa.string()))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.esquema)
+
+
+def salvar_colunar(registros, caminho, tamanho_lote=50000):
+    """Grava os registros em Parquet (.parquet) ou Arrow IPC (.arrow), em lotes
+
+    Arrow IPC pode ser lido com memória mapeada (pyarrow.memory_map); os dois
+    formatos permitem ler só as colunas necessárias.
+    """
+    if pa is None:
+        raise ImportError("A saída Parquet/Arrow requer o pacote pyarrow (pip install pyarrow)")
+
+    conversor = ConversorArrow()
+    iterador = iter(registros)
+    if caminho.lower().endswith(".arrow"):
+        opcoes = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        escritor = pa.ipc.new_file(caminho, conversor.esquema, options=opcoes)
+    else:
+        escritor = pq.ParquetWriter(caminho, conversor.esquema, compression="zstd")
+
+    total = 0
+    try:
+        while True:
+            lote = list(itertools.islice(iterador, tamanho_lote))
+            if not lote:
+                break
+            escritor.write_batch(conversor.lote(lote))
+            total += len(lote)
+    finally:
+        escritor.close()
+    return total
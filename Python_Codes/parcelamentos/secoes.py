@@ -0,0 +1,95 @@
+import re
+
+# Cabeçalhos de seção do relatório: cada um abre um trecho que vai até o
+# próximo cabeçalho (de qualquer tipo)
+CABECALHOS = (
+    ("SIEFPAR_PENDENCIA", "Pendência – Parcelamento (SIEFPAR)"),
+    ("SIEFPAR_SUSPENSO", "Parcelamento com Exigibilidade Suspensa (SIEFPAR)"),
+    ("SISPAR", "SISPAR"),
+    ("SICOB", "Débito com Exigibilidade Suspensa (SICOB)"),
+    ("DEBITO_SIEF", "Pendência - Débito (SIEF)"),
+)
+
+# Linhas que são o próprio registro: abrem um trecho até o próximo cabeçalho,
+# mas não encerram o trecho da seção em que aparecem
+LINHAS = (
+    ("PARCMEI", "MEI - EM PARCELAMENTO", ""),
+    ("PARCSN", "SIMPLES NACIONAL", r"(?=[^\n]*EM PARCELAMENTO)"),
+)
+
+# Alternância simples, sem grupos nomeados: assim o re usa o conjunto de
+# caracteres iniciais para saltar direto aos candidatos (~15x mais rápido)
+_PADRAO_MARCADORES = re.compile("|".join(
+    [re.escape(marcador) for _, marcador in CABECALHOS]
+    + [re.escape(marcador) + sufixo for _, marcador, sufixo in LINHAS]
+))
+_SECAO_POR_MARCADOR = dict(
+    [(marcador, nome) for nome, marcador in CABECALHOS]
+    + [(marcador, nome) for nome, marcador, _ in LINHAS]
+)
+_NOMES_CABECALHOS = frozenset(nome for nome, _ in CABECALHOS)
+
+
+class Secoes:
+    """Trechos do texto de um relatório, agrupados por seção"""
+
+    def __init__(self, texto, trechos, posicoes):
+        self.texto = texto
+        self.trechos = trechos
+        self.posicoes = posicoes
+
+    def __contains__(self, secao):
+        return secao in self.trechos
+
+    def textos(self, secao):
+        """Textos dos trechos de uma seção, na ordem em que aparecem no relatório"""
+        return [self.texto[inicio:fim] for inicio, fim in self.trechos.get(secao, ())]
+
+    def linhas_marcador(self, secao):
+        """Linhas completas em que o marcador da seção foi encontrado"""
+        linhas = []
+        for inicio in self.posicoes.get(secao, ()):
+            fim_linha = self.texto.find("\n", inicio)
+            linhas.append(self.texto[inicio:fim_linha if fim_linha >= 0 else len(self.texto)])
+        return linhas
+
+    def findall(self, padrao, secao):
+        """Equivalente a padrao.findall restrito aos trechos da seção"""
+        resultados = []
+        for trecho in self.textos(secao):
+            resultados.extend(padrao.findall(trecho))
+        return resultados
+
+    def search(self, padrao, secao):
+        """Primeira ocorrência de padrao nos trechos da seção"""
+        for trecho in self.textos(secao):
+            match = padrao.search(trecho)
+            if match:
+                return match
+        return None
+
+
+def localizar_secoes(texto):
+    """Encontra todos os marcadores numa única passada e divide o texto em trechos por seção"""
+    marcadores = [(m.start(), _SECAO_POR_MARCADOR[m.group()]) for m in _PADRAO_MARCADORES.finditer(texto)]
+    inicios_cabecalhos = [inicio for inicio, nome in marcadores if nome in _NOMES_CABECALHOS]
+    inicios_cabecalhos.append(len(texto))
+
+    trechos = {}
+    posicoes = {}
+    proximo = 0
+    for inicio, nome in marcadores:
+        # Fim do trecho = próximo cabeçalho depois do início do marcador
+        while inicios_cabecalhos[proximo] <= inicio:
+            proximo += 1
+        fim = inicios_cabecalhos[proximo]
+        posicoes.setdefault(nome, []).append(inicio)
+
+        lista = trechos.setdefault(nome, [])
+        if lista and inicio < lista[-1][1]:
+            # Várias linhas da mesma seção antes do próximo cabeçalho: une os trechos
+            lista[-1] = (lista[-1][0], max(lista[-1][1], fim))
+        else:
+            lista.append((inicio, fim))
+
+    return Secoes(texto, trechos, posicoes)
@@ -0,0 +1,275 @@
+"""Serviço residente de extração: módulos e padrões já carregados entre um job e outro
+
+Uso (a partir de Python_Codes):
+    REPORTX_TOKEN=SEGREDO python -m parcelamentos.servico --porta 8765 [--processos 4]
+
+Escuta só em 127.0.0.1 e exige o token (--token ou REPORTX_TOKEN) no cabeçalho
+X-Token de toda requisição; o server.js gera um token novo a cada início. Só
+são aceitos Host 127.0.0.1:<porta> ou localhost:<porta> (contra DNS
+rebinding) e POST com Content-Type application/json (um formulário de uma
+página aberta no navegador não chega aos jobs). Cada job é um POST com corpo JSON e a resposta é um
+fluxo NDJSON de eventos ({"evento": "log" | "progresso" | "registros" | "fim"
+| "erro", ...}), um por linha, enviados à medida que acontecem:
+
+    GET  /saude       estado do serviço (versão do parser, backends, pid)
+    POST /processar   processar_pasta completo: mesmas chaves de
+                      CONFIGURACAO_PADRAO (pasta_pdfs, pasta_saida, ...);
+                      "fim" traz os caminhos do Excel/JSON/métricas
+    POST /extrair     só a extração de uma lista de PDFs: {"arquivos": [...],
+                      "incluir_detalhes_debitos", "backend_extracao", "cnpjs"}
+
+Com "enviar_registros": false os eventos "registros" não são enviados. Se o
+cliente desconecta, o job é interrompido (o diário permite retomá-lo). Jobs
+/processar com a mesma pasta_saida rodam um de cada vez.
+"""
+import argparse
+import hmac
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from parcelamentos.backends import BACKEND_PADRAO, backends_disponiveis
+from parcelamentos.cache import versao_parser
+from parcelamentos.extracao import extrair_em_processo
+from parcelamentos.leitura import JANELA_PADRAO, LeituraAntecipada
+from parcelamentos.motor import CONFIGURACAO_PADRAO, processar_pasta
+from parcelamentos.normalizacao import normalizar_cnpj
+
+PORTA_PADRAO = 8765
+CABECALHO_TOKEN = "X-Token"
+
+
+def _aquecer():
+    """Executada em cada processo do pool para carregar os módulos antes do primeiro job"""
+    return os.getpid()
+
+
+class ServicoExtracao(ThreadingHTTPServer):
+    """Servidor HTTP local com o pool de processos aberto durante toda a vida do serviço"""
+
+    daemon_threads = True
+
+    def __init__(self, porta=PORTA_PADRAO, processos=1, token=None):
+        if not token:
+            raise ValueError("o serviço exige um token (--token ou REPORTX_TOKEN)")
+        # server_close (chamado se a porta estiver ocupada) já encontra o atributo
+        self.executor = None
+        super().__init__(("127.0.0.1", porta), TratadorServico)
+        self.processos = max(1, processos)
+        self.token = token
+        self.hosts_permitidos = {f"127.0.0.1:{porta}", f"localhost:{porta}"}
+        self.versao = versao_parser()
+        self.inicio = time.time()
+        self.jobs = 0
+        self._trava = threading.Lock()
+        self._travas_saida = {}
+        if self.processos > 1:
+            self.executor = self._novo_pool()
+
+    def _novo_pool(self):
+        executor = ProcessPoolExecutor(max_workers=self.processos)
+        for futuro in [executor.submit(_aquecer) for _ in range(self.processos)]:
+            futuro.result()
+        return executor
+
+    def obter_executor(self):
+        """Pool para o próximo job, recriado se um processo filho morreu (BrokenProcessPool)"""
+        if self.executor is None:
+            return None
+        with self._trava:
+            try:
+                # Um pool quebrado recusa qualquer tarefa nova
+                self.executor.submit(_aquecer)
+            except BrokenProcessPool:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._novo_pool()
+            return self.executor
+
+    def novo_job(self):
+        with self._trava:
+            self.jobs += 1
+            return self.jobs
+
+    def trava_saida(self, pasta_saida):
+        """Trava da pasta de saída: jobs na mesma pasta compartilhariam o timestamp,
+        o NDJSON, o diário e o cache; eles rodam um de cada vez"""
+        chave = os.path.normcase(os.path.abspath(pasta_saida))
+        with self._trava:
+            return self._travas_saida.setdefault(chave, threading.Lock())
+
+    def server_close(self):
+        super().server_close()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+class TratadorServico(BaseHTTPRequestHandler):
+    """Uma requisição = um job; os eventos são escritos no socket assim que gerados"""
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _responder_json(self, status, dados):
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _autorizado(self):
+        if self.headers.get("Host", "").lower() not in self.server.hosts_permitidos:
+            self._responder_json(403, {"erro": "host não permitido"})
+            return False
+        token = self.headers.get(CABECALHO_TOKEN) or ""
+        if not hmac.compare_digest(token.encode("utf-8"), self.server.token.encode("utf-8")):
+            self._responder_json(401, {"erro": "token inválido"})
+            return False
+        return True
+
+    def _evento(self, evento, **dados):
+        linha = json.dumps(dict(dados, evento=evento), ensure_ascii=False) + "\n"
+        self.wfile.write(linha.encode("utf-8"))
+
+    def do_GET(self):
+        if not self._autorizado():
+            return
+        if self.path != "/saude":
+            self._responder_json(404, {"erro": f"rota desconhecida: {self.path}"})
+            return
+        self._responder_json(200, {
+            "status": "ok", "pid": os.getpid(), "versao_parser": self.server.versao,
+            "backends": backends_disponiveis(), "processos": self.server.processos,
+            "jobs": self.server.jobs, "ativo_ha": round(time.time() - self.server.inicio, 1),
+        })
+
+    def do_POST(self):
+        if not self._autorizado():
+            return
+        rotas = {"/processar": self._processar, "/extrair": self._extrair}
+        if self.path not in rotas:
+            self._responder_json(404, {"erro": f"rota desconhecida: {self.path}"})
+            return
+        tipo = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if tipo != "application/json":
+            self._responder_json(415, {"erro": "use Content-Type: application/json"})
+            return
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+            pedido = json.loads(self.rfile.read(tamanho) or b"{}")
+            if not isinstance(pedido, dict):
+                raise ValueError("o corpo deve ser um objeto JSON")
+        except ValueError as e:
+            self._responder_json(400, {"erro": f"JSON inválido: {e}"})
+            return
+
+        # Sem Content-Length: o fim do fluxo é o fechamento da conexão (HTTP/1.0)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+        job = self.server.novo_job()
+        inicio = time.perf_counter()
+        try:
+            resumo = rotas[self.path](pedido)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        except Exception as e:
+            self._evento("erro", job=job, mensagem=str(e))
+            return
+        self._evento("fim", job=job, segundos=round(time.perf_counter() - inicio, 3), **resumo)
+
+    def _processar(self, pedido):
+        enviar_registros = pedido.pop("enviar_registros", True)
+        desconhecidas = set(pedido) - set(CONFIGURACAO_PADRAO)
+        if desconhecidas:
+            raise ValueError(f"opções desconhecidas: {', '.join(sorted(desconhecidas))}")
+        if not pedido.get("pasta_pdfs") or not os.path.isdir(pedido["pasta_pdfs"]):
+            raise ValueError("informe uma pasta_pdfs existente")
+        if not pedido.get("pasta_saida"):
+            raise ValueError("informe a pasta_saida")
+        os.makedirs(pedido["pasta_saida"], exist_ok=True)
+
+        configuracao = dict(pedido)
+        configuracao.setdefault("processos_paralelos", self.server.processos)
+        trava = self.server.trava_saida(pedido["pasta_saida"])
+        if not trava.acquire(blocking=False):
+            self._evento("log", mensagem="⏳ Aguardando outro job na mesma pasta de saída...")
+            trava.acquire()
+        try:
+            resultado = processar_pasta(
+                configuracao, log=lambda mensagem: self._evento("log", mensagem=mensagem),
+                progresso=lambda concluidos, encontrados, arquivo: self._evento(
+                    "progresso", concluidos=concluidos, encontrados=encontrados, arquivo=arquivo),
+                ao_gravar=(lambda dados: self._evento("registros", registros=dados)) if enviar_registros else None,
+                manter_dados=False, executor=self.server.obter_executor(),
+            )
+        finally:
+            trava.release()
+        return {
+            "total_arquivos": resultado.total_arquivos, "total_registros": resultado.total_registros,
+            "ignorados": resultado.ignorados, "caminho_excel": resultado.caminho_excel,
+            "caminho_json": resultado.caminho_json, "caminho_parquet": resultado.caminho_parquet,
+            "caminho_metricas": resultado.caminho_metricas, "tempo_total": resultado.tempo_total,
+        }
+
+    def _extrair(self, pedido):
+        arquivos = pedido.get("arquivos") or []
+        if not isinstance(arquivos, list):
+            raise ValueError("arquivos deve ser uma lista de caminhos")
+        incluir_debitos = pedido.get("incluir_detalhes_debitos", True)
+        backend = pedido.get("backend_extracao") or BACKEND_PADRAO
+        cnpjs = frozenset(normalizar_cnpj(c) for c in pedido["cnpjs"]) if pedido.get("cnpjs") else None
+        enviar_registros = pedido.get("enviar_registros", True)
+
+        total_registros = 0
+        leitura = LeituraAntecipada(((caminho, caminho) for caminho in arquivos), JANELA_PADRAO)
+        try:
+            for concluidos, (caminho, conteudo, _) in enumerate(leitura, 1):
+                dados, mensagens, metricas = extrair_em_processo(caminho, incluir_debitos, cnpjs, backend, conteudo)
+                for mensagem in mensagens:
+                    self._evento("log", mensagem=mensagem)
+                # None: CNPJ do cabeçalho fora do filtro
+                ignorado = dados is None
+                dados = dados or []
+                total_registros += len(dados)
+                if enviar_registros:
+                    self._evento("registros", arquivo=caminho, registros=dados)
+                self._evento("progresso", concluidos=concluidos, encontrados=len(arquivos), arquivo=caminho,
+                             ignorado=ignorado, paginas=metricas.get("Paginas", 0))
+        finally:
+            leitura.fechar()
+        return {"total_arquivos": len(arquivos), "total_registros": total_registros}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m parcelamentos.servico",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--processos", type=int, default=1,
+                        help="processos do pool mantido aberto para processar_paralelos > 1 (padrão: 1)")
+    parser.add_argument("--token", default=os.environ.get("REPORTX_TOKEN"),
+                        help=f"valor exigido no cabeçalho {CABECALHO_TOKEN} (padrão: variável REPORTX_TOKEN)")
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error("informe o token com --token ou pela variável REPORTX_TOKEN")
+
+    servico = ServicoExtracao(args.porta, args.processos, args.token)
+    print(f"🟢 Serviço de extração em http://127.0.0.1:{args.porta} (pid {os.getpid()})", flush=True)
+    try:
+        servico.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servico.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
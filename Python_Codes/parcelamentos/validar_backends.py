@@ -0,0 +1,94 @@
+"""Compara os backends de extração de texto numa pasta de PDFs
+
+Uso (a partir de Python_Codes):
+    python -m parcelamentos.validar_backends PASTA_PDFS [--backends pdfplumber pdfium] [--limite N]
+
+Mostra páginas/segundo de cada backend e, por arquivo, os registros que só
+um dos backends encontrou.
+"""
+import argparse
+import collections
+import os
+import sys
+import time
+
+from parcelamentos.backends import abrir_documento, backends_disponiveis
+from parcelamentos.extracao import iterar_registros_texto
+
+
+def extrair_com_backend(caminho_pdf, backend):
+    """Retorna (registros, páginas) usando o backend informado"""
+    with abrir_documento(caminho_pdf, backend) as documento:
+        paginas = len(documento)
+        texto = "\n".join(t for t in (documento.texto_pagina(i) for i in range(paginas)) if t)
+
+    registros = []
+    try:
+        for registro in iterar_registros_texto(texto, os.path.basename(caminho_pdf)):
+            registros.append(registro)
+    except Exception:
+        # Mesmo comportamento de extrair_dados_pdf: mantém o que foi extraído
+        pass
+    return registros, paginas
+
+
+def chave_registro(registro):
+    return tuple(str(registro.get(campo)) for campo in
+                 ("CNPJ_Numeros", "Tipo", "Conta", "Modalidade", "Detalhes", "Status", "Valor"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara backends de extração de texto")
+    parser.add_argument("pasta_pdfs")
+    parser.add_argument("--backends", nargs="+", default=backends_disponiveis())
+    parser.add_argument("--limite", type=int, default=None, help="processa só os N primeiros PDFs")
+    args = parser.parse_args(argv)
+
+    arquivos = sorted(f for f in os.listdir(args.pasta_pdfs) if f.lower().endswith(".pdf"))[:args.limite]
+    if not arquivos:
+        print("Nenhum PDF encontrado.")
+        return 1
+
+    base, *outros = args.backends
+    tempos = collections.Counter()
+    paginas_total = collections.Counter()
+    registros_total = collections.Counter()
+    arquivos_divergentes = 0
+
+    for arquivo in arquivos:
+        caminho = os.path.join(args.pasta_pdfs, arquivo)
+        resultados = {}
+        for backend in args.backends:
+            inicio = time.perf_counter()
+            try:
+                registros, paginas = extrair_com_backend(caminho, backend)
+            except Exception as e:
+                print(f"❌ {arquivo} [{backend}]: {e}")
+                registros, paginas = [], 0
+            tempos[backend] += time.perf_counter() - inicio
+            paginas_total[backend] += paginas
+            registros_total[backend] += len(registros)
+            resultados[backend] = collections.Counter(chave_registro(r) for r in registros)
+
+        divergencias = []
+        for backend in outros:
+            for registro in sorted((resultados[base] - resultados[backend]).elements()):
+                divergencias.append(f"  - só {base}: {registro}")
+            for registro in sorted((resultados[backend] - resultados[base]).elements()):
+                divergencias.append(f"  + só {backend}: {registro}")
+        if divergencias:
+            arquivos_divergentes += 1
+            print(f"⚠️ {arquivo}")
+            print("\n".join(divergencias))
+
+    print()
+    print(f"{'Backend':<12} {'Páginas':>8} {'Tempo (s)':>10} {'Páginas/s':>10} {'Registros':>10}")
+    for backend in args.backends:
+        velocidade = paginas_total[backend] / tempos[backend] if tempos[backend] else 0
+        print(f"{backend:<12} {paginas_total[backend]:>8} {tempos[backend]:>10.2f} {velocidade:>10.1f} {registros_total[backend]:>10}")
+    print(f"\n{len(arquivos)} PDFs comparados, {arquivos_divergentes} com diferenças")
+    return 1 if arquivos_divergentes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
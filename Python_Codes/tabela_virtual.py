@@ -0,0 +1,172 @@
+"""Tabela virtualizada para a interface: só as linhas visíveis existem no Treeview"""
+import tkinter as tk
+from tkinter import ttk
+
+ALTURA_LINHA_PADRAO = 20
+
+
+class TabelaVirtual:
+    """Treeview com um número fixo de itens sobre uma lista de registros
+
+    Os registros ficam numa lista Python; o Treeview só tem os itens que cabem
+    na tela, e rolar ou trocar os dados apenas reescreve os valores desses
+    itens. O custo de atualizar não depende do tamanho do resultado.
+    """
+
+    def __init__(self, master, colunas, formatar, larguras=None, altura=20):
+        self.formatar = formatar
+        self.registros = []
+        self.inicio = 0
+        self.selecionados = set()  # posições em self.registros
+        self.itens = []
+        self.anexados = 0
+
+        self.tree = ttk.Treeview(master, columns=colunas, show="headings", height=altura)
+        # Medidas das linhas guardadas: <Configure> chega a cada passo do redimensionamento
+        self.altura_estilo = int(ttk.Style().lookup("Treeview", "rowheight") or ALTURA_LINHA_PADRAO)
+        self.medida = None  # (topo, altura) da primeira linha, quando houver uma na tela
+        for col in colunas:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=(larguras or {}).get(col, 100))
+
+        # A barra vertical controla a posição na lista, não o Treeview
+        self.scroll_y = ttk.Scrollbar(master, orient="vertical", command=self._rolar_barra)
+        self._criar_itens(altura)
+
+        self.tree.bind("<<TreeviewSelect>>", self._selecao_alterada)
+        self.tree.bind("<Configure>", self._redimensionado)
+        self.tree.bind("<MouseWheel>", lambda e: self._rolar_roda(-e.delta // 120 if abs(e.delta) >= 120 else -e.delta))
+        self.tree.bind("<Button-4>", lambda e: self._rolar_roda(-1))
+        self.tree.bind("<Button-5>", lambda e: self._rolar_roda(1))
+        self.tree.bind("<Up>", lambda e: self._mover_foco(-1))
+        self.tree.bind("<Down>", lambda e: self._mover_foco(1))
+        self.tree.bind("<Prior>", lambda e: self._mover_foco(-len(self.itens)))
+        self.tree.bind("<Next>", lambda e: self._mover_foco(len(self.itens)))
+        self.tree.bind("<Home>", lambda e: self._mover_foco(-len(self.registros)))
+        self.tree.bind("<End>", lambda e: self._mover_foco(len(self.registros)))
+
+    def __len__(self):
+        return len(self.registros)
+
+    # Dados
+    def definir_registros(self, registros):
+        """Troca os registros exibidos (a lista não é copiada)"""
+        self.registros = registros
+        self.inicio = 0
+        self.selecionados = set()
+        self._renderizar()
+
+    def atualizar(self):
+        """Redesenha a janela atual (ex.: depois de acrescentar registros à lista)"""
+        self._renderizar()
+
+    def registros_selecionados(self):
+        return [self.registros[i] for i in sorted(self.selecionados) if i < len(self.registros)]
+
+    def registro_do_item(self, item):
+        """Registro exibido num item do Treeview (None se o item estiver vazio)"""
+        if item not in self.itens:
+            return None
+        posicao = self.inicio + self.itens.index(item)
+        return self.registros[posicao] if posicao < len(self.registros) else None
+
+    def selecionar_item(self, item):
+        """Seleciona só o registro exibido no item (ex.: clique com o botão direito)"""
+        if item in self.itens:
+            self.selecionados = {self.inicio + self.itens.index(item)}
+            self.tree.selection_set(item)
+
+    def rolar_para(self, inicio):
+        maximo = max(0, len(self.registros) - len(self.itens))
+        inicio = min(max(0, int(inicio)), maximo)
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._renderizar()
+
+    # Janela visível
+    def _criar_itens(self, quantidade):
+        if len(self.itens) > quantidade:
+            self.tree.delete(*self.itens[quantidade:])
+            del self.itens[quantidade:]
+            self.anexados = min(self.anexados, quantidade)
+        while len(self.itens) < quantidade:
+            # Novos itens ficam fora da árvore até _renderizar precisar deles
+            item = self.tree.insert("", tk.END)
+            self.tree.detach(item)
+            self.itens.append(item)
+
+    def _renderizar(self):
+        fim = min(self.inicio + len(self.itens), len(self.registros))
+        visiveis = fim - self.inicio
+
+        # Itens sem registro saem da árvore em vez de aparecer vazios
+        if visiveis < self.anexados:
+            self.tree.detach(*self.itens[visiveis:self.anexados])
+        for posicao in range(self.anexados, visiveis):
+            self.tree.move(self.itens[posicao], "", posicao)
+        self.anexados = visiveis
+
+        selecao = []
+        for posicao in range(visiveis):
+            item = self.itens[posicao]
+            self.tree.item(item, values=self.formatar(self.registros[self.inicio + posicao]))
+            if self.inicio + posicao in self.selecionados:
+                selecao.append(item)
+        self.tree.selection_set(selecao)
+
+        total = len(self.registros)
+        if total:
+            self.scroll_y.set(self.inicio / total, fim / total)
+        else:
+            self.scroll_y.set(0, 1)
+
+    def _selecao_alterada(self, event=None):
+        # Só a parte visível da seleção pode ter mudado
+        visiveis = range(self.inicio, self.inicio + self.anexados)
+        self.selecionados.difference_update(visiveis)
+        for item in self.tree.selection():
+            if item in self.itens:
+                self.selecionados.add(self.inicio + self.itens.index(item))
+
+    def _redimensionado(self, event):
+        if self.medida is None and self.anexados:
+            caixa = self.tree.bbox(self.itens[0])
+            if caixa:
+                self.medida = (caixa[1], caixa[3])
+        # Cabeçalho com a altura de uma linha, até haver uma linha para medir
+        topo, altura_linha = self.medida or (self.altura_estilo, self.altura_estilo)
+        linhas = max(1, (event.height - topo) // max(1, altura_linha))
+        if linhas != len(self.itens):
+            self._criar_itens(linhas)
+            self.inicio = min(self.inicio, max(0, len(self.registros) - linhas))
+            self._renderizar()
+
+    # Rolagem
+    def _rolar_barra(self, acao, valor, unidade=None):
+        if acao == "moveto":
+            self.rolar_para(float(valor) * len(self.registros))
+        elif acao == "scroll":
+            passo = len(self.itens) if unidade == "pages" else 1
+            self.rolar_para(self.inicio + int(valor) * passo)
+
+    def _rolar_roda(self, linhas):
+        self.rolar_para(self.inicio + linhas * 3)
+        return "break"
+
+    def _mover_foco(self, delta):
+        if not self.registros:
+            return "break"
+        foco = self.tree.focus()
+        atual = self.inicio + self.itens.index(foco) if foco in self.itens else self.inicio
+        alvo = min(max(0, atual + delta), len(self.registros) - 1)
+
+        self.selecionados = {alvo}
+        if alvo < self.inicio:
+            self.rolar_para(alvo)
+        elif alvo >= self.inicio + len(self.itens):
+            self.rolar_para(alvo - len(self.itens) + 1)
+        self._renderizar()
+        item = self.itens[alvo - self.inicio]
+        self.tree.focus(item)
+        self.tree.see(item)
+        return "break"
@@ -0,0 +1,81 @@
+"""DiarioExecucao: o que foi gravado é lido de volta, inclusive após uma interrupção"""
+import os
+
+from parcelamentos.diario import DiarioExecucao, ler_diario, localizar_diario
+
+CABECALHO = {"pasta_pdfs": "/pdfs", "incluir_detalhes_debitos": True, "backend_extracao": "pdfplumber",
+             "excel_empresas": "", "versao_parser": "v1"}
+REGISTROS = [{"Tipo": "SISPAR", "Conta": "123", "Valor": 0, "Nome_Empresa": "AÇÃO LTDA"}]
+
+
+def test_ida_e_volta(tmp_path):
+    diario = DiarioExecucao.na_pasta(str(tmp_path), "20240101_120000", CABECALHO)
+    diario.registrar("a.pdf", "h1", REGISTROS)
+    diario.registrar(os.path.join("sub", "b.pdf"), "h2", [])
+    diario.fechar()
+
+    assert diario.timestamp == "20240101_120000"
+    cabecalho, concluidos, validos = ler_diario(diario.caminho)
+    assert cabecalho == CABECALHO
+    assert concluidos == {"a.pdf": ("h1", REGISTROS), os.path.join("sub", "b.pdf"): ("h2", [])}
+    assert validos == os.path.getsize(diario.caminho)
+
+
+def test_retomar_descarta_linha_pela_metade(tmp_path):
+    diario = DiarioExecucao.na_pasta(str(tmp_path), "20240101_120000", CABECALHO)
+    diario.registrar("a.pdf", "h1", REGISTROS)
+    diario.fechar()
+    tamanho = os.path.getsize(diario.caminho)
+    with open(diario.caminho, "ab") as f:
+        f.write(b'{"Arquivo": "b.pdf", "Hash": "h2", "Regis')
+
+    assert ler_diario(diario.caminho)[2] == tamanho
+    retomado = DiarioExecucao.na_pasta(str(tmp_path), "20240102_080000", CABECALHO, retomar=True)
+    assert retomado.caminho == diario.caminho
+    assert retomado.timestamp == "20240101_120000"
+    assert retomado.concluido("a.pdf", "h1") == REGISTROS
+    retomado.registrar("b.pdf", "h2", [])
+    retomado.fechar()
+
+    _, concluidos, validos = ler_diario(diario.caminho)
+    assert concluidos == {"a.pdf": ("h1", REGISTROS), "b.pdf": ("h2", [])}
+    assert validos == os.path.getsize(diario.caminho)
+
+
+def test_ultima_linha_sem_quebra_e_descartada(tmp_path):
+    diario = DiarioExecucao.na_pasta(str(tmp_path), "20240101_120000", CABECALHO)
+    diario.registrar("a.pdf", "h1", REGISTROS)
+    diario.fechar()
+    with open(diario.caminho, "ab") as f:
+        f.write(b'{"Arquivo": "b.pdf", "Hash": "h2", "Registros": []}')
+
+    assert ler_diario(diario.caminho)[1] == {"a.pdf": ("h1", REGISTROS)}
+
+
+def test_concluido_exige_o_mesmo_conteudo(tmp_path):
+    diario = DiarioExecucao.na_pasta(str(tmp_path), "20240101_120000", CABECALHO)
+    diario.registrar("a.pdf", "h1", REGISTROS)
+    diario.fechar()
+
+    retomado = DiarioExecucao(diario.caminho, CABECALHO, retomar=True)
+    assert retomado.concluido("a.pdf", "outro") is None
+    assert retomado.concluido("c.pdf", "h1") is None
+    retomado.remover()
+    assert not os.path.exists(diario.caminho)
+
+
+def test_localizar_so_com_o_mesmo_cabecalho(tmp_path):
+    pasta = str(tmp_path)
+    antigo = DiarioExecucao.na_pasta(pasta, "20240101_120000", CABECALHO)
+    antigo.fechar()
+    outro = DiarioExecucao.na_pasta(pasta, "20240103_120000", dict(CABECALHO, versao_parser="v2"))
+    outro.fechar()
+    with open(os.path.join(pasta, "diario_20240104_120000.ndjson"), "w", encoding="utf-8") as f:
+        f.write("não é json\n")
+
+    assert localizar_diario(pasta, CABECALHO) == antigo.caminho
+    assert localizar_diario(pasta, dict(CABECALHO, incluir_detalhes_debitos=False)) is None
+    novo = DiarioExecucao.na_pasta(pasta, "20240105_120000", dict(CABECALHO, pasta_pdfs="/outra"), retomar=True)
+    assert not novo.retomado
+    assert novo.timestamp == "20240105_120000"
+    novo.fechar()
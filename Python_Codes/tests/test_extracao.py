@@ -0,0 +1,113 @@
+"""iterar_registros_texto (seções localizadas numa passada) x regras originais no texto inteiro"""
+import random
+import re
+
+import pytest
+
+from benchmarks.gerar_corpus import MISTURA_PADRAO, gerar_empresas, montar_paginas
+from parcelamentos.extracao import extrair_valor_monetario, iterar_registros_texto
+from parcelamentos.normalizacao import normalizar_cnpj
+from parcelamentos.secoes import localizar_secoes
+
+
+def extrair_original(texto, nome_arquivo, incluir_detalhes_debitos=True):
+    """Regras de AnalyizeV1.0.extrair_dados_pdf antes das seções, cada regex no texto inteiro
+
+    Única diferença: o vencimento do débito é capturado (o original quebrava
+    no desempacotamento de 9 valores com 8 grupos).
+    """
+    dados = []
+    cnpj_match = re.search(r"CNPJ:\s*(\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2})", texto)
+    cnpj_formatado = cnpj_match.group(1) if cnpj_match else "Não encontrado"
+    cnpj_numeros = normalizar_cnpj(cnpj_formatado)
+    nome_match = re.search(r"CNPJ:\s*\d{2}\.\d{3}\.\d{3}.*?-\s*(.+)", texto)
+    nome_empresa = nome_match.group(1).strip() if nome_match else "Não encontrado"
+    cabecalho = {"CNPJ": cnpj_formatado, "CNPJ_Numeros": cnpj_numeros, "Nome_Empresa": nome_empresa}
+
+    def registro(**campos):
+        dados.append(dict(cabecalho, **campos, Arquivo=nome_arquivo))
+
+    if "MEI - EM PARCELAMENTO" in texto:
+        mei_match = re.search(r"MEI - EM PARCELAMENTO\s+Parcelas em atraso\s*(\d+)", texto)
+        if mei_match:
+            registro(Tipo="PARCMEI", Subtipo="MEI", Conta="-", Modalidade="MEI - Parcelamento",
+                     Detalhes=f"Parcelas em atraso: {mei_match.group(1)}", Status="Em Parcelamento", Valor=0)
+
+    if "SIMPLES NACIONAL - EM PARCELAMENTO" in texto or "SIMPLES NACIONAL - RELP - EM PARCELAMENTO" in texto:
+        for titulo, parcelas in re.findall(r"(SIMPLES NACIONAL.*EM PARCELAMENTO)(?:\s+Parcelas em atraso\s*(\d+))?",
+                                           texto):
+            registro(Tipo="PARCSN", Subtipo="Simples Nacional", Conta="-", Modalidade=titulo.strip(),
+                     Detalhes=f"Parcelas em atraso: {parcelas or '0'}", Status="Em Parcelamento", Valor=0)
+
+    if "Pendência – Parcelamento (SIEFPAR)" in texto:
+        padrao = r"Parcelamento:\s*(\d+)\s+Parcelas em Atraso:\s*(\d+)\s+Valor em Atraso:\s*([\d\.,]+)"
+        for conta, parcelas, valor_str in re.findall(padrao, texto):
+            registro(Tipo="SIEFPAR", Subtipo="Receita Federal", Conta=conta.strip(),
+                     Modalidade="Parcelamento Simplificado",
+                     Detalhes=f"Parcelas em atraso: {parcelas}, Valor em atraso: R$ {valor_str}",
+                     Status="Exigibilidade Suspensa", Valor=extrair_valor_monetario(valor_str))
+
+    if "Parcelamento com Exigibilidade Suspensa (SIEFPAR)" in texto:
+        for conta, valor_str in re.findall(r"Parcelamento:\s*(\d+)\s+Valor Suspenso:\s*([\d\.,]+)", texto):
+            registro(Tipo="SIEFPAR", Subtipo="Receita Federal", Conta=conta.strip(),
+                     Modalidade="Parcelamento Simplificado", Detalhes=f"Valor suspenso: R$ {valor_str}",
+                     Status="Exigibilidade Suspensa", Valor=extrair_valor_monetario(valor_str))
+
+    if "SISPAR" in texto:
+        for conta, tipo_parcela, modalidade in re.findall(r"(?:Conta\s*)?(\d+)\s+([^\n]+)\nModalidade:\s*([^\n]+)",
+                                                          texto):
+            registro(Tipo="SISPAR", Subtipo="PGFN", Conta=conta.strip(), Modalidade=modalidade.strip(),
+                     Detalhes=tipo_parcela.strip(), Status="Exigibilidade Suspensa", Valor=0)
+
+    if "Débito com Exigibilidade Suspensa (SICOB)" in texto:
+        for parcela, situacao in re.findall(r"Parcelamento:\s*(\d+-\d+)\s+Situação:\s*(\d+\s*-\s*.+)", texto):
+            registro(Tipo="SICOB", Subtipo="Débito Suspenso", Conta=parcela.strip(), Modalidade="RFB LEI 10522/02",
+                     Detalhes=f"Situação: {situacao}", Status="Ativo/Em Dia", Valor=0)
+
+    if incluir_detalhes_debitos and "Pendência - Débito (SIEF)" in texto:
+        padrao = (r"(\d{4}-\d{2}\s*-\s*.+?)\s+(\d{2}/\d{4})\s+([\d/]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)"
+                  r"\s+([\d\.,]+)\s+([\d\.,]+)\s+(.+)")
+        for receita, periodo, _, _, _, _, _, sdo_cons, situacao in re.findall(padrao, texto)[:5]:
+            registro(Tipo="DÉBITO", Subtipo="Pendência", Conta=receita.strip(), Modalidade=f"Período: {periodo}",
+                     Detalhes=f"Situação: {situacao.strip()}", Status="Devedor",
+                     Valor=extrair_valor_monetario(sdo_cons) if sdo_cons else 0)
+    return dados
+
+
+def relatorios(quantidade, mistura, seed):
+    """(texto como extraído do PDF, registros esperados) de relatórios sintéticos"""
+    rnd = random.Random(seed)
+    for cnpj, nome in gerar_empresas(quantidade, rnd):
+        paginas, esperados = montar_paginas(cnpj, nome, rnd.randint(1, 6), mistura, rnd)
+        yield "\n".join("\n".join(linhas) for linhas in paginas), esperados
+
+
+@pytest.mark.parametrize("mistura", [MISTURA_PADRAO, dict.fromkeys(MISTURA_PADRAO, 1.0)], ids=["padrao", "todas"])
+@pytest.mark.parametrize("incluir_debitos", [True, False])
+def test_mesmos_registros_das_regras_originais(mistura, incluir_debitos):
+    for texto, _ in relatorios(60, mistura, seed=7):
+        novos = list(iterar_registros_texto(texto, "rel.pdf", incluir_debitos))
+        assert novos == extrair_original(texto, "rel.pdf", incluir_debitos)
+
+
+def test_registros_do_gabarito():
+    for texto, esperados in relatorios(30, dict.fromkeys(MISTURA_PADRAO, 1.0), seed=11):
+        registros = iterar_registros_texto(texto, "rel.pdf")
+        assert sorted((r["Tipo"], r["Conta"]) for r in registros) == sorted(map(tuple, esperados))
+
+
+def test_trecho_da_secao_vai_ate_o_proximo_cabecalho():
+    texto = "\n".join([
+        "Parcelamento com Exigibilidade Suspensa (SIEFPAR)",
+        "Parcelamento: 111 Valor Suspenso: 1,00",
+        "Débito com Exigibilidade Suspensa (SICOB)",
+        "Parcelamento: 222-1 Situação: 000001 - ATIVO/EM DIA",
+        "MEI - EM PARCELAMENTO",
+        "Parcelas em atraso 3",
+    ])
+    secoes = localizar_secoes(texto)
+    assert secoes.textos("SIEFPAR_SUSPENSO") == [texto[:texto.index("Débito com")]]
+    # Uma linha de registro (MEI) não encerra o trecho da seção em que aparece
+    assert secoes.textos("SICOB") == [texto[texto.index("Débito com"):]]
+    assert secoes.textos("PARCMEI") == [texto[texto.index("MEI - EM"):]]
+    assert "SISPAR" not in secoes
@@ -0,0 +1,59 @@
+"""OrdenacaoExterna: a ordem intercalada dos lotes é a de um sort estável em memória"""
+import os
+import random
+
+import pytest
+
+from parcelamentos.ordenacao import OrdenacaoExterna
+from parcelamentos.saida import colunas_ordenacao
+
+
+def registros_aleatorios(quantidade, rnd):
+    """Poucos valores distintos (muitos empates) e colunas ausentes ou None"""
+    registros = []
+    for i in range(quantidade):
+        registro = {"Ordem": i, "Tipo": rnd.choice(["SIEFPAR", "SISPAR", "DÉBITO", "", None])}
+        if rnd.random() < 0.9:
+            registro["Nome_Empresa"] = rnd.choice(["ALFA LTDA", "BETA ME", "Ção SA", None])
+        if rnd.random() < 0.1:
+            registro["Extra"] = i
+        registros.append(registro)
+    return registros
+
+
+def ordenar_em_memoria(registros, colunas):
+    """Sort estável coluna a coluna, da última para a primeira, ausentes no final"""
+    ordenados = list(registros)
+    for coluna in reversed(colunas):
+        ordenados.sort(key=lambda r: (r.get(coluna) is None, r.get(coluna) or ""))
+    return ordenados
+
+
+@pytest.mark.parametrize("agrupar", [False, True])
+@pytest.mark.parametrize("limite_arquivos", [2, 3, 64])
+def test_ida_e_volta_igual_ao_sort_estavel(tmp_path, agrupar, limite_arquivos):
+    rnd = random.Random(limite_arquivos)
+    colunas = colunas_ordenacao(agrupar)
+    ordenacao = OrdenacaoExterna(str(tmp_path), colunas, limite_arquivos=limite_arquivos)
+    todos = registros_aleatorios(2000, rnd)
+    inicio = 0
+    while inicio < len(todos):
+        fim = inicio + rnd.randint(1, 150)
+        # Um lote de PDFs chega em vários acrescentar, como no processamento
+        ordenacao.acrescentar(todos[inicio:fim])
+        if rnd.random() < 0.5:
+            ordenacao.fechar_lote()
+        inicio = fim
+
+    assert list(ordenacao.registros()) == ordenar_em_memoria(todos, colunas)
+    assert ordenacao.total == len(todos)
+    assert list(ordenacao.colunas) == ["Ordem", "Tipo", "Nome_Empresa", "Extra"]
+    ordenacao.remover()
+    assert os.listdir(tmp_path) == []
+
+
+def test_sem_registros(tmp_path):
+    ordenacao = OrdenacaoExterna(str(tmp_path), colunas_ordenacao(False))
+    assert list(ordenacao.registros()) == []
+    assert ordenacao.total == 0
+    ordenacao.remover()
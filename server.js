@@ -2,6 +2,8 @@ const express = require('express');
 const multer = require('multer');
 const path = require('path');
 const fs = require('fs');
+const http = require('http');
+const crypto = require('crypto');
 const { spawn } = require('child_process');
 
 const app = express();
@@ -223,9 +225,120 @@ app.get('/status', (req, res) => {
   }
 });
 
+// ===============================
+// 🐍 Serviço Python residente (extração de parcelamentos)
+// ===============================
+// Iniciado uma vez junto com o servidor: pandas, pdfplumber e os padrões já
+// ficam carregados, e cada job custa milissegundos em vez de um processo novo
+const portaServico = Number(process.env.REPORTX_PORTA_SERVICO) || 8765;
+const pastaPython = path.join(__dirname, 'Python_Codes');
+// Token novo a cada início: só este processo conhece o segredo do serviço
+const tokenServico = crypto.randomBytes(32).toString('hex');
+let servicoPython = null;
+
+function iniciarServicoPython() {
+  const python = process.env.PYTHON || (process.platform === 'win32' ? 'python' : 'python3');
+  servicoPython = spawn(python, ['-m', 'parcelamentos.servico', '--porta', String(portaServico)], {
+    cwd: pastaPython,
+    env: { ...process.env, REPORTX_TOKEN: tokenServico }
+  });
+  servicoPython.stdout.on('data', (data) => console.log('🐍', data.toString().trim()));
+  servicoPython.stderr.on('data', (data) => console.error('🐍 STDERR:', data.toString().trim()));
+  servicoPython.on('error', (err) => console.error('❌ Falha ao iniciar o serviço Python:', err.message));
+  servicoPython.on('close', (code) => {
+    console.log(`🐍 Serviço Python encerrado (código ${code})`);
+    servicoPython = null;
+  });
+}
+
+// Envia um job ao serviço e chama aoEvento para cada linha NDJSON recebida;
+// resolve com o evento "fim" (ou rejeita com o evento "erro")
+function chamarServicoPython(rota, corpo, aoEvento) {
+  return new Promise((resolve, reject) => {
+    const dados = Buffer.from(JSON.stringify(corpo));
+    const headers = { 'Content-Type': 'application/json', 'Content-Length': dados.length, 'X-Token': tokenServico };
+
+    const requisicao = http.request(
+      { host: '127.0.0.1', port: portaServico, path: rota, method: 'POST', headers },
+      (resposta) => {
+        let resto = '';
+        let final = null;
+        resposta.setEncoding('utf8');
+        resposta.on('data', (parte) => {
+          const linhas = (resto + parte).split('\n');
+          resto = linhas.pop();
+          for (const linha of linhas) {
+            if (!linha.trim()) continue;
+            // Uma linha inválida (ou um erro no aoEvento) encerra só esta chamada,
+            // sem exceção não tratada derrubando o servidor
+            try {
+              const evento = JSON.parse(linha);
+              if (evento.evento === 'fim' || evento.evento === 'erro') final = evento;
+              if (aoEvento) aoEvento(evento);
+            } catch (erro) {
+              reject(new Error(`evento inválido do serviço Python: ${erro.message}`));
+              resposta.destroy();
+              return;
+            }
+          }
+        });
+        resposta.on('error', reject);
+        resposta.on('end', () => {
+          if (final && final.evento === 'fim') resolve(final);
+          else reject(new Error(final ? final.mensagem : `resposta incompleta (HTTP ${resposta.statusCode})`));
+        });
+      }
+    );
+    requisicao.on('error', reject);
+    requisicao.end(dados);
+  });
+}
+
+// ===============================
+// 📑 Análise de parcelamentos (via serviço Python)
+// ===============================
+app.post('/parcelamentos', (req, res) => {
+  const logsDir = path.join(__dirname, 'logs');
+  const { pasta_pdfs, pasta_saida } = req.body;
+
+  if (!pasta_pdfs || !pasta_saida) {
+    return res.status(400).json({ success: false, message: 'Informe pasta_pdfs e pasta_saida' });
+  }
+
+  if (!fs.existsSync(logsDir)) {
+    fs.mkdirSync(logsDir, { recursive: true });
+  }
+  fs.writeFileSync(path.join(logsDir, 'success.log'), '');
+  fs.writeFileSync(path.join(logsDir, 'errors.log'), '');
+
+  // Registros não são necessários aqui: o resultado fica no Excel
+  chamarServicoPython('/processar', { ...req.body, enviar_registros: false }, (evento) => {
+    if (evento.evento === 'log') {
+      fs.appendFileSync(path.join(logsDir, 'success.log'), evento.mensagem + '\n');
+    }
+  })
+    .then((fim) => {
+      const finalMessage = `\n✅ Análise concluída: ${fim.total_registros} parcelamentos em ${fim.segundos}s -> ${fim.caminho_excel}\n`;
+      console.log(finalMessage);
+      fs.appendFileSync(path.join(logsDir, 'success.log'), finalMessage);
+    })
+    .catch((error) => {
+      console.error('❌ Erro na análise de parcelamentos:', error.message);
+      fs.appendFileSync(path.join(logsDir, 'errors.log'), `[ERRO SERVIÇO PYTHON] ${error.message}\n`);
+    });
+
+  res.json({ success: true, message: 'Análise iniciada! Acompanhe os logs.' });
+});
+
 // ===============================
 // 🚀 Inicialização
 // ===============================
+iniciarServicoPython();
+process.on('exit', () => {
+  if (servicoPython) servicoPython.kill();
+});
+process.on('SIGINT', () => process.exit());
+
 app.listen(port, () => {
   console.log(`🌐 Servidor rodando em http://localhost:${port}`);
   console.log(`📁 Diretório de trabalho: ${__dirname}`);